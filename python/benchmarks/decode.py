@@ -0,0 +1,109 @@
+"""
+Compares the ways of decoding a results file into `ParsedRow`s at statewide scale: the
+original `csv.DictReader` path, positional decoding over `csv.reader`, the split-based
+fast path for unquoted files, and PyArrow's CSV reader when it is installed.
+
+    python -m benchmarks.decode
+    python -m benchmarks.decode --precincts 500 --repeat 5
+"""
+import argparse
+import csv
+import json
+import statistics
+import time
+from dataclasses import asdict
+from io import BytesIO, StringIO
+from typing import Any, Callable, Optional
+
+from ncsbe_lib.collector import Collector, pyarrow
+from ncsbe_lib.types import ParsedRow
+from .synthetic import Scale, make_results_zip
+
+def dict_reader(collector: Collector, tsv_data: str) -> list[ParsedRow]:
+    """The decoder `Collector` used before positional decoding: one dict per row, looked up by column name."""
+    strings = collector._strings
+
+    def intern(value: str) -> str:
+        return strings.setdefault(value, value)
+
+    return [
+        ParsedRow(
+            county = intern(row['County']),
+            election_date = intern(row['Election Date']),
+            precinct = intern(row['Precinct']),
+            contest_group_id = int(row['Contest Group ID']),
+            contest_type = intern(row['Contest Type']),
+            contest_name = collector._normalize_contest_name(row['Contest Name']),
+            choice = intern(row['Choice']),
+            choice_party = intern(row['Choice Party']),
+            vote_for = int(row['Vote For']),
+            election_day = int(row['Election Day']),
+            early_voting = int(row['Early Voting']),
+            absentee_by_mail = int(row['Absentee by Mail']),
+            provisional = int(row['Provisional']),
+            total_votes = int(row['Total Votes']),
+            real_precinct = row['Real Precinct'] == 'Y'
+        )
+        for row in csv.DictReader(StringIO(tsv_data), delimiter='\t')
+    ]
+
+def csv_reader(collector: Collector, tsv_data: str) -> list[ParsedRow]:
+    """Positional decoding over `csv.reader`, the path taken by files with quoted fields."""
+    reader = csv.reader(StringIO(tsv_data), delimiter='\t')
+    return list(collector._decode_rows(next(reader), reader))
+
+def split(collector: Collector, tsv_data: str) -> list[ParsedRow]:
+    """Positional decoding over lines split on tabs, the default path for unquoted files."""
+    return collector._parse_tsv_data(tsv_data)
+
+def arrow(collector: Collector, tsv_data: str) -> list[ParsedRow]:
+    return collector._parse_tsv_arrow(tsv_data)
+
+def run(scale: Scale, repeat: int = 3) -> dict[str, Any]:
+    tsv_data = Collector('')._extract_tsv_files(BytesIO(make_results_zip(scale)))
+    decoders: dict[str, Callable[[Collector, str], list[ParsedRow]]] = {
+        "dict_reader": dict_reader,
+        "csv_reader": csv_reader,
+        "split": split,
+    }
+    if pyarrow is not None:
+        decoders["pyarrow"] = arrow
+
+    expected = None
+    results: dict[str, dict[str, float]] = {}
+    for name, decode in decoders.items():
+        timings = []
+        for _ in range(repeat):
+            # A fresh collector each time, so no run benefits from another's intern table.
+            collector = Collector('')
+            start = time.perf_counter()
+            rows = decode(collector, tsv_data)
+            timings.append(time.perf_counter() - start)
+
+        if expected is None:
+            expected = rows
+        elif rows != expected:
+            raise AssertionError(f"{name} decoded different rows than {next(iter(decoders))}")
+        results[name] = { "seconds": statistics.median(timings), "rows_per_second": len(rows) / statistics.median(timings) }
+
+    baseline = results["dict_reader"]["seconds"]
+    for result in results.values():
+        result["speedup"] = baseline / result["seconds"]
+
+    return { "scale": asdict(scale), "rows": len(expected), "repeat": repeat, "decoders": results }
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.decode", description="Compare results file decoders.")
+    parser.add_argument("--counties", type=int, default=Scale.counties)
+    parser.add_argument("--precincts", type=int, default=Scale.precincts)
+    parser.add_argument("--contests", type=int, default=Scale.contests)
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per decoder; the median is reported")
+    args = parser.parse_args(argv)
+
+    scale = Scale(counties=args.counties, precincts=args.precincts, contests=args.contests, seed=args.seed)
+    print(json.dumps(run(scale, repeat=args.repeat), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""
+Measures how much memory a loaded election holds: the parsed rows, and the formatted
+`ContestData` -> `CountyData` -> `PrecinctData` -> `CandidateData` hierarchy, together with
+the number of objects of each type and their average size.
+
+Sizes are the bytes still allocated (per `tracemalloc`) once the stage's temporaries are
+freed, plus the growth of the process's resident set where the platform reports it.
+
+With `--baseline`, the same dataset is also rebuilt the way it used to be held: plain
+dataclasses with a `__dict__` per instance, and a string object per field instead of
+interned county, precinct, candidate and party names. Both hierarchies are then sized by
+walking them (see `deep_size`) and reported side by side with their ratio.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --baseline
+    python -m benchmarks.memory --precincts 500 --output memory.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from dataclasses import MISSING, asdict, field, fields, is_dataclass, make_dataclass
+from io import BytesIO
+from typing import Any, Callable, Iterable, Optional
+
+from ncsbe_lib.collector import Collector
+from ncsbe_lib.types import CandidateData, ContestData, CountyData, PrecinctData
+from .synthetic import Scale, make_results_zip
+
+def resident_bytes() -> Optional[int]:
+    """The process's current resident set size, or `None` where `/proc` is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def retained(fn: Callable[[], Any]) -> tuple[dict[str, Optional[int]], Any]:
+    """
+    Calls `fn` and reports the memory its result keeps alive.
+    return: The measurements and the result.
+    """
+    gc.collect()
+    rss_before = resident_bytes()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_after = resident_bytes()
+
+    return {
+        "retained_bytes": current,
+        "peak_bytes": peak,
+        "resident_growth_bytes": rss_after - rss_before if rss_before is not None else None,
+    }, result
+
+def count_objects(dataset: Iterable[ContestData]) -> dict[str, int]:
+    """Counts the distinct objects of each type in the hierarchy; shared objects are counted once."""
+    seen: set[int] = set()
+    counts = { "ContestData": 0, "CountyData": 0, "PrecinctData": 0, "CandidateData": 0 }
+
+    def visit_candidates(candidates):
+        for candidate in candidates:
+            if id(candidate) in seen: continue
+            seen.add(id(candidate))
+            counts["CandidateData"] += 1
+
+    for contest in dataset:
+        counts["ContestData"] += 1
+        visit_candidates(contest.candidates)
+        for county in contest.counties:
+            counts["CountyData"] += 1
+            visit_candidates(county.candidates)
+            for precinct in county.precincts:
+                counts["PrecinctData"] += 1
+                visit_candidates(precinct.candidates)
+    return counts
+
+def _plain(cls: type) -> type:
+    """A frozen dataclass with the same fields as `cls`, but without `__slots__`."""
+    return make_dataclass(cls.__name__, [
+        (f.name, f.type) if f.default is MISSING else (f.name, f.type, field(default=f.default))
+        for f in fields(cls)
+    ], frozen=True)
+
+_PLAIN = { cls: _plain(cls) for cls in (CandidateData, PrecinctData, CountyData, ContestData) }
+
+def _unshared(value: Any) -> Any:
+    """A copy of a field value; strings become new objects, as when every row held its own."""
+    if isinstance(value, str):
+        return value.encode().decode()
+    if isinstance(value, tuple):
+        return tuple(_unshared(item) for item in value)
+    if is_dataclass(value):
+        return to_plain(value)
+    return value
+
+def to_plain(obj: Any) -> Any:
+    """Rebuilds a slotted result object, and everything under it, with the unslotted, unshared baseline types."""
+    return _PLAIN[type(obj)](**{ f.name: _unshared(getattr(obj, f.name)) for f in fields(obj) })
+
+def deep_size(dataset: Iterable[Any]) -> int:
+    """
+    Sums `sys.getsizeof` over every distinct object reachable from the dataset: the result objects,
+    their `__dict__` if they have one, tuples, strings and numbers. Shared objects are counted once.
+    """
+    seen: set[int] = set()
+    total = 0
+    stack = list(dataset)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen: continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, tuple):
+            stack.extend(obj)
+        elif is_dataclass(obj):
+            if hasattr(obj, "__dict__"):
+                total += sys.getsizeof(obj.__dict__)
+            stack.extend(getattr(obj, f.name) for f in fields(obj))
+    return total
+
+def run(scale: Scale, baseline: bool = False) -> dict[str, Any]:
+    body = make_results_zip(scale)
+    collector = Collector("results_pct_20241105.zip")
+    tsv_data = collector._extract_tsv_files(BytesIO(body))
+
+    rows_memory, rows = retained(lambda: collector._parse_tsv_data(tsv_data))
+    del tsv_data
+    dataset_memory, dataset = retained(lambda: collector._format(rows))
+    objects = count_objects(dataset)
+
+    result = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "scale": asdict(scale),
+            "rows": len(rows),
+        },
+        "rows": { **rows_memory, "bytes_per_row": rows_memory["retained_bytes"] / max(len(rows), 1) },
+        "dataset": {
+            **dataset_memory,
+            "objects": objects,
+            "bytes_per_object": dataset_memory["retained_bytes"] / max(sum(objects.values()), 1),
+        },
+    }
+
+    if baseline:
+        slotted_bytes = deep_size(dataset)
+        plain_bytes = deep_size([to_plain(contest) for contest in dataset])
+        result["baseline"] = {
+            "slotted_bytes": slotted_bytes,
+            "plain_bytes": plain_bytes,
+            "ratio": plain_bytes / max(slotted_bytes, 1),
+        }
+    return result
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory", description="Measure the memory held by a loaded election.")
+    parser.add_argument("--counties", type=int, default=Scale.counties)
+    parser.add_argument("--precincts", type=int, default=Scale.precincts)
+    parser.add_argument("--contests", type=int, default=Scale.contests)
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    parser.add_argument("--baseline", action="store_true", help="also size the dataset as unslotted dataclasses with unshared strings")
+    parser.add_argument("--output", help="write the JSON results here instead of to stdout")
+    args = parser.parse_args(argv)
+
+    scale = Scale(counties=args.counties, precincts=args.precincts, contests=args.contests, seed=args.seed)
+    result = run(scale, baseline=args.baseline)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
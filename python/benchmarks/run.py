@@ -0,0 +1,217 @@
+"""
+Times and memory-profiles every stage of loading an election, and the hot `NCSBE` queries,
+against a synthetic results file served from a local HTTP server.
+
+Results are written as JSON. Pass an earlier result with `--compare` to fail (exit code 1)
+when any stage got slower than the allowed threshold.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator, Optional
+from requests.adapters import HTTPAdapter
+
+from ncsbe_lib.collector import Collector, create_session
+from ncsbe_lib.index import DatasetIndex
+from ncsbe_lib.ncsbe import NCSBE
+from ncsbe_lib.stats import compute_contest_stats
+from .synthetic import Scale, make_results_zip
+
+@contextmanager
+def serve(body: bytes) -> Iterator[str]:
+    """Serves `body` as a results ZIP from a local HTTP server, yielding its URL."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-zip-compressed")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/results_pct_20241105.zip"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class LocalServer(HTTPAdapter):
+    """Transport that sends every request to the local server over HTTP, whatever its URL."""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self._url = url
+
+    def send(self, request, **kwargs):
+        request.url = self._url
+        return super().send(request, **kwargs)
+
+def measure(fn: Callable[[], Any], repeat: int) -> tuple[dict[str, float], Any]:
+    """
+    Runs `fn` `repeat` times for timing, then once more under `tracemalloc` for its peak allocation.
+    return: The measurements and the result of the last call.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "retained_bytes": current,
+        "peak_bytes": peak,
+    }, result
+
+def measure_query(fn: Callable[[], Any], min_time: float = 0.2) -> dict[str, float]:
+    """Calls a query repeatedly for at least `min_time` seconds and reports the mean latency."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time: break
+    return { "microseconds": elapsed / calls * 1e6, "calls": calls }
+
+def run(scale: Scale, repeat: int = 3, columnar: bool = False) -> dict[str, Any]:
+    body = make_results_zip(scale)
+    stages: dict[str, dict[str, float]] = {}
+
+    with serve(body) as url:
+        collector = Collector(url, columnar=columnar)
+        stages["fetch"], zip_buffer = measure(lambda: collector._fetchData(url), repeat)
+        stages["extract"], tsv_data = measure(lambda: collector._extract_tsv_files(zip_buffer), repeat)
+        stages["parse"], rows = measure(lambda: collector._parse_tsv_data(tsv_data), repeat)
+        stages["format"], dataset = measure(lambda: collector._format(rows), repeat)
+        stages["index"], index = measure(lambda: DatasetIndex(dataset), repeat)
+        stages["collect"], _ = measure(lambda: Collector(url, columnar=columnar).collect(), repeat)
+        n_rows = len(rows)
+        del rows, tsv_data, zip_buffer
+
+        # Point an `NCSBE` at the local server instead of S3.
+        ncsbe = NCSBE("2024-11-05", columnar=columnar, session=create_session(transport=LocalServer(url)))
+        ncsbe.initialize()
+
+    statewide = ncsbe.list_contests()[0]
+    county = ncsbe.list_counties(statewide)[0]
+    precinct = ncsbe.list_precincts(statewide, county)[0]
+    candidate = ncsbe.list_candidates(statewide)[0]
+
+    # The index computes statistics on first use; time that apart from building the index, then the cached queries.
+    stages["stats"], _ = measure(
+        lambda: { name: compute_contest_stats(contest) for name, contest in index.contests.items() }, repeat
+    )
+    queries = {
+        "list_contests": lambda: ncsbe.list_contests(),
+        "list_counties": lambda: ncsbe.list_counties(statewide),
+        "list_precincts": lambda: ncsbe.list_precincts(statewide, county),
+        "get_contest": lambda: ncsbe.get_contest(statewide),
+        "get_county_results": lambda: ncsbe.get_county_results(statewide, county),
+        "get_precinct_results": lambda: ncsbe.get_precinct_results(statewide, county, precinct),
+        "get_candidate_info": lambda: ncsbe.get_candidate_info(statewide, candidate),
+        "get_all_candidate_results": lambda: ncsbe.get_all_candidate_results(candidate),
+        "get_contest_vote_totals": lambda: ncsbe.get_contest_vote_totals(statewide),
+        "get_candidate_vote_percentage": lambda: ncsbe.get_candidate_vote_percentage(statewide, candidate),
+        "get_contest_winner": lambda: ncsbe.get_contest_winner(statewide),
+        "get_closest_race": lambda: ncsbe.get_closest_race(),
+        "get_vote_method_totals": lambda: ncsbe.get_vote_method_totals(statewide),
+        "get_vote_method_share_by_county": lambda: ncsbe.get_vote_method_share_by_county(statewide, "early_voting"),
+        "get_precincts": lambda: ncsbe.get_precincts(statewide),
+    }
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "scale": asdict(scale),
+            "columnar": columnar,
+            "repeat": repeat,
+            "zip_bytes": len(body),
+            "rows": n_rows,
+            "contests": len(index.contests),
+        },
+        "stages": stages,
+        "queries": { name: measure_query(fn) for name, fn in queries.items() },
+    }
+
+def compare(result: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Lists every stage and query that got slower than `baseline` by more than `threshold` (a fraction).
+    """
+    regressions = []
+    for section, metric in (("stages", "seconds"), ("queries", "microseconds")):
+        for name, old in baseline.get(section, {}).items():
+            new = result[section].get(name)
+            if new is None or old[metric] <= 0: continue
+
+            change = new[metric] / old[metric] - 1
+            if change > threshold:
+                regressions.append(f"{section}.{name}: {old[metric]:.6g} -> {new[metric]:.6g} {metric} (+{change:.0%})")
+    return regressions
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark loading and querying an election.")
+    parser.add_argument("--counties", type=int, default=Scale.counties)
+    parser.add_argument("--precincts", type=int, default=Scale.precincts)
+    parser.add_argument("--contests", type=int, default=Scale.contests)
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the median is reported")
+    parser.add_argument("--columnar", action="store_true", help="also build the columnar vote store")
+    parser.add_argument("--output", help="write the JSON results here instead of to stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before a regression is reported")
+    args = parser.parse_args(argv)
+
+    scale = Scale(counties=args.counties, precincts=args.precincts, contests=args.contests, seed=args.seed)
+    result = run(scale, repeat=args.repeat, columnar=args.columnar)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""
+Generates synthetic NCSBE results files shaped like a statewide general election.
+
+The real files list every candidate's votes in every precinct, county by county. Contests
+come in three scopes, in roughly the proportions of a November general election:
+statewide contests on every ballot, district contests spanning a handful of counties,
+and local contests in a single county. Every county also has a few non-geographic
+reporting units (one-stop, absentee, provisional) with `Real Precinct` set to `N`.
+"""
+import argparse
+import random
+import zipfile
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Iterable, Iterator, Optional, Sequence
+
+HEADER = (
+    "County", "Election Date", "Precinct", "Contest Group ID", "Contest Type", "Contest Name",
+    "Choice", "Choice Party", "Vote For", "Election Day", "Early Voting", "Absentee by Mail",
+    "Provisional", "Total Votes", "Real Precinct",
+)
+
+PARTIES = ("DEM", "REP", "LIB", "GRE", "UNA", "")
+
+# Non-geographic reporting units present in every county.
+PSEUDO_PRECINCTS = ("ONE STOP", "ABSENTEE BY MAIL", "PROVISIONAL")
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of a synthetic election."""
+    counties: int = 100
+    precincts: int = 2700
+    contests: int = 400
+    seed: int = 2024
+
+    # Share of contests on every ballot in the state, and of contests spanning several counties.
+    statewide_share: float = 0.08
+    district_share: float = 0.3
+
+@dataclass(frozen=True)
+class _Contest:
+    group_id: int
+    contest_type: str
+    name: str
+    vote_for: int
+    candidates: tuple[tuple[str, str], ...]
+
+def _contests(scale: Scale, counties: list[str], rng: random.Random) -> dict[str, list[_Contest]]:
+    """Assigns every contest to the counties on whose ballots it appears."""
+    ballots: dict[str, list[_Contest]] = { county: [] for county in counties }
+    n_statewide = max(1, int(scale.contests * scale.statewide_share))
+    n_district = int(scale.contests * scale.district_share)
+
+    for i in range(scale.contests):
+        if i < n_statewide:
+            name, contest_type, scope = f"STATEWIDE CONTEST {i + 1:03d}", "S", counties
+        elif i < n_statewide + n_district:
+            width = rng.randint(2, min(15, len(counties)))
+            start = rng.randrange(len(counties))
+            scope = [counties[(start + k) % len(counties)] for k in range(width)]
+            name, contest_type = f"DISTRICT {i + 1:03d} REPRESENTATIVE", "S"
+        else:
+            scope = [rng.choice(counties)]
+            name, contest_type = f"{scope[0]} LOCAL SEAT {i + 1:03d} (VOTE FOR 1)", "C"
+
+        vote_for = 1 if rng.random() < 0.9 else rng.randint(2, 3)
+        n_candidates = rng.randint(vote_for + 1, vote_for + 4)
+        candidates = tuple(
+            (f"Candidate {i + 1}-{k + 1} {rng.choice('ABCDEFGHJKLMNPRSTW')}. Lastname", PARTIES[k % len(PARTIES)])
+            for k in range(n_candidates)
+        )
+        contest = _Contest(i + 1, contest_type, name, vote_for, candidates)
+        for county in scope:
+            ballots[county].append(contest)
+
+    return ballots
+
+def make_row(
+    county: str, precinct: str, contest_name: str, choice: str, party: str, election_day: int, early_voting: int,
+    absentee_by_mail: int = 0, provisional: int = 0, contest_group_id: int = 1, contest_type: str = "S",
+    vote_for: int = 1, real_precinct: str = "Y",
+) -> tuple[str, ...]:
+    """Builds one raw TSV row, in `HEADER` order, whose total is the sum of its vote methods."""
+    total = election_day + early_voting + absentee_by_mail + provisional
+    return (
+        county, "11/05/2024", precinct, str(contest_group_id), contest_type, contest_name, choice, party,
+        str(vote_for), str(election_day), str(early_voting), str(absentee_by_mail), str(provisional), str(total),
+        real_precinct,
+    )
+
+def iter_rows(scale: Scale = Scale()) -> Iterator[tuple[str, ...]]:
+    """Yields the raw TSV rows of a synthetic election, county by county."""
+    rng = random.Random(scale.seed)
+    counties = [f"COUNTY {i + 1:03d}" for i in range(scale.counties)]
+    ballots = _contests(scale, counties, rng)
+
+    per_county, extra = divmod(scale.precincts, scale.counties)
+    for c, county in enumerate(counties):
+        precincts = [(f"{p + 1:02d}-{c + 1:02d}", "Y") for p in range(per_county + (1 if c < extra else 0))]
+        precincts += [(name, "N") for name in PSEUDO_PRECINCTS]
+
+        for precinct, real in precincts:
+            for contest in ballots[county]:
+                for choice, party in contest.candidates:
+                    if real == "Y":
+                        election_day, early, absentee, provisional = (
+                            rng.randint(0, 600), rng.randint(0, 900), rng.randint(0, 150), rng.randint(0, 5)
+                        )
+                    else:
+                        election_day, early, absentee, provisional = 0, rng.randint(0, 200), rng.randint(0, 50), 0
+                    yield make_row(
+                        county, precinct, contest.name, choice, party, election_day, early, absentee, provisional,
+                        contest.group_id, contest.contest_type, contest.vote_for, real,
+                    )
+
+def write_results_zip(rows: Iterable[Sequence[str]], name: str = "results_pct_20241105.txt") -> bytes:
+    """Packs raw TSV rows, under `HEADER`, into a results ZIP shaped like the NCSBE download."""
+    text = BytesIO()
+    text.write(("\t".join(HEADER) + "\n").encode("utf-8"))
+    for row in rows:
+        text.write(("\t".join(row) + "\n").encode("utf-8"))
+
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        # A fixed timestamp keeps the file byte-for-byte reproducible for a given scale.
+        zf.writestr(zipfile.ZipInfo(name, date_time=(2024, 11, 5, 0, 0, 0)), text.getvalue(), zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+def make_results_zip(scale: Scale = Scale(), name: str = "results_pct_20241105.txt") -> bytes:
+    """Builds a synthetic results ZIP shaped like the NCSBE download."""
+    return write_results_zip(iter_rows(scale), name)
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic", description="Write a synthetic NCSBE results ZIP.")
+    parser.add_argument("output", help="path of the ZIP file to write")
+    parser.add_argument("--counties", type=int, default=Scale.counties)
+    parser.add_argument("--precincts", type=int, default=Scale.precincts)
+    parser.add_argument("--contests", type=int, default=Scale.contests)
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    args = parser.parse_args(argv)
+
+    scale = Scale(counties=args.counties, precincts=args.precincts, contests=args.contests, seed=args.seed)
+    with open(args.output, "wb") as f:
+        f.write(make_results_zip(scale))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import requests
+import threading
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Optional, Tuple
+from .cache import SnapshotCache
+from .collector import DEFAULT_TIMEOUT, Collector, create_session
+from .filters import RowFilter
+from .metrics import Metrics
+from .ncsbe import NCSBE
+from .refresher import AutoRefresher, next_delay
+from .shared import SharedDatasetPublisher
+from .types import ContestData, DatasetDiff
+
+class AsyncCollector(Collector):
+    """
+    The `AsyncCollector` class is an awaitable `Collector` for use inside an asyncio event loop.
+
+    Downloading and parsing run in an executor (the loop's default thread pool unless one is
+    given), so the event loop keeps serving other work while a results file is fetched,
+    decompressed and parsed. Concurrent calls on the same collector are serialized, since a
+    collector keeps the validators of the last file it parsed.
+
+    Example usage:
+    ```python
+    collector = AsyncCollector("https://s3.amazonaws.com/dl.ncsbe.gov/ENRS/2024_11_05/results_pct_20241105.zip")
+    results = await collector.collect()
+    ```
+    """
+
+    def __init__(
+        self, url: str, stream: bool = False, columnar: bool = False, workers: int = 1,
+        session: Optional[requests.Session] = None, timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        metrics: Optional[Metrics] = None, incremental: bool = False, lazy: bool = False,
+        filters: Optional[RowFilter] = None, engine: str = 'python', strings: Optional[dict[str, str]] = None,
+        executor: Optional[Executor] = None
+    ):
+        super().__init__(
+            url, stream=stream, columnar=columnar, workers=workers, session=session, timeout=timeout, metrics=metrics,
+            incremental=incremental, lazy=lazy, filters=filters, engine=engine, strings=strings
+        )
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    async def collect(self) -> list[ContestData]:
+        """
+        Collects and processes election data from the provided ZIP file URL without blocking the event loop.
+        return a structured representation of the election results.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._collect_locked)
+
+    def _collect_locked(self) -> list[ContestData]:
+        with self._lock:
+            return super().collect()
+
+class AsyncNCSBE(NCSBE):
+    """
+    The `AsyncNCSBE` class is the asyncio counterpart of `NCSBE`: `initialize()`, `refresh()` and
+    `refresh_with_diff()` are awaitable, while every query method stays synchronous since it only
+    reads the in-memory dataset. Everything a refresh does besides awaiting (downloading, parsing,
+    indexing, saving snapshots, publishing and diffing) runs in the executor, off the event loop.
+
+    Example usage:
+    ```python
+    election_data = AsyncNCSBE("2024-11-05")
+    await election_data.initialize()
+    contests = election_data.list_contests()
+
+    # Load several elections at once, at most four downloads in flight.
+    elections = await load_elections(["2024-03-05", "2024-05-14", "2024-11-05"], max_concurrency=4)
+    ```
+    """
+
+    def __init__(
+        self, election_date: str, stream: bool = False, columnar: bool = False, workers: int = 1,
+        cache: Optional[SnapshotCache] = None, session: Optional[requests.Session] = None,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT, metrics: Optional[Metrics] = None,
+        incremental: bool = False, lazy: bool = False, filters: Optional[RowFilter] = None,
+        engine: str = 'python', publisher: Optional[SharedDatasetPublisher] = None,
+        strings: Optional[dict[str, str]] = None, executor: Optional[Executor] = None
+    ):
+        """
+        Creates a new instance of `AsyncNCSBE` for a given election date.
+        param election_date: The date of the election in YYYY-MM-DD format.
+        param executor: Executor that downloads and parses the results file; the loop's default if omitted.
+        """
+        self._executor = executor
+        super().__init__(
+            election_date, stream=stream, columnar=columnar, workers=workers, cache=cache,
+            session=session if session is not None else create_session(), timeout=timeout, metrics=metrics,
+            incremental=incremental, lazy=lazy, filters=filters, engine=engine, publisher=publisher, strings=strings
+        )
+
+    def _create_collector(self, url: str, **kwargs) -> 'AsyncCollector':
+        return AsyncCollector(url, executor=self._executor, **kwargs)
+
+    async def _in_executor(self, fn: Callable, *args):
+        """Runs blocking work (indexing, snapshots, publishing, diffing) in the executor, off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def collect(self) -> list:
+        """Collects and processes election data from the provided URL without blocking the event loop."""
+        return await self._collector.collect()
+
+    async def initialize(self) -> None:
+        """Initializes the election dataset by fetching and storing the results in memory."""
+        if await self._in_executor(self._restore_snapshot):
+            await self._in_executor(self._replace_dataset, await self.collect() or self._dataset)
+            return
+
+        await self._in_executor(self._set_dataset, await self.collect())
+
+    async def refresh(self) -> bool:
+        """
+        Refreshes the election dataset by re-fetching and replacing `data_set`.
+        return: `True` if the dataset changed, `False` if the results file was unchanged and the current dataset was kept.
+        """
+        return await self._in_executor(self._replace_dataset, await self.collect())
+
+    async def refresh_with_diff(self) -> DatasetDiff:
+        """Refreshes the election dataset like `refresh()`, and describes what changed."""
+        previous = self._index
+        await self.refresh()
+        return await self._in_executor(self._diff_since, previous)
+
+    def start_auto_refresh(self, *args, **kwargs) -> AutoRefresher:
+        """Not available: a refresher thread cannot await `refresh()`. Run `auto_refresh()` as a task instead."""
+        raise TypeError('AsyncNCSBE cannot be refreshed from a thread; use asyncio.create_task(election_data.auto_refresh()).')
+
+    async def auto_refresh(
+        self, interval: float = 300, jitter: float = 0.1, max_backoff: float = 3600,
+        on_refresh: Optional[Callable[[bool], None]] = None
+    ) -> None:
+        """
+        Refreshes the dataset roughly every `interval` seconds until cancelled, like `AutoRefresher`
+        does on a thread. Run it as a task: `asyncio.create_task(election_data.auto_refresh())`.
+        """
+        failures = 0
+        while True:
+            await asyncio.sleep(next_delay(interval, jitter, failures, max_backoff))
+            changed = await self.refresh()
+            if self.last_error is not None:
+                failures += 1
+                logging.warning(f"Refresh failed ({failures} in a row), keeping the current dataset: {self.last_error}")
+                continue
+
+            failures = 0
+            if on_refresh is not None:
+                try:
+                    on_refresh(changed)
+                except Exception as e:
+                    logging.error(f"Error in refresh callback: {e}")
+
+
+async def _bounded(semaphore: asyncio.Semaphore, awaitable):
+    async with semaphore:
+        return await awaitable
+
+
+async def load_elections(
+    election_dates: Iterable[str], max_concurrency: int = 4, executor: Optional[Executor] = None, **kwargs
+) -> dict[str, AsyncNCSBE]:
+    """
+    Creates and initializes an `AsyncNCSBE` for every election date concurrently.
+    param max_concurrency: Maximum number of results files downloaded and parsed at the same time.
+    param kwargs: Passed through to each `AsyncNCSBE` (e.g. `stream`, `columnar`).
+    return: Election date -> initialized instance, in the order the dates were given.
+    """
+    elections = { date: AsyncNCSBE(date, executor=executor, **kwargs) for date in election_dates }
+    semaphore = asyncio.Semaphore(max_concurrency)
+    await asyncio.gather(*(_bounded(semaphore, election.initialize()) for election in elections.values()))
+    return elections
+
+
+async def refresh_elections(elections: Iterable[AsyncNCSBE], max_concurrency: int = 4) -> list[bool]:
+    """
+    Refreshes many elections concurrently, at most `max_concurrency` at a time.
+    return: For each election, in order, whether its dataset changed.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return list(await asyncio.gather(*(_bounded(semaphore, election.refresh()) for election in elections)))
@@ -0,0 +1,482 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Optional, Tuple, Union
+from .columnar import StringDictionary
+from .stats import compute_contest_stats
+from .types import CandidateData, ContestData, ContestStats, ContestSummary, CountyData, PrecinctData, VOTE_METHODS
+
+# Every archive starts with this magic number, then the format version and the length of the JSON header.
+# Columns are stored in the writer's native byte order, recorded in the header (since version 2).
+_MAGIC = b'NCSBEARC'
+_FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct('<8sII')
+
+# Vote-count fields stored for each candidate record, in `CandidateData` order.
+_COUNT_FIELDS = ('votes',) + VOTE_METHODS
+
+# Categorical string dictionaries stored in every archive.
+_DICTIONARIES = ('contests', 'counties', 'precincts', 'choices', 'parties')
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def encode_archive(dataset: Iterable[ContestData], election_date: Optional[str] = None) -> bytes:
+    """
+    Encodes a formatted election dataset into the columnar archive layout read by `ElectionArchive`.
+
+    Every precinct-level candidate result becomes one row of fixed-width integer columns, in
+    hierarchy order, so each contest, county and precinct owns a contiguous range of rows.
+    Offset tables map contests to their county segments, counties to their precinct segments
+    and precincts to their rows. Strings are dictionary-encoded.
+    """
+    dictionaries = { name: StringDictionary() for name in _DICTIONARIES }
+    sections: dict[str, array] = {
+        'row_choice': array('i'), 'row_party': array('i'),
+        **{ f'row_{field}': array('q') for field in _COUNT_FIELDS },
+        'precinct_code': array('i'), 'precinct_real': array('B'), 'precinct_row_start': array('q', [0]),
+        'county_code': array('i'), 'county_precinct_start': array('q', [0]),
+        'contest_vote_for': array('q'), 'contest_county_start': array('q', [0]), 'contest_candidate_start': array('q', [0]),
+        'candidate_choice': array('i'), 'candidate_party': array('i'),
+        **{ f'candidate_{field}': array('q') for field in _COUNT_FIELDS },
+    }
+
+    for contest in dataset:
+        # The first occurrence of a contest wins, matching `DatasetIndex`.
+        if dictionaries['contests'].code(contest.contest_name) is not None: continue
+        dictionaries['contests'].encode(contest.contest_name)
+        sections['contest_vote_for'].append(contest.vote_for)
+
+        for county in contest.counties:
+            sections['county_code'].append(dictionaries['counties'].encode(county.county))
+
+            for precinct in county.precincts:
+                sections['precinct_code'].append(dictionaries['precincts'].encode(precinct.precinct))
+                sections['precinct_real'].append(1 if precinct.real_precinct else 0)
+
+                for candidate in precinct.candidates:
+                    sections['row_choice'].append(dictionaries['choices'].encode(candidate.candidate))
+                    sections['row_party'].append(dictionaries['parties'].encode(candidate.party))
+                    for field in _COUNT_FIELDS:
+                        sections[f'row_{field}'].append(getattr(candidate, field))
+
+                sections['precinct_row_start'].append(len(sections['row_choice']))
+            sections['county_precinct_start'].append(len(sections['precinct_code']))
+        sections['contest_county_start'].append(len(sections['county_code']))
+
+        for candidate in contest.candidates:
+            sections['candidate_choice'].append(dictionaries['choices'].encode(candidate.candidate))
+            sections['candidate_party'].append(dictionaries['parties'].encode(candidate.party))
+            for field in _COUNT_FIELDS:
+                sections[f'candidate_{field}'].append(getattr(candidate, field))
+        sections['contest_candidate_start'].append(len(sections['candidate_choice']))
+
+    for name, dictionary in dictionaries.items():
+        encoded = [value.encode('utf-8') for value in dictionary.values]
+        offsets = array('q', [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        sections[f'{name}_offsets'] = offsets
+        sections[f'{name}_blob'] = array('B', b''.join(encoded))
+
+    # Lay the sections out back to back, each aligned to 8 bytes, after the header.
+    layout: dict[str, list] = {}
+    position = 0
+    for name, values in sections.items():
+        layout[name] = [position, values.typecode, len(values)]
+        position = _align(position + len(values) * values.itemsize)
+
+    header = json.dumps({ 'election_date': election_date, 'byteorder': sys.byteorder, 'sections': layout }).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    buffer = bytearray(data_start + position)
+    _PREAMBLE.pack_into(buffer, 0, _MAGIC, _FORMAT_VERSION, len(header))
+    buffer[_PREAMBLE.size:_PREAMBLE.size + len(header)] = header
+    for name, values in sections.items():
+        start = data_start + layout[name][0]
+        buffer[start:start + len(values) * values.itemsize] = values.tobytes()
+
+    return bytes(buffer)
+
+
+def write_archive(path: str, dataset: Iterable[ContestData], election_date: Optional[str] = None) -> None:
+    """Writes a formatted election dataset to `path` as a columnar archive."""
+    with open(path, 'wb') as f:
+        f.write(encode_archive(dataset, election_date))
+
+
+class ElectionArchive:
+    """
+    The `ElectionArchive` class answers election queries directly over a columnar archive,
+    without loading the dataset into the heap.
+
+    The archive is memory-mapped and every column is a zero-copy `memoryview` into it, so many
+    elections can be opened at once and only the pages a query touches are read. The query
+    methods mirror `NCSBE`; `ContestData`, `CountyData` and `PrecinctData` objects are
+    materialized only for the part of the hierarchy a call returns.
+
+    Every `NCSBE` query is available except `get_dataset`, which would materialize the whole
+    archive; `get_contests_by_candidate` returns contest names rather than `ContestData`.
+
+    Columns are mapped as stored, in the byte order of the host that wrote the archive, so an
+    archive opens only on hosts with the same byte order (in practice, every little-endian host).
+
+    Example usage:
+    ```python
+    ncsbe = NCSBE("2024-11-05")
+    ncsbe.initialize()
+    ncsbe.export_archive("2024-11-05.ncsbe")
+
+    with ElectionArchive("2024-11-05.ncsbe") as archive:
+        archive.get_contest_vote_totals("US_SENATE")
+    ```
+    """
+
+    def __init__(self, source: Union[str, memoryview, bytes]):
+        """
+        Opens an archive.
+        param source: Path of an archive file to memory-map, or a buffer already holding an archive.
+        """
+        self._mmap: Optional[mmap.mmap] = None
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+        else:
+            self._buffer = memoryview(source)
+
+        self._columns: dict[str, memoryview] = {}
+        try:
+            self._open()
+        except ValueError:
+            self.close()
+            raise
+        except (struct.error, KeyError, TypeError, IndexError) as e:
+            # A truncated or corrupt archive.
+            self.close()
+            raise ValueError(f'Corrupt NCSBE archive: {e!r}') from e
+
+        self._contest_codes = { name: code for code, name in enumerate(self._strings['contests']) }
+        self._choice_codes = { name: code for code, name in enumerate(self._strings['choices']) }
+        self._stats: dict[int, ContestStats] = {}
+
+    def _open(self) -> None:
+        """Checks the preamble and header, then maps every column. Raises ValueError for anything that is not a readable archive."""
+        if len(self._buffer) < _PREAMBLE.size:
+            raise ValueError('Not an NCSBE archive: too short.')
+        magic, version, header_length = _PREAMBLE.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError('Not an NCSBE archive, or an unsupported archive version.')
+        if _PREAMBLE.size + header_length > len(self._buffer):
+            raise ValueError('Corrupt NCSBE archive: truncated header.')
+
+        header = json.loads(bytes(self._buffer[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f"The archive was written on a {header['byteorder']}-endian host and cannot be read on this one.")
+        data_start = _align(_PREAMBLE.size + header_length)
+
+        self.election_date: Optional[str] = header['election_date']
+        for name, (offset, typecode, length) in header['sections'].items():
+            itemsize = array(typecode).itemsize
+            start = data_start + offset
+            end = start + length * itemsize
+            if offset < 0 or length < 0 or end > len(self._buffer):
+                raise ValueError(f'Corrupt NCSBE archive: section {name} is out of bounds.')
+            self._columns[name] = self._buffer[start:end].cast(typecode)
+
+        self._strings = { name: self._decode_strings(name) for name in _DICTIONARIES }
+
+    def _decode_strings(self, name: str) -> list[str]:
+        offsets = self._columns[f'{name}_offsets']
+        blob = self._columns[f'{name}_blob']
+        return [bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in range(len(offsets) - 1)]
+
+    def close(self) -> None:
+        """Releases the archive's buffer and memory map."""
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'ElectionArchive':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _contest_code(self, contest: str) -> Optional[int]:
+        return self._contest_codes.get(contest)
+
+    def _county_segment(self, code: int, county: str) -> Optional[int]:
+        county_start = self._columns['contest_county_start']
+        county_code = self._columns['county_code']
+        counties = self._strings['counties']
+        for segment in range(county_start[code], county_start[code + 1]):
+            if counties[county_code[segment]] == county:
+                return segment
+        return None
+
+    def _candidate(self, prefix: str, i: int) -> CandidateData:
+        c = self._columns
+        return CandidateData(
+            self._strings['choices'][c[f'{prefix}_choice'][i]],
+            self._strings['parties'][c[f'{prefix}_party'][i]],
+            *(c[f'{prefix}_{field}'][i] for field in _COUNT_FIELDS)
+        )
+
+    def _precinct(self, segment: int) -> PrecinctData:
+        row_start = self._columns['precinct_row_start']
+        return PrecinctData(
+            precinct = self._strings['precincts'][self._columns['precinct_code'][segment]],
+            candidates = tuple(self._candidate('row', row) for row in range(row_start[segment], row_start[segment + 1])),
+            real_precinct = bool(self._columns['precinct_real'][segment])
+        )
+
+    def _county(self, segment: int) -> CountyData:
+        c = self._columns
+        first, last = c['county_precinct_start'][segment], c['county_precinct_start'][segment + 1]
+
+        # County-wide candidate totals are summed from the county's rows on demand.
+        tallies: dict[int, list[int]] = {}
+        parties: dict[int, int] = {}
+        for row in range(c['precinct_row_start'][first], c['precinct_row_start'][last]):
+            choice = c['row_choice'][row]
+            if choice not in tallies:
+                tallies[choice] = [0] * len(_COUNT_FIELDS)
+                parties[choice] = c['row_party'][row]
+            tally = tallies[choice]
+            for i, field in enumerate(_COUNT_FIELDS):
+                tally[i] += c[f'row_{field}'][row]
+
+        return CountyData(
+            county = self._strings['counties'][c['county_code'][segment]],
+            precincts = tuple(self._precinct(p) for p in range(first, last)),
+            candidates = tuple(
+                CandidateData(self._strings['choices'][choice], self._strings['parties'][parties[choice]], *tally)
+                for choice, tally in tallies.items()
+            )
+        )
+
+    def _contest_candidates(self, code: int) -> tuple[CandidateData, ...]:
+        start = self._columns['contest_candidate_start']
+        return tuple(self._candidate('candidate', i) for i in range(start[code], start[code + 1]))
+
+    def _contest_stats(self, code: int) -> ContestStats:
+        if code not in self._stats:
+            summary = ContestData(contest_name=self._strings['contests'][code], counties=(), candidates=self._contest_candidates(code))
+            self._stats[code] = compute_contest_stats(summary)
+        return self._stats[code]
+
+    def list_contests(self) -> list[str]:
+        """Retrieves a list of all contests (races) available in the archive."""
+        return list(self._strings['contests'])
+
+    def has_contest(self, contest: str) -> bool:
+        """Checks whether a given contest exists in the archive."""
+        return contest in self._contest_codes
+
+    def list_counties(self, contest: str) -> list[str]:
+        """Lists all counties where voting took place for a specific contest."""
+        code = self._contest_code(contest)
+        if code is None: return []
+
+        start = self._columns['contest_county_start']
+        return [self._strings['counties'][self._columns['county_code'][s]] for s in range(start[code], start[code + 1])]
+
+    def list_precincts(self, contest: str, county: str) -> list[str]:
+        """Lists all precincts in a given county for a specific contest."""
+        code = self._contest_code(contest)
+        segment = self._county_segment(code, county) if code is not None else None
+        if segment is None: return []
+
+        start = self._columns['county_precinct_start']
+        return [self._strings['precincts'][self._columns['precinct_code'][p]] for p in range(start[segment], start[segment + 1])]
+
+    def list_candidates(self, contest: str) -> list[str]:
+        """Retrieves a list of candidates in a given contest."""
+        return [candidate.candidate for candidate in self.get_candidates(contest)]
+
+    def get_candidates(self, contest: str) -> tuple[CandidateData, ...]:
+        """Retrieves all candidates in a given contest, with their contest-wide totals."""
+        code = self._contest_code(contest)
+        return self._contest_candidates(code) if code is not None else ()
+
+    def get_contest(self, contest: str) -> Optional[ContestData]:
+        """Retrieves contest data for a specific contest name, materializing its whole hierarchy."""
+        code = self._contest_code(contest)
+        if code is None: return None
+
+        start = self._columns['contest_county_start']
+        return ContestData(
+            contest_name = contest,
+            counties = tuple(self._county(s) for s in range(start[code], start[code + 1])),
+            candidates = self._contest_candidates(code),
+            vote_for = self._columns['contest_vote_for'][code]
+        )
+
+    def get_county_results(self, contest: str, county: str) -> Optional[CountyData]:
+        """Retrieves results for all precincts in a county for a given contest."""
+        code = self._contest_code(contest)
+        segment = self._county_segment(code, county) if code is not None else None
+        return self._county(segment) if segment is not None else None
+
+    def get_precinct_results(self, contest: str, county: str, precinct: str) -> Optional[PrecinctData]:
+        """Retrieves results for a single precinct in a county for a given contest."""
+        code = self._contest_code(contest)
+        segment = self._county_segment(code, county) if code is not None else None
+        if segment is None: return None
+
+        start = self._columns['county_precinct_start']
+        precinct_code = self._columns['precinct_code']
+        precincts = self._strings['precincts']
+        for p in range(start[segment], start[segment + 1]):
+            if precincts[precinct_code[p]] == precinct:
+                return self._precinct(p)
+        return None
+
+    def get_candidate_info(self, contest: str, candidate_name: str) -> Optional[CandidateData]:
+        """Retrieves detailed information about a specific candidate in a contest."""
+        return next((c for c in self.get_candidates(contest) if c.candidate == candidate_name), None)
+
+    def get_candidate_vote_total(self, contest: str, candidate_name: str) -> int:
+        """Retrieves the total vote count for a specific candidate in a contest."""
+        candidate = self.get_candidate_info(contest, candidate_name)
+        return candidate.votes if candidate else 0
+
+    def get_counties(self, contest: str) -> tuple[CountyData, ...]:
+        """Retrieves all counties in a given contest."""
+        code = self._contest_code(contest)
+        if code is None: return ()
+
+        start = self._columns['contest_county_start']
+        return tuple(self._county(s) for s in range(start[code], start[code + 1]))
+
+    def get_precincts(self, contest: str) -> list[PrecinctData]:
+        """Retrieves all precincts in a given contest."""
+        code = self._contest_code(contest)
+        if code is None: return []
+
+        c = self._columns
+        first, last = c['contest_county_start'][code], c['contest_county_start'][code + 1]
+        return [self._precinct(p) for p in range(c['county_precinct_start'][first], c['county_precinct_start'][last])]
+
+    def get_contest_stats(self, contest: str) -> Optional[ContestStats]:
+        """Retrieves the statistics (totals, ranking, winner, margin, percentages) of a contest."""
+        code = self._contest_code(contest)
+        return self._contest_stats(code) if code is not None else None
+
+    def get_contest_vote_totals(self, contest: str) -> dict[str, int]:
+        """Retrieves a dictionary mapping candidates to their total votes in a contest."""
+        code = self._contest_code(contest)
+        return dict(self._contest_stats(code).vote_totals) if code is not None else {}
+
+    def get_total_votes_for_contest(self, contest: str) -> int:
+        """Retrieves the total number of votes for a given contest."""
+        code = self._contest_code(contest)
+        return self._contest_stats(code).total_votes if code is not None else 0
+
+    def get_candidate_vote_percentage(self, contest: str, candidate_name: str) -> float:
+        """Retrieve a candidate's percentage of total votes in a contest."""
+        code = self._contest_code(contest)
+        return self._contest_stats(code).percentages.get(candidate_name, 0) if code is not None else 0
+
+    def get_contest_winner(self, contest: str) -> Optional[CandidateData]:
+        """Retrieves the data of the candidate who currently has the most votes in a given contest."""
+        code = self._contest_code(contest)
+        return self._contest_stats(code).winner if code is not None else None
+
+    def get_contest_summaries(self, contests: Optional[Iterable[str]] = None, counties: bool = False) -> dict[str, ContestSummary]:
+        """
+        Retrieves the data and statistics of many contests at once; see `NCSBE.get_contest_summaries`.
+        Each contest's hierarchy is materialized, so pass only the contests needed.
+        """
+        summaries = {}
+        for name in (self._strings['contests'] if contests is None else contests):
+            contest = self.get_contest(name)
+            if contest is None: continue
+
+            # The first occurrence of a county wins, matching `DatasetIndex`.
+            by_name: dict[str, CountyData] = {}
+            for county in contest.counties if counties else ():
+                by_name.setdefault(county.county, county)
+            summaries[name] = ContestSummary(contest=contest, stats=self._contest_stats(self._contest_codes[name]), counties=by_name)
+        return summaries
+
+    def get_contest_winners(self, contests: Optional[Iterable[str]] = None) -> dict[str, Optional[CandidateData]]:
+        """Retrieves the current leader of many contests at once. Unknown contests map to `None`."""
+        return { name: self.get_contest_winner(name) for name in (self._strings['contests'] if contests is None else contests) }
+
+    def get_vote_percentages(self, pairs: Iterable[Tuple[str, str]]) -> list[float]:
+        """Retrieves many candidates' percentages of the total votes in their contests at once."""
+        return [self.get_candidate_vote_percentage(contest, candidate_name) for contest, candidate_name in pairs]
+
+    def get_vote_method_totals(self, contest: str, county: Optional[str] = None) -> dict[str, int]:
+        """Retrieves the number of votes cast by each voting method in a contest, statewide or in a single county."""
+        if county is None:
+            candidates = self.get_candidates(contest) if self.has_contest(contest) else None
+        else:
+            county_data = self.get_county_results(contest, county)
+            candidates = county_data.candidates if county_data else None
+
+        if candidates is None: return {}
+
+        res = { method: sum(getattr(candidate, method) for candidate in candidates) for method in VOTE_METHODS }
+        res['total_votes'] = sum(candidate.votes for candidate in candidates)
+        return res
+
+    def get_vote_method_share_by_county(self, contest: str, method: str) -> dict[str, float]:
+        """Retrieves, for each county in a contest, the percentage of its votes that were cast by a given method."""
+        if method not in VOTE_METHODS:
+            raise ValueError(f'Unknown voting method: {method}')
+
+        res: dict[str, float] = {}
+        for county in self.get_counties(contest):
+            total_votes = sum(candidate.votes for candidate in county.candidates)
+            method_votes = sum(getattr(candidate, method) for candidate in county.candidates)
+            res[county.county] = (method_votes / total_votes) * 100 if total_votes > 0 else 0
+        return res
+
+    def get_closest_race(self) -> Optional[ContestData]:
+        """Finds the contest with the smallest margin between the top two candidates."""
+        closest: Optional[int] = None
+        smallest_margin = float('inf')
+
+        for code in range(len(self._strings['contests'])):
+            margin = self._contest_stats(code).margin
+            if margin is not None and margin < smallest_margin:
+                smallest_margin = margin
+                closest = code
+
+        return self.get_contest(self._strings['contests'][closest]) if closest is not None else None
+
+    def _candidate_entries(self, candidate_name: str) -> list[tuple[int, int]]:
+        """(contest code, contest-level candidate record) of every contest a candidate is a part of."""
+        choice = self._choice_codes.get(candidate_name)
+        if choice is None: return []
+
+        start = self._columns['contest_candidate_start']
+        candidate_choice = self._columns['candidate_choice']
+        entries = []
+        for code in range(len(self._strings['contests'])):
+            i = next((i for i in range(start[code], start[code + 1]) if candidate_choice[i] == choice), None)
+            if i is not None:
+                entries.append((code, i))
+        return entries
+
+    def get_contests_by_candidate(self, candidate_name: str) -> list[str]:
+        """Retrieves the names of all contests that a given candidate is a part of."""
+        return [self._strings['contests'][code] for code, _ in self._candidate_entries(candidate_name)]
+
+    def get_all_candidate_results(self, candidate_name: str) -> list[CandidateData]:
+        """Retrieves all election results for a specific candidate across all contests."""
+        return [self._candidate('candidate', i) for _, i in self._candidate_entries(candidate_name)]
+
+    def has_candidate(self, candidate_name: str) -> bool:
+        """Checks whether a given candidate exists in the archive."""
+        return bool(self._candidate_entries(candidate_name))
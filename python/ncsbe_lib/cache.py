@@ -0,0 +1,332 @@
+import argparse
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from .columnar import ColumnarStore
+from .lazy import LazyContestData
+from .types import (
+    CandidateData, ContestData, ContestDigest, CountyData, CountyDigest, ParsedRow, PrecinctData, SourceInfo
+)
+
+# Every snapshot file starts with this magic number followed by a format version byte.
+_MAGIC = b'NCSBESNAP'
+_FORMAT_VERSION = 2
+_SUFFIX = '.snap'
+
+def default_cache_dir() -> str:
+    """Returns the per-user directory snapshots are kept in by default."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ncsbe-lib')
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    A parsed election dataset loaded from the snapshot cache, with the file it was parsed from.
+    """
+    # Election date in YYYY-MM-DD format.
+    election_date: str
+
+    # HTTP validators and content hash of the results file the dataset was parsed from.
+    source: SourceInfo
+
+    # The formatted election dataset.
+    dataset: tuple[ContestData, ...]
+
+    # Contest name -> content digest of that contest; `None` for a lazy dataset, whose digests are computed on demand.
+    digests: Optional[dict[str, ContestDigest]]
+
+class SnapshotCache:
+    """
+    The `SnapshotCache` class persists parsed election datasets on disk, so a restarted process
+    can serve data immediately instead of downloading and parsing the results file again.
+
+    Snapshots are keyed by election date and the `ETag` (or content hash) of the results file
+    they were parsed from. The hierarchy is flattened into nested tuples and written with
+    `marshal`, which shares repeated (interned) strings by reference and loads far faster than
+    reparsing the TSV; files are memory-mapped when read. Only the newest snapshot for each
+    election date is kept, and the cache can be bounded by total size and by age.
+
+    Contests of a lazy dataset (see `LazyContestData`) whose counties have not been built are
+    stored as their flat rows instead, and restored as lazy contests again, so neither saving
+    nor loading a snapshot builds their counties and precincts.
+
+    Example usage:
+    ```python
+    cache = SnapshotCache(max_bytes=500 * 1024 * 1024, max_age=30 * 24 * 3600)
+    election_data = NCSBE("2024-11-05", cache=cache)
+    election_data.initialize()  # served from disk if present, then revalidated with a conditional request
+    ```
+
+    Prefetch a list of elections from the command line with:
+    `python -m ncsbe_lib.cache --warm 2024-11-05 2022-11-08`
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None, max_age: Optional[float] = None):
+        """
+        Creates a snapshot cache rooted at `directory`.
+        param directory: Where snapshot files are kept; `default_cache_dir()` if omitted.
+        param max_bytes: Evict the least recently written snapshots once the cache grows past this size.
+        param max_age: Evict snapshots written more than this many seconds ago.
+        """
+        self._directory = directory or default_cache_dir()
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @staticmethod
+    def _key(source: SourceInfo) -> str:
+        return hashlib.sha1((source.etag or source.content_hash).encode('utf-8')).hexdigest()[:16]
+
+    def _paths(self, election_date: str) -> list[str]:
+        prefix = f'{election_date}_'
+        return [
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory)
+            if name.startswith(prefix) and name.endswith(_SUFFIX)
+        ]
+
+    def load(self, election_date: str, source: Optional[SourceInfo] = None) -> Optional[Snapshot]:
+        """
+        Loads the newest snapshot for an election date.
+        param source: If given, only a snapshot parsed from a file with the same ETag (or content hash) matches.
+        return: The snapshot, or `None` on a miss or an unreadable file.
+        """
+        paths = self._paths(election_date)
+        if source is not None:
+            paths = [path for path in paths if os.path.basename(path) == f'{election_date}_{self._key(source)}{_SUFFIX}']
+        if not paths: return None
+
+        path = max(paths, key=os.path.getmtime)
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(_MAGIC)] != _MAGIC or mm[len(_MAGIC)] != _FORMAT_VERSION:
+                    logging.warning(f"Ignoring snapshot with unknown format: {path}")
+                    return None
+                with memoryview(mm) as view, view[len(_MAGIC) + 1:] as body:
+                    payload = marshal.loads(body)
+        except (OSError, ValueError, EOFError, TypeError) as e:
+            logging.warning(f"Could not read snapshot {path}: {e}")
+            return None
+
+        return _decode_snapshot(election_date, payload)
+
+    def store(
+        self, election_date: str, source: SourceInfo, dataset: Iterable[ContestData],
+        digests: Optional[dict[str, ContestDigest]]
+    ) -> str:
+        """
+        Writes a snapshot for an election date, replacing older snapshots of the same election.
+        param digests: The contests' digests; `None` for a lazy dataset, to avoid building its counties.
+        return: The path of the snapshot file.
+        """
+        path = os.path.join(self._directory, f'{election_date}_{self._key(source)}{_SUFFIX}')
+        payload = marshal.dumps(_encode_snapshot(source, dataset, digests))
+
+        # Write to a temporary file first so readers never see a partial snapshot.
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_MAGIC)
+                f.write(bytes((_FORMAT_VERSION,)))
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        for old_path in self._paths(election_date):
+            if old_path != path:
+                os.unlink(old_path)
+
+        self.evict()
+        return path
+
+    def evict(self) -> list[str]:
+        """
+        Removes snapshots older than `max_age`, then the least recently written ones until the cache fits in `max_bytes`.
+        return: The paths that were removed.
+        """
+        entries = []
+        for name in os.listdir(self._directory):
+            if not name.endswith(_SUFFIX): continue
+            path = os.path.join(self._directory, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        removed = []
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            expired = self._max_age is not None and now - mtime > self._max_age
+            oversized = self._max_bytes is not None and total > self._max_bytes
+            if not (expired or oversized): continue
+
+            os.unlink(path)
+            removed.append(path)
+            total -= size
+
+        return removed
+
+    def clear(self) -> None:
+        """Removes every snapshot in the cache."""
+        for name in os.listdir(self._directory):
+            if name.endswith(_SUFFIX):
+                os.unlink(os.path.join(self._directory, name))
+
+
+def _encode_candidates(candidates: Iterable[CandidateData]) -> tuple:
+    return tuple(
+        (c.candidate, c.party, c.votes, c.election_day, c.early_voting, c.absentee_by_mail, c.provisional)
+        for c in candidates
+    )
+
+
+def _decode_candidates(candidates: tuple) -> tuple[CandidateData, ...]:
+    return tuple(CandidateData(*c) for c in candidates)
+
+
+def _encode_contest(contest: ContestData) -> tuple:
+    """A contest as (name, vote for, candidates, counties), or (name, vote for, candidates, None, rows) while lazy."""
+    rows = contest.pending_rows() if isinstance(contest, LazyContestData) else None
+    if rows is not None:
+        return (contest.contest_name, contest.vote_for, _encode_candidates(contest.candidates), None, rows)
+
+    return (
+        contest.contest_name,
+        contest.vote_for,
+        _encode_candidates(contest.candidates),
+        tuple(
+            (
+                county.county,
+                _encode_candidates(county.candidates),
+                tuple(
+                    (precinct.precinct, precinct.real_precinct, _encode_candidates(precinct.candidates))
+                    for precinct in county.precincts
+                )
+            )
+            for county in contest.counties
+        )
+    )
+
+
+def _encode_snapshot(source: SourceInfo, dataset: Iterable[ContestData], digests: Optional[dict[str, ContestDigest]]) -> tuple:
+    contests = tuple(_encode_contest(contest) for contest in dataset)
+    encoded_digests = {
+        name: (digest.digest, { county: (d.digest, d.precincts) for county, d in digest.counties.items() })
+        for name, digest in digests.items()
+    } if digests is not None else None
+    encoded_source = (source.etag, source.last_modified, source.content_length, source.content_hash)
+    return (encoded_source, contests, encoded_digests)
+
+
+def _decode_lazy_contest(store: ColumnarStore, contest_name: str, vote_for: int, candidates: tuple, rows: tuple) -> LazyContestData:
+    start = len(store)
+    for county, precinct, choice, party, real_precinct, total_votes, election_day, early_voting, absentee_by_mail, provisional in rows:
+        # The store does not keep the date, group or type columns, so they are not in the snapshot either.
+        store.append(ParsedRow(
+            county, '', precinct, 0, '', contest_name, choice, party, vote_for,
+            election_day, early_voting, absentee_by_mail, provisional, total_votes, real_precinct
+        ))
+    return LazyContestData(
+        contest_name = contest_name,
+        candidates = _decode_candidates(candidates),
+        vote_for = vote_for,
+        store = store,
+        rows = array('i', range(start, len(store)))
+    )
+
+
+def _decode_contest(store: ColumnarStore, contest_name: str, vote_for: int, candidates: tuple, counties: Optional[tuple], *rows) -> ContestData:
+    if counties is None:
+        return _decode_lazy_contest(store, contest_name, vote_for, candidates, rows[0])
+
+    return ContestData(
+        contest_name = contest_name,
+        counties = tuple(
+            CountyData(
+                county = county,
+                precincts = tuple(
+                    PrecinctData(
+                        precinct = precinct,
+                        candidates = _decode_candidates(candidates),
+                        real_precinct = real_precinct
+                    )
+                    for precinct, real_precinct, candidates in precincts
+                ),
+                candidates = _decode_candidates(county_candidates)
+            )
+            for county, county_candidates, precincts in counties
+        ),
+        candidates = _decode_candidates(candidates),
+        vote_for = vote_for
+    )
+
+
+def _decode_snapshot(election_date: str, payload: tuple) -> Snapshot:
+    encoded_source, contests, encoded_digests = payload
+    # Lazy contests share one store, as they do when parsed.
+    store = ColumnarStore()
+    dataset = tuple(_decode_contest(store, *contest) for contest in contests)
+    digests = {
+        name: ContestDigest(
+            digest = digest,
+            counties = { county: CountyDigest(digest=d, precincts=precincts) for county, (d, precincts) in counties.items() }
+        )
+        for name, (digest, counties) in encoded_digests.items()
+    } if encoded_digests is not None else None
+    return Snapshot(
+        election_date = election_date,
+        source = SourceInfo(*encoded_source),
+        dataset = dataset,
+        digests = digests
+    )
+
+
+def warm(election_dates: Iterable[str], cache: SnapshotCache) -> dict[str, bool]:
+    """
+    Prefetches elections into the snapshot cache.
+    return: Election date -> whether a snapshot is now cached for it.
+    """
+    from .ncsbe import NCSBE
+
+    res = {}
+    for election_date in election_dates:
+        ncsbe = NCSBE(election_date, cache=cache)
+        ncsbe.initialize()
+        res[election_date] = ncsbe.get_dataset() is not None
+    return res
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m ncsbe_lib.cache', description='Manage the NCSBE snapshot cache.')
+    parser.add_argument('--warm', nargs='+', metavar='DATE', default=[], help='election dates (YYYY-MM-DD) to prefetch')
+    parser.add_argument('--dir', default=None, help=f'cache directory (default: {default_cache_dir()})')
+    parser.add_argument('--max-bytes', type=int, default=None, help='evict snapshots once the cache grows past this size')
+    parser.add_argument('--max-age', type=float, default=None, help='evict snapshots older than this many seconds')
+    parser.add_argument('--clear', action='store_true', help='remove every snapshot before warming')
+    args = parser.parse_args(argv)
+
+    cache = SnapshotCache(args.dir, max_bytes=args.max_bytes, max_age=args.max_age)
+    if args.clear:
+        cache.clear()
+
+    failed = [date for date, cached in warm(args.warm, cache).items() if not cached]
+    for date in failed:
+        logging.error(f"Could not cache election {date}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,290 @@
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+import requests
+from .collector import create_session
+from .index import DatasetIndex
+from .ncsbe import NCSBE
+from .types import CandidateData, ContestData
+
+T = TypeVar('T')
+
+# Sorts after every character of a date, so an inclusive `until` of "2020" or "2020-11" covers the whole period.
+_END = '\uffff'
+
+# Name -> (election dates, (election date, `ContestData`) pairs), both in date order.
+_Entries = dict[str, tuple[tuple[str, ...], tuple[tuple[str, ContestData], ...]]]
+
+class _CatalogIndex:
+    """
+    Inverted indexes over the datasets of every election in a catalog, never mutated once built.
+    Each entry lists (election date, `ContestData`) pairs in date order, with the dates alongside
+    so a date range is found by bisection. `update` derives the index of a new set of datasets
+    by re-indexing only the elections whose `DatasetIndex` changed.
+    """
+
+    def __init__(
+        self, indexes: Optional[dict[str, DatasetIndex]] = None,
+        candidates: Optional[_Entries] = None, contests: Optional[_Entries] = None
+    ):
+        self.indexes = indexes if indexes is not None else {}
+        self.candidates = candidates if candidates is not None else {}
+        self.contests = contests if contests is not None else {}
+
+    def update(self, indexes: dict[str, DatasetIndex]) -> '_CatalogIndex':
+        """
+        Builds the index over `indexes` from this one. Only the names of elections that were added,
+        removed or refreshed are touched, so the cost follows the changed elections, not the catalog.
+        """
+        changed = [
+            date for date in dict.fromkeys([*self.indexes, *indexes])
+            if indexes.get(date) is not self.indexes.get(date)
+        ]
+        if not changed: return self
+
+        candidates = dict(self.candidates)
+        contests = dict(self.contests)
+        for date in changed:
+            old, new = self.indexes.get(date), indexes.get(date)
+            self._replace(
+                candidates, date,
+                old.candidate_contests if old is not None else {}, new.candidate_contests if new is not None else {}
+            )
+            self._replace(
+                contests, date,
+                self._by_name(old.contests) if old is not None else {}, self._by_name(new.contests) if new is not None else {}
+            )
+        return _CatalogIndex(dict(indexes), candidates, contests)
+
+    @staticmethod
+    def _by_name(contests: dict[str, ContestData]) -> dict[str, tuple[ContestData, ...]]:
+        return { name: (contest,) for name, contest in contests.items() }
+
+    @staticmethod
+    def _replace(
+        entries: _Entries, date: str,
+        old: dict[str, tuple[ContestData, ...]], new: dict[str, tuple[ContestData, ...]]
+    ) -> None:
+        """Swaps one election's contests under every name it had or has, keeping each entry in date order."""
+        for name in dict.fromkeys([*old, *new]):
+            dates, items = entries.get(name, ((), ()))
+            kept = [item for item in items if item[0] != date]
+            position = bisect_left([item_date for item_date, _ in kept], date)
+            kept[position:position] = [(date, contest) for contest in new.get(name, ())]
+
+            if kept:
+                entries[name] = (tuple(item_date for item_date, _ in kept), tuple(kept))
+            else:
+                del entries[name]
+
+
+def _between(
+    entries: Optional[tuple[tuple[str, ...], tuple[T, ...]]], since: Optional[str], until: Optional[str]
+) -> list[T]:
+    """The entries dated from `since` to `until`, both inclusive and either open-ended."""
+    if not entries: return []
+
+    dates, items = entries
+    start = bisect_left(dates, since) if since is not None else 0
+    end = bisect_right(dates, until + _END) if until is not None else len(dates)
+    return list(items[start:end])
+
+
+class ElectionCatalog:
+    """
+    The `ElectionCatalog` class manages the `NCSBE` instances of many elections and answers
+    queries across all of them, e.g. every race a candidate has appeared in since 2016.
+
+    - Elections are loaded and refreshed concurrently, `max_concurrency` at a time, over one
+      shared HTTP session.
+    - Every election's collector interns its strings into one table, so a county, party or
+      candidate name is a single string object across all elections.
+    - A candidate -> (election, contest) and a contest -> (election, contest) inverted index
+      are built over every loaded dataset, so cross-election lookups are dictionary hits
+      followed by a bisection on the election dates instead of a scan of every election.
+      On the first query after an election's dataset changes, including changes made by
+      `start_auto_refresh` on a single election, a new version of the indexes is derived off
+      to the side, re-indexing only that election, and swapped in whole.
+
+    Date ranges are inclusive and compare dates as YYYY-MM-DD text, so `since="2016"` and
+    `until="2020"` cover whole years.
+
+    Example usage:
+    ```python
+    catalog = ElectionCatalog(["2016-11-08", "2020-03-03", "2020-11-03", "2024-11-05"])
+    catalog.load()
+    catalog.get_contests_by_candidate("Josh Stein", since="2016")
+    catalog.get("2024-11-05").get_contest_winner("NC_GOVERNOR")
+    ```
+    """
+
+    def __init__(
+        self, election_dates: Iterable[str] = (), max_concurrency: int = 4,
+        session: Optional[requests.Session] = None, **kwargs
+    ):
+        """
+        Creates a catalog of elections; call `load()` to fetch them.
+        param election_dates: Dates of the elections to manage, in YYYY-MM-DD format; more can be `add`ed later.
+        param max_concurrency: Maximum number of results files downloaded and parsed at the same time.
+        param session: HTTP session shared by every election; one sized for `max_concurrency` if omitted.
+        param kwargs: Passed through to each `NCSBE` (e.g. `cache`, `filters`, `incremental`).
+        """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}')
+        if 'strings' in kwargs:
+            raise ValueError('The catalog shares its own table of interned strings between elections.')
+
+        self._max_concurrency = max_concurrency
+        self._session = session if session is not None else create_session(pool_maxsize=max_concurrency)
+        self._kwargs = kwargs
+        self._strings: dict[str, str] = {}
+        self._elections: dict[str, NCSBE] = {}
+        self._lock = threading.Lock()
+        self._index = _CatalogIndex()
+
+        for date in election_dates:
+            self.add(date)
+
+
+    def add(self, election_date: str) -> NCSBE:
+        """
+        Adds an election to the catalog without loading it; adding one already there returns it.
+        return: The election's `NCSBE` instance.
+        """
+        with self._lock:
+            election = self._elections.get(election_date)
+            if election is None:
+                election = self._elections[election_date] = NCSBE(
+                    election_date, session=self._session, strings=self._strings, **self._kwargs
+                )
+            return election
+
+
+    def _run(self, election_dates: Optional[Iterable[str]], task: Callable[[NCSBE], T]) -> dict[str, T]:
+        dates = list(election_dates) if election_dates is not None else self.election_dates
+        elections = [self.add(date) for date in dates]
+        if len(elections) <= 1 or self._max_concurrency == 1:
+            return { date: task(election) for date, election in zip(dates, elections) }
+
+        with ThreadPoolExecutor(max_workers=min(self._max_concurrency, len(elections))) as pool:
+            return dict(zip(dates, pool.map(task, elections)))
+
+
+    def load(self, election_dates: Optional[Iterable[str]] = None) -> dict[str, bool]:
+        """
+        Initializes elections concurrently, adding any that are not in the catalog yet.
+        param election_dates: The elections to load; every election in the catalog if omitted.
+        return: Election date -> whether the election has a dataset; see its `last_error` if not.
+        """
+        def initialize(election: NCSBE) -> bool:
+            election.initialize()
+            return election.get_dataset() is not None
+
+        return self._run(election_dates, initialize)
+
+
+    def refresh(self, election_dates: Optional[Iterable[str]] = None) -> dict[str, bool]:
+        """
+        Refreshes elections concurrently; see `NCSBE.refresh`.
+        param election_dates: The elections to refresh; every election in the catalog if omitted.
+        return: Election date -> whether its dataset changed.
+        """
+        return self._run(election_dates, NCSBE.refresh)
+
+
+    @property
+    def election_dates(self) -> list[str]:
+        """The dates of every election in the catalog, oldest first."""
+        return sorted(self._elections)
+
+
+    def get(self, election_date: str) -> Optional[NCSBE]:
+        """Retrieves the `NCSBE` instance of an election in the catalog, to query it on its own."""
+        return self._elections.get(election_date)
+
+
+    def __contains__(self, election_date: str) -> bool:
+        return election_date in self._elections
+
+
+    def __len__(self) -> int:
+        return len(self._elections)
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.election_dates)
+
+
+    def _current_index(self) -> _CatalogIndex:
+        index = self._index
+        # Each election swaps in a new `DatasetIndex` whenever its dataset changes, so comparing
+        # them by identity is enough to tell whether the inverted indexes are still current.
+        indexes = {
+            date: election._index for date, election in list(self._elections.items())
+            if election._index.dataset is not None
+        }
+        if indexes.keys() == index.indexes.keys() and all(indexes[date] is index.indexes[date] for date in indexes):
+            return index
+
+        with self._lock:
+            if self._index is index:
+                self._index = index.update(indexes)
+            return self._index
+
+
+    def list_candidates(self) -> list[str]:
+        """Retrieves every candidate in any loaded election."""
+        return list(self._current_index().candidates)
+
+
+    def has_candidate(self, candidate_name: str) -> bool:
+        """Checks whether a candidate appears in any loaded election."""
+        return candidate_name in self._current_index().candidates
+
+
+    def get_contests_by_candidate(
+        self, candidate_name: str, since: Optional[str] = None, until: Optional[str] = None
+    ) -> list[tuple[str, ContestData]]:
+        """
+        Retrieves every contest a candidate appears in, across elections.
+        param since: Earliest election date to include; no lower bound if omitted.
+        param until: Latest election date to include; no upper bound if omitted.
+        return: (election date, contest) pairs, oldest election first.
+        """
+        return _between(self._current_index().candidates.get(candidate_name), since, until)
+
+
+    def get_all_candidate_results(
+        self, candidate_name: str, since: Optional[str] = None, until: Optional[str] = None
+    ) -> list[tuple[str, CandidateData]]:
+        """
+        Retrieves a candidate's results in every contest they appear in, across elections.
+        param since: Earliest election date to include; no lower bound if omitted.
+        param until: Latest election date to include; no upper bound if omitted.
+        return: (election date, candidate results) pairs, oldest election first.
+        """
+        index = self._current_index()
+        return [
+            (date, index.indexes[date].candidates[(contest.contest_name, candidate_name)])
+            for date, contest in _between(index.candidates.get(candidate_name), since, until)
+        ]
+
+
+    def get_elections_by_candidate(
+        self, candidate_name: str, since: Optional[str] = None, until: Optional[str] = None
+    ) -> list[str]:
+        """Retrieves the dates of every election a candidate appears in, oldest first."""
+        return list(dict.fromkeys(date for date, _ in self.get_contests_by_candidate(candidate_name, since, until)))
+
+
+    def get_contest_history(
+        self, contest: str, since: Optional[str] = None, until: Optional[str] = None
+    ) -> list[tuple[str, ContestData]]:
+        """
+        Retrieves a contest in every election that held it, e.g. each race for "US_SENATE".
+        param since: Earliest election date to include; no lower bound if omitted.
+        param until: Latest election date to include; no upper bound if omitted.
+        return: (election date, contest) pairs, oldest election first.
+        """
+        return _between(self._current_index().contests.get(contest), since, until)
@@ -1,12 +1,286 @@
 import requests
 import zipfile
 import csv
-import re
 import logging
-from io import BytesIO, StringIO
-from .types import CandidateData, ContestData, CountyData, ParsedRow, PrecinctData
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from io import BytesIO, StringIO, TextIOWrapper
+from operator import itemgetter
+from typing import IO, Iterable, Iterator, Optional, Sequence, Tuple
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util.retry import Retry
+from .columnar import ColumnarStore
+from .diff import digest_contest_parts, digest_county, digest_precinct
+from .filters import RowFilter, normalize_contest_name
+from .incremental import IncrementalAggregator
+from .lazy import build_lazy_dataset
+from .metrics import Metrics
+from .types import CandidateData, ContestData, ContestDigest, CountyData, ParseCacheInfo, ParsedRow, PrecinctData, SourceInfo
 
-class Collector:
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError: # PyArrow is optional; only the 'pyarrow' engine needs it.
+    pyarrow = None
+
+# Columns of the results file that `ParsedRow` is built from, in the order of its fields.
+TSV_COLUMNS = (
+    'County', 'Election Date', 'Precinct', 'Contest Group ID', 'Contest Type', 'Contest Name',
+    'Choice', 'Choice Party', 'Vote For', 'Election Day', 'Early Voting', 'Absentee by Mail',
+    'Provisional', 'Total Votes', 'Real Precinct',
+)
+
+# Columns read as text by the 'pyarrow' engine; the others are parsed as integers.
+# 'Contest Group ID' stays text so that `RowFilter` sees the same raw fields as with the python engine.
+_TEXT_COLUMNS = (
+    'County', 'Election Date', 'Precinct', 'Contest Group ID', 'Contest Type', 'Contest Name', 'Choice',
+    'Choice Party', 'Real Precinct',
+)
+
+# Ways to split the results file into rows, see `Collector`.
+ENGINES = ('python', 'pyarrow')
+
+# Default (connect, read) timeouts in seconds for fetching a results file.
+DEFAULT_TIMEOUT = (5.0, 20.0)
+
+def create_session(
+    retries: int = 3, backoff_factor: float = 0.5, pool_maxsize: int = 10, transport: Optional[BaseAdapter] = None
+) -> requests.Session:
+    """
+    Creates a pooled HTTP session for fetching results files.
+    Connections are kept alive between requests, and failed requests are retried with exponential backoff
+    on connection errors, read timeouts and 5xx answers.
+    param retries: Maximum number of retries per request.
+    param backoff_factor: Base of the exponential delay between retries, in seconds.
+    param pool_maxsize: Connections kept open per host; raise it when many elections share one session.
+    param transport: Adapter to send every request through instead of the network (e.g. a local stand-in in tests).
+    """
+    session = requests.Session()
+    if transport is None:
+        retry = Retry(
+            total = retries,
+            connect = retries,
+            read = retries,
+            status = retries,
+            backoff_factor = backoff_factor,
+            status_forcelist = (500, 502, 503, 504),
+            allowed_methods = frozenset({'GET'}),
+            raise_on_status = False
+        )
+        transport = HTTPAdapter(max_retries=retry, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+
+    session.mount('https://', transport)
+    session.mount('http://', transport)
+    return session
+
+class _RowParser:
+    """
+    Parses results files into `ParsedRow`s and folds them into the intermediate contest -> county
+    -> precinct dictionaries, with no HTTP state. `Collector` builds on it, and the process-pool
+    workers of parallel parsing use it on its own.
+    """
+
+    def __init__(self, filters: Optional[RowFilter] = None, engine: str = 'python', strings: Optional[dict[str, str]] = None):
+        self._filters = filters
+        self._engine = engine
+
+        # Raw contest name -> normalized name, and the table of interned categorical strings,
+        # which collectors of related elections may share (see `ElectionCatalog`).
+        self._contest_names: dict[str, str] = {}
+        self._strings: dict[str, str] = strings if strings is not None else {}
+        self._normalize_hits = 0
+        self._normalize_misses = 0
+        self._intern_hits = 0
+        self._intern_misses = 0
+
+    def _normalize_contest_name(self, contest_name: str) -> str:
+        normalized = self._contest_names.get(contest_name)
+        if normalized is not None:
+            self._normalize_hits += 1
+            return normalized
+
+        self._normalize_misses += 1
+        normalized = normalize_contest_name(contest_name)
+        # `setdefault` so that collectors sharing the table and interning the same value at once agree on one copy.
+        normalized = self._contest_names[contest_name] = self._strings.setdefault(normalized, normalized)
+        return normalized
+
+    def cache_info(self) -> ParseCacheInfo:
+        """
+        Reports hit/miss counters of the contest-name and string-interning caches since the collector was created.
+        Intern misses are the strings the table gained while parsing, so with a table shared between collectors,
+        strings another collector interns meanwhile count as misses too.
+        """
+        return ParseCacheInfo(
+            normalize_hits = self._normalize_hits,
+            normalize_misses = self._normalize_misses,
+            intern_hits = self._intern_hits,
+            intern_misses = self._intern_misses,
+            interned_strings = len(self._strings)
+        )
+
+
+    def _parse_tsv_data(self, tsv_data: str) -> list[ParsedRow]:
+        """Parses TSV data into a list of structured election result rows."""
+        if self._engine == 'pyarrow':
+            return self._parse_tsv_arrow(tsv_data)
+
+        if '"' in tsv_data:
+            # Quoted fields may hold tabs or line breaks; let the csv module handle them.
+            reader = csv.reader(StringIO(tsv_data), delimiter='\t')
+            header = next(reader, None)
+        else:
+            # Without quoting, every line is a row and every tab separates two fields.
+            lines = tsv_data.split('\n')
+            if '\r' in tsv_data:
+                lines = [line.rstrip('\r') for line in lines]
+            header = lines[0].split('\t') if lines[0] else None
+            reader = (line.split('\t') for line in lines[1:] if line)
+
+        if header is None: return []
+        return list(self._decode_rows(header, reader))
+
+
+    def _parse_tsv_arrow(self, tsv_data: str) -> list[ParsedRow]:
+        """Parses TSV data with PyArrow's multithreaded CSV reader, which also converts the vote counts."""
+        table = pyarrow.csv.read_csv(
+            BytesIO(tsv_data.encode('utf-8')),
+            parse_options = pyarrow.csv.ParseOptions(delimiter='\t'),
+            convert_options = pyarrow.csv.ConvertOptions(
+                column_types = { name: pyarrow.string() for name in _TEXT_COLUMNS },
+                include_columns = list(TSV_COLUMNS)
+            )
+        )
+        columns = [table.column(name).to_pylist() for name in TSV_COLUMNS]
+        return list(self._decode_rows(TSV_COLUMNS, zip(*columns)))
+
+
+    @staticmethod
+    def _column_indexes(header: Sequence[str]) -> tuple[int, ...]:
+        """Resolves the position of every column in `TSV_COLUMNS` from a file's header."""
+        missing = [name for name in TSV_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f'Results file is missing columns: {", ".join(missing)}')
+        return tuple(list(header).index(name) for name in TSV_COLUMNS)
+
+
+    def _decode_rows(self, header: Sequence[str], rows: Iterable[Sequence[str]]) -> Iterator[ParsedRow]:
+        """
+        Converts positional rows into `ParsedRow`s in one loop, skipping blank rows and rows the filters reject.
+        The header is resolved to column indexes once; each row's fields are then picked in a single call.
+        """
+        pick = itemgetter(*self._column_indexes(header))
+        match = self._filters.match_fields if self._filters is not None else None
+        intern = self._strings.setdefault
+        normalize = self._normalize_contest_name
+
+        # Interning is inlined: misses are what the table gained once the rows are consumed, every other lookup a hit.
+        strings_before = len(self._strings)
+        normalize_misses_before = self._normalize_misses
+        n_rows = 0
+        try:
+            for row in rows:
+                if not row: continue
+                (
+                    county, election_date, precinct, contest_group_id, contest_type, contest_name, choice, choice_party,
+                    vote_for, election_day, early_voting, absentee_by_mail, provisional, total_votes, real_precinct
+                ) = pick(row)
+                if match is not None and not match(county, contest_group_id, contest_type, contest_name): continue
+
+                n_rows += 1
+                # Positional, in `ParsedRow` field order.
+                yield ParsedRow(
+                    intern(county, county), intern(election_date, election_date), intern(precinct, precinct),
+                    int(contest_group_id), intern(contest_type, contest_type), normalize(contest_name),
+                    intern(choice, choice), intern(choice_party, choice_party), int(vote_for), int(election_day),
+                    int(early_voting), int(absentee_by_mail), int(provisional), int(total_votes), real_precinct == 'Y'
+                )
+        finally:
+            misses = len(self._strings) - strings_before
+            # Six interned fields per row, plus every newly normalized contest name.
+            lookups = 6 * n_rows + self._normalize_misses - normalize_misses_before
+            self._intern_misses += misses
+            self._intern_hits += lookups - misses
+
+
+    def _accumulate(self, parsed_data: Iterable[ParsedRow], data: dict[str, dict], store: Optional[ColumnarStore]) -> int:
+        """
+        Folds parsed rows into the intermediate contest -> county -> precinct dictionaries.
+        return: The number of rows folded.
+        """
+        rows = 0
+        for row in parsed_data:
+            rows += 1
+            if store is not None:
+                store.append(row)
+
+            contest_name = row.contest_name
+            county = row.county
+            precinct = row.precinct
+            choice = row.choice
+
+            if contest_name not in data:
+                data[contest_name] = {
+                    'counties': {},
+                    'candidates': {},
+                    'vote_for': row.vote_for
+                }
+            contest = data[contest_name]
+
+            if county not in contest['counties']:
+                contest['counties'][county] = {
+                    'precincts': {},
+                    'candidates': {}
+                }
+            county_data = contest['counties'][county]
+            
+            if precinct not in county_data['precincts']:
+                county_data['precincts'][precinct] = {
+                    'real_precinct': row.real_precinct,
+                    'candidates': []
+                }
+
+            county_data['precincts'][precinct]['candidates'].append(self._add_votes(self._new_tally(row), row))
+
+            # Roll the row up into the county and contest totals in the same pass.
+            if choice not in county_data['candidates']:
+                county_data['candidates'][choice] = self._new_tally(row)
+            self._add_votes(county_data['candidates'][choice], row)
+
+            if choice not in contest['candidates']:
+                contest['candidates'][choice] = self._new_tally(row)
+            self._add_votes(contest['candidates'][choice], row)
+
+        return rows
+
+
+    @staticmethod
+    def _new_tally(row: ParsedRow) -> dict:
+        """Starts an empty vote tally for the row's candidate, keyed by `CandidateData` field."""
+        return {
+            'candidate': row.choice,
+            'party': row.choice_party,
+            'votes': 0,
+            'election_day': 0,
+            'early_voting': 0,
+            'absentee_by_mail': 0,
+            'provisional': 0
+        }
+
+
+    @staticmethod
+    def _add_votes(tally: dict, row: ParsedRow) -> dict:
+        """Adds the row's vote counts, by method, to a tally."""
+        tally['votes'] += row.total_votes
+        tally['election_day'] += row.election_day
+        tally['early_voting'] += row.early_voting
+        tally['absentee_by_mail'] += row.absentee_by_mail
+        tally['provisional'] += row.provisional
+        return tally
+
+class Collector(_RowParser):
     """
     The `Collector` class is responsible for fetching, parsing, and formatting election data
     from the North Carolina State Board of Elections (NCSBE).
@@ -17,6 +291,62 @@ class Collector:
     - Parses the TSV file into structured election data.
     - Formats the parsed data into a hierarchical structure for easy analysis.
 
+    In streaming mode (`stream=True`) the response body is spooled to a temporary file
+    chunk by chunk and the TSV members are decoded and parsed row by row as `_format`
+    consumes them, so the raw file is never held in memory as bytes, text, or a row list.
+
+    A `Collector` remembers the `ETag`/`Last-Modified` validators and content hash of the
+    last file it parsed. Repeated calls to `collect()` send a conditional request, and if
+    the server answers 304 or the body is byte-for-byte identical, parsing is skipped and
+    the previous dataset is returned as-is (`modified` is then `False`).
+
+    While formatting, a stable content digest is computed for every contest, county and
+    precinct (see `digests`), so consumers can tell what changed without rehashing the data.
+
+    With `columnar=True`, every row is also appended to a dictionary-encoded `ColumnarStore`
+    (see `columnar`) that aggregate queries can reduce over without walking the hierarchy.
+    The store is kept in addition to the `ContestData` hierarchy, so this trades memory for
+    faster aggregations; `lazy=True` is the mode that holds less.
+
+    With `workers` greater than one, the decoded TSV is split at line boundaries and the
+    chunks are parsed and aggregated in a process pool; the partial hierarchies are merged,
+    in file order and with their strings re-interned, before the final objects are built.
+    Parallel parsing needs the decoded file, so it cannot be combined with streaming mode.
+    Quoted fields may hold line breaks, so files with any quoting are parsed serially.
+
+    Rows are decoded positionally: the header is resolved to column indexes once per file, and
+    each row's fields are picked, converted and interned in a single loop. Files without any
+    quoting are split on line breaks and tabs directly instead of going through `csv.reader`.
+    With `engine='pyarrow'` (requires the optional `pyarrow` package), the file is read by
+    PyArrow's multithreaded CSV reader instead, which also parses the vote counts.
+
+    While parsing, normalized contest names are memoized and repeated categorical strings
+    (county, precinct, choice, party, ...) are interned, so every row of the same county or
+    candidate shares one string object. Both caches live as long as the collector, so
+    refreshes reuse them; `cache_info()` reports their hits and misses. Pass the same `strings`
+    table to the collectors of several elections to share those objects across elections too.
+
+    With `incremental=True`, each new version of the file is diffed against the previous one
+    precinct by precinct (see `IncrementalAggregator`): only changed precincts are rebuilt,
+    county and contest totals are adjusted by their delta, and unchanged `PrecinctData`,
+    `CountyData` and `ContestData` objects are reused. It cannot be combined with `workers`.
+
+    With `filters` (a `RowFilter`), rows outside the selected contests, counties, contest types
+    or contest groups are dropped on their raw fields, before any conversion, so only the
+    selected part of the state is parsed, aggregated and held.
+
+    With `lazy=True`, the rows are kept in a compact `ColumnarStore` and each contest is a
+    `LazyContestData`: its candidate totals are computed up front, but its counties and
+    precincts are only built when first accessed. Digests are then computed on demand.
+    It cannot be combined with `workers` or `incremental`.
+
+    Pass a `Metrics` instance to record the duration of every stage (fetch, extract, parse,
+    format), the bytes downloaded and the rows parsed.
+
+    Requests go through a pooled `requests.Session` (see `create_session`) that keeps the
+    connection alive between refreshes and retries transient failures with backoff. A session
+    can be shared by many collectors, and connect and read timeouts are set separately.
+
     Example usage:
     ```python
     collector = Collector("https://s3.amazonaws.com/dl.ncsbe.gov/ENRS/2024_11_05/results_pct_20241105.zip") # 2024 election
@@ -25,48 +355,298 @@ class Collector:
     ```
     """
     
-    def __init__(self, url: str):
+    # Response bodies larger than this are spooled to disk rather than kept in memory.
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+    # Size of each chunk read from the response body in streaming mode.
+    CHUNK_SIZE = 64 * 1024
+
+    # Decoded files smaller than this are parsed serially even when `workers` > 1,
+    # since starting the pool would cost more than it saves.
+    PARALLEL_MIN_SIZE = 4 * 1024 * 1024
+
+    def __init__(
+        self, url: str, stream: bool = False, columnar: bool = False, workers: int = 1,
+        session: Optional[requests.Session] = None, timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        metrics: Optional[Metrics] = None, incremental: bool = False, lazy: bool = False,
+        filters: Optional[RowFilter] = None, engine: str = 'python', strings: Optional[dict[str, str]] = None
+    ):
+        if workers < 1:
+            raise ValueError(f'workers must be at least 1, got {workers}')
+        if engine not in ENGINES:
+            raise ValueError(f'engine must be one of {ENGINES}, got {engine!r}')
+        if engine == 'pyarrow' and pyarrow is None:
+            raise ValueError("engine='pyarrow' requires the pyarrow package.")
+        if engine == 'pyarrow' and stream:
+            raise ValueError('The pyarrow engine cannot be combined with streaming mode.')
+        if stream and workers > 1:
+            raise ValueError('Parallel parsing cannot be combined with streaming mode.')
+        if incremental and workers > 1:
+            raise ValueError('Incremental aggregation cannot be combined with parallel parsing.')
+        if lazy and (incremental or workers > 1):
+            raise ValueError('Lazy contests cannot be combined with incremental aggregation or parallel parsing.')
+
+        super().__init__(filters=filters, engine=engine, strings=strings)
         self._url = url
+        self._stream = stream
+        self._columnar = columnar
+        self._workers = workers
+        self._session = session if session is not None else create_session()
+        self._timeout = timeout
+        self._metrics = metrics
+        self._aggregator = IncrementalAggregator() if incremental else None
+        self._lazy = lazy
+
+        # Rows folded into the hierarchy by the last `_format`.
+        self._rows_parsed = 0
+
+        # Whether the last call to `collect()` produced a new dataset.
+        self.modified = True
+
+        # The exception that made the last call to `collect()` fail, or `None` if it succeeded.
+        self.last_error: Optional[Exception] = None
+
+        # The last successfully parsed dataset and the response it came from.
+        self._dataset: Optional[list[ContestData]] = None
+        self._source: Optional[SourceInfo] = None
+        self._digests: Optional[dict[str, ContestDigest]] = {}
+        self._store: Optional[ColumnarStore] = None
+
+        # Validators, digests and columns of the response currently being processed, committed once it parses.
+        self._pending_source: Optional[SourceInfo] = None
+        self._pending_digests: Optional[dict[str, ContestDigest]] = {}
+        self._pending_store: Optional[ColumnarStore] = None
+
+    @property
+    def dataset(self) -> Optional[list[ContestData]]:
+        """The last dataset successfully produced by `collect()`."""
+        return self._dataset
+
+    @property
+    def digests(self) -> Optional[dict[str, ContestDigest]]:
+        """Contest name -> content digest of that contest in `dataset`; `None` in lazy mode, where they are computed on demand."""
+        return self._digests
+
+    @property
+    def columnar(self) -> Optional[ColumnarStore]:
+        """Column-oriented copy of the rows behind `dataset`, if the collector was created with `columnar=True`."""
+        return self._store
+
+    @property
+    def source(self) -> Optional[SourceInfo]:
+        """HTTP validators and content hash of the file behind the current dataset."""
+        return self._source
+
+    def restore(self, dataset: list[ContestData], source: SourceInfo, digests: Optional[dict[str, ContestDigest]] = None) -> None:
+        """
+        Seeds the collector with a dataset parsed earlier (e.g. from a snapshot cache), so the next
+        `collect()` sends a conditional request for it and skips parsing if the file is unchanged.
+        """
+        self._dataset = dataset
+        self._source = source
+        # Without digests (e.g. a lazy dataset), they are computed on demand, as in lazy mode.
+        self._digests = digests
+        self._store = None
+        self.modified = False
 
-    def _normalize_contest_name(self, contest_name: str) -> str:
-        return re.sub(r'[^a-zA-Z0-9]+', '_', contest_name.strip())
-    
-    
     def collect(self) -> list[ContestData]:
         """
         Collects and processes election data from the provided ZIP file URL.
         return a structured representation of the election results.
         """
+        if self._metrics is None: return self._collect()
+
+        self._metrics.increment('collections')
+        with self._metrics.time_stage('collect'):
+            dataset = self._collect()
+
+        if self.last_error is not None:
+            self._metrics.increment('collect_failures')
+        elif not self.modified:
+            self._metrics.increment('not_modified')
+        else:
+            self._metrics.increment('rows_parsed', self._rows_parsed)
+            self._metrics.set_gauge('last_rows', self._rows_parsed)
+            self._metrics.max_gauge('peak_rows', self._rows_parsed)
+        return dataset
+
+
+    def _stage(self, name: str):
+        """Times a stage of `collect()` when metrics are enabled."""
+        return self._metrics.time_stage(name) if self._metrics is not None else nullcontext()
+
+
+    def _collect(self) -> list[ContestData]:
         try:
-            zip_buffer = self._fetchData(self._url)
-            tsv_data = self._extract_tsv_files(zip_buffer)
-            parsed_data = self._parse_tsv_data(tsv_data)
-            return self._format(parsed_data)
+            self.modified = True
+            self.last_error = None
+            if self._stream:
+                dataset = self._collect_stream()
+            else:
+                with self._stage('fetch'):
+                    zip_buffer = self._fetchData(self._url)
+                if not self.modified: return self._dataset
+
+                with self._stage('extract'):
+                    tsv_data = self._extract_tsv_files(zip_buffer)
+                # Chunks are cut at line breaks, which quoted fields may contain, so quoted files are parsed serially.
+                if self._workers > 1 and len(tsv_data) >= self.PARALLEL_MIN_SIZE and '"' not in tsv_data:
+                    with self._stage('parse_format'):
+                        dataset = self._format_parallel(tsv_data)
+                else:
+                    with self._stage('parse'):
+                        parsed_data = self._parse_tsv_data(tsv_data)
+                    with self._stage('format'):
+                        dataset = self._format(parsed_data)
+
+            if self.modified:
+                self._dataset = dataset
+                self._source = self._pending_source
+                self._digests = self._pending_digests
+                self._store = self._pending_store
+            return dataset
         except Exception as e:
+            self.last_error = e
             logging.error(f"Error: {e}")
 
 
-    def _fetchData(self, url: str) -> BytesIO:
-        """Fetches a ZIP file from the provided URL, returning its raw binary data as bytes."""
+    def _collect_stream(self) -> list[ContestData]:
+        """Runs the streaming pipeline: response chunks -> spooled ZIP -> TSV lines -> rows -> hierarchy."""
+        with self._stage('fetch'):
+            zip_file = self._fetch_stream(self._url)
+        if not self.modified: return self._dataset
+        if zip_file is None:
+            raise ValueError('No data fetched.')
+
+        with zip_file, self._stage('process'):
+            return self._format(self._iter_tsv_rows(zip_file))
+
+
+    def _conditional_headers(self) -> dict[str, str]:
+        """Builds `If-None-Match`/`If-Modified-Since` headers from the last parsed response."""
+        headers: dict[str, str] = {}
+        if self._dataset is None or self._source is None: return headers
+
+        if self._source.etag:
+            headers['If-None-Match'] = self._source.etag
+        if self._source.last_modified:
+            headers['If-Modified-Since'] = self._source.last_modified
+        return headers
+
+
+    def _is_not_modified(self, response: requests.Response) -> bool:
+        """Checks for a 304 answer to a conditional request, flagging the dataset as unchanged."""
+        if response.status_code != 304 or self._dataset is None: return False
+
+        logging.info("Data not modified since last fetch.")
+        self.modified = False
+        return True
+
+
+    def _remember_source(self, response: requests.Response, content_hash: str) -> None:
+        """Records the response validators, flagging the dataset as unchanged if the body is identical."""
+        content_length = response.headers.get("Content-Length")
+        self._pending_source = SourceInfo(
+            etag = response.headers.get("ETag"),
+            last_modified = response.headers.get("Last-Modified"),
+            content_length = int(content_length) if content_length else None,
+            content_hash = content_hash
+        )
+
+        if self._dataset is not None and self._source is not None and self._source.content_hash == content_hash:
+            logging.info("Fetched data is identical to the current dataset.")
+            # Keep the new validators so the next request can be answered with a 304.
+            self._source = self._pending_source
+            self.modified = False
+
+
+    @staticmethod
+    def _check_content_type(response: requests.Response) -> None:
+        content_type = response.headers.get("Content-Type", "")
+        if content_type != "application/x-zip-compressed":
+            raise ValueError(f"Unexpected content type: {content_type}")
+
+
+    def _fetchData(self, url: str) -> Optional[BytesIO]:
+        """
+        Fetches a ZIP file from the provided URL, returning its raw binary data as bytes, or `None` if it is unchanged.
+        Request failures and unexpected answers are raised, so `collect()` records them in `last_error`.
+        """
         try:
-            print(url)
-            response = requests.get(url, timeout=20)
+            logging.info(f"Fetching {url}")
+            response = self._session.get(url, timeout=self._timeout, headers=self._conditional_headers())
+            if self._is_not_modified(response): return None
             response.raise_for_status()
 
-            content_type = response.headers.get("Content-Type", "")
-            if content_type != "application/x-zip-compressed":
-                logging.warning(f"Unexpected content type: {content_type}")
-                return None
+            self._check_content_type(response)
 
             logging.info("Data fetched successfully.")
+            if self._metrics is not None:
+                self._metrics.increment('bytes_downloaded', len(response.content))
+            self._remember_source(response, hashlib.sha256(response.content).hexdigest())
             return BytesIO(response.content)
         
         except requests.exceptions.Timeout:
             logging.error(f"Request timed out while fetching {url}")
+            raise
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Request failed: {e}")
+            raise
+
+
+    def _fetch_stream(self, url: str) -> Optional[IO[bytes]]:
+        """
+        Fetches a ZIP file chunk by chunk into a spooled temporary file, returning it rewound to the start,
+        or `None` if it is unchanged. Failures are raised, as in `_fetchData`.
+        """
+        try:
+            logging.info(f"Fetching {url}")
+            with self._session.get(url, timeout=self._timeout, stream=True, headers=self._conditional_headers()) as response:
+                if self._is_not_modified(response): return None
+                response.raise_for_status()
+
+                self._check_content_type(response)
+
+                # ZIP archives keep their directory at the end of the file, so the body has to
+                # land somewhere seekable; spooling keeps small files in memory and large ones on disk.
+                spool = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
+                content_hash = hashlib.sha256()
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    content_hash.update(chunk)
+                    spool.write(chunk)
+
+            if self._metrics is not None:
+                self._metrics.increment('bytes_downloaded', spool.tell())
+            spool.seek(0)
+            logging.info("Data fetched successfully.")
+            self._remember_source(response, content_hash.hexdigest())
+            if not self.modified:
+                spool.close()
+                return None
+            return spool
+
+        except requests.exceptions.Timeout:
+            logging.error(f"Request timed out while fetching {url}")
+            raise
         except requests.exceptions.RequestException as e:
             logging.error(f"Request failed: {e}")
+            raise
 
-        return None
+
+    def _iter_tsv_rows(self, zip_file: IO[bytes]) -> Iterator[ParsedRow]:
+        """Yields the parsed rows of every TSV file in the ZIP, decoding each member incrementally."""
+        with zipfile.ZipFile(zip_file, 'r') as zf:
+            tsv_files = [f for f in zf.namelist() if f.endswith('.txt')]
+
+            if not tsv_files:
+                raise ValueError(f'No TSV files found in ZIP.')
+
+            for f in tsv_files:
+                with zf.open(f) as member, TextIOWrapper(member, encoding='utf-8', newline='') as text:
+                    reader = csv.reader(text, delimiter='\t')
+                    header = next(reader, None)
+                    if header is None: continue
+                    yield from self._decode_rows(header, reader)
     
 
     def _extract_tsv_files(self, zip_buffer: BytesIO) -> str:
@@ -80,121 +660,170 @@ class Collector:
             return "\n".join(zf.open(f).read().decode('utf-8') for f in tsv_files)
         
 
-    def _transform_row(self, row: dict[str, str]) -> ParsedRow:
-        """Transforms a row of the TSV file into a structured dictionary."""
-        return ParsedRow(
-            county = row['County'],
-            election_date = row['Election Date'],
-            precinct = row['Precinct'],
-            contest_group_id = int(row['Contest Group ID']),
-            contest_type = row['Contest Type'],
-            contest_name = self._normalize_contest_name(row['Contest Name']),
-            choice = row['Choice'],
-            choice_party = row['Choice Party'],
-            vote_for = int(row['Vote For']),
-            election_day = int(row['Election Day']),
-            early_voting = int(row['Early Voting']),
-            absentee_by_mail = int(row['Absentee by Mail']),
-            provisional = int(row['Provisional']),
-            total_votes = int(row['Total Votes']),
-            real_precinct = row['Real Precinct'] == 'Y'
-        )
-    
+    def _format(self, parsed_data: Iterable[ParsedRow]) -> list[ContestData]:
+        """Formats parsed election data into a structured hierarchy."""
+        store = ColumnarStore() if self._columnar else None
+        self._pending_store = store
 
-    def _parse_tsv_data(self, tsv_data: str) -> list[ParsedRow]:
-        """Parses TSV data into a list of structured election result dictionaries."""
-        rows: list[ParsedRow] = []
-        reader = csv.DictReader(StringIO(tsv_data), delimiter='\t')
+        if self._lazy:
+            # Digests need every precinct, so they are left to be computed on first use.
+            dataset, _, self._rows_parsed = build_lazy_dataset(parsed_data, store)
+            self._pending_digests = None
+            return dataset
 
-        for row in reader:
-            parsed_row = self._transform_row(row)
-            rows.append(parsed_row)
+        if self._aggregator is not None:
+            dataset, self._pending_digests, self._rows_parsed = self._aggregator.update(parsed_data, store)
+            return dataset
 
-        return rows
-    
+        data: dict[str, dict] = {}
+        self._rows_parsed = self._accumulate(parsed_data, data, store)
+        return self._build(data)
+
+
+    def _format_parallel(self, tsv_data: str) -> list[ContestData]:
+        """Parses and aggregates chunks of the TSV in a process pool, then merges and builds the hierarchy."""
+        header, _, body = tsv_data.partition('\n')
+        chunks = self._split_lines(body, self._workers)
 
-    def _format(self, parsed_data: list[ParsedRow]) -> list[ContestData]:
-        """Formats parsed election data into a structured hierarchy."""
         data: dict[str, dict] = {}
+        store = ColumnarStore() if self._columnar else None
+        self._rows_parsed = 0
 
-        for row in parsed_data:
-            contest_name = row.contest_name
-            county = row.county
-            precinct = row.precinct
-            choice = row.choice
-            choice_party = row.choice_party
-            total_votes = row.total_votes
+        with ProcessPoolExecutor(max_workers=self._workers) as pool:
+            jobs = [(header, chunk, self._columnar, self._filters, self._engine) for chunk in chunks]
+            # `map` yields results in submission order, so merging preserves file order.
+            for partial, partial_store, counters, rows in pool.map(_accumulate_chunk, jobs):
+                self._merge(data, partial)
+                self._rows_parsed += rows
+                if store is not None:
+                    store.extend(partial_store, strings=self._strings)
+                self._add_cache_counters(counters)
 
-            if contest_name not in data:
-                data[contest_name] = {
-                    'counties': {},
-                    'candidates': {}
-                }
+        self._pending_store = store
+        return self._build(data)
 
-            if county not in data[contest_name]['counties']:
-                data[contest_name]['counties'][county] = {}
-            
-            if precinct not in data[contest_name]['counties'][county]:
-                data[contest_name]['counties'][county][precinct] = []
 
-            data[contest_name]['counties'][county][precinct].append({
-                'candidate': choice,
-                'party': choice_party,
-                'votes': total_votes
+    def _add_cache_counters(self, counters: ParseCacheInfo) -> None:
+        """Folds a worker's cache counters into this collector's."""
+        self._normalize_hits += counters.normalize_hits
+        self._normalize_misses += counters.normalize_misses
+        self._intern_hits += counters.intern_hits
+        self._intern_misses += counters.intern_misses
+
+
+    @staticmethod
+    def _split_lines(text: str, parts: int) -> list[str]:
+        """Splits text into at most `parts` chunks of similar size, cutting only at line boundaries."""
+        chunks: list[str] = []
+        size = len(text) // parts + 1
+        start = 0
+        while start < len(text):
+            end = text.find('\n', start + size)
+            end = len(text) if end == -1 else end + 1
+            chunks.append(text[start:end])
+            start = end
+        return chunks
+
+
+    def _merge(self, data: dict[str, dict], partial: dict[str, dict]) -> None:
+        """
+        Merges a partial intermediate hierarchy, built from a later part of the file, into `data`.
+        Workers intern into tables of their own, so every name is re-interned into this collector's table.
+        """
+        intern = self._strings.setdefault
+        for contest_name, partial_contest in partial.items():
+            contest = data.setdefault(intern(contest_name, contest_name), {
+                'counties': {},
+                'candidates': {},
+                'vote_for': partial_contest['vote_for']
             })
 
-            if choice not in data[contest_name]['candidates']:
-                data[contest_name]['candidates'][choice] = {
-                    'candidate': choice,
-                    'party': choice_party,
-                    'votes': 0
-                }
-            data[contest_name]['candidates'][choice]['votes'] += total_votes
+            for county_name, partial_county in partial_contest['counties'].items():
+                county = contest['counties'].setdefault(intern(county_name, county_name), { 'precincts': {}, 'candidates': {} })
+
+                for precinct_name, partial_precinct in partial_county['precincts'].items():
+                    precinct = county['precincts'].setdefault(intern(precinct_name, precinct_name), {
+                        'real_precinct': partial_precinct['real_precinct'],
+                        'candidates': []
+                    })
+                    precinct['candidates'].extend(self._intern_tally(tally) for tally in partial_precinct['candidates'])
+
+                self._merge_tallies(county['candidates'], partial_county['candidates'])
 
+            self._merge_tallies(contest['candidates'], partial_contest['candidates'])
+
+
+    def _merge_tallies(self, tallies: dict[str, dict], partial: dict[str, dict]) -> None:
+        for choice, partial_tally in partial.items():
+            if choice not in tallies:
+                tallies[self._strings.setdefault(choice, choice)] = self._intern_tally(partial_tally)
+                continue
+
+            tally = tallies[choice]
+            for key in ('votes', 'election_day', 'early_voting', 'absentee_by_mail', 'provisional'):
+                tally[key] += partial_tally[key]
+
+
+    def _intern_tally(self, tally: dict) -> dict:
+        """Re-interns the names of a tally that came from a worker."""
+        intern = self._strings.setdefault
+        tally['candidate'] = intern(tally['candidate'], tally['candidate'])
+        tally['party'] = intern(tally['party'], tally['party'])
+        return tally
+
+
+    def _build(self, data: dict[str, dict]) -> list[ContestData]:
+        """Builds the final `ContestData` hierarchy, and its digests, from the intermediate dictionaries."""
         contest_list_data: list[ContestData] = []
+        digests: dict[str, ContestDigest] = {}
         for contest_name, contest in data.items():
             counties_list: list[CountyData] = []
-            for county_name, precincts in contest['counties'].items():
+            county_digests = {}
+            for county_name, county in contest['counties'].items():
                 precinct_data_list: list[PrecinctData] = []
-                for precinct_name, candidates in precincts.items():
-                    precinct_candidates: list[CandidateData] = [
-                        CandidateData(
-                            candidate = cand['candidate'],
-                            party = cand['party'],
-                            votes = cand['votes']
-                        )
-                        for cand in candidates
-                    ]
-
-                    precinct_data_list.append(
-                        PrecinctData(
-                            precinct=precinct_name,
-                            candidates = precinct_candidates
-                        )
+                precinct_digests = {}
+                for precinct_name, precinct in county['precincts'].items():
+                    precinct_data = PrecinctData(
+                        precinct = precinct_name,
+                        candidates = tuple(CandidateData(**cand) for cand in precinct['candidates']),
+                        real_precinct = precinct['real_precinct']
                     )
+                    precinct_data_list.append(precinct_data)
+                    precinct_digests[precinct_name] = digest_precinct(precinct_data)
                 
+                county_digests[county_name] = digest_county(county_name, precinct_digests)
                 counties_list.append(
                     CountyData(
                         county = county_name,
-                        precincts = precinct_data_list
+                        precincts = tuple(precinct_data_list),
+                        candidates = tuple(CandidateData(**cand) for cand in county['candidates'].values())
                     )
                 )
 
-            candidates_list: list[CandidateData] = [
-                CandidateData(
-                    candidate=cand['candidate'],
-                    party=cand['party'],
-                    votes=cand['votes']
-                )
-                for cand in contest['candidates'].values()
-            ]
+            candidates_list = tuple(CandidateData(**cand) for cand in contest['candidates'].values())
             
             contest_list_data.append(
                 ContestData(
                     contest_name = contest_name,
-                    counties = counties_list,
-                    candidates = candidates_list
+                    counties = tuple(counties_list),
+                    candidates = candidates_list,
+                    vote_for = contest['vote_for']
                 )
             )
+            digests[contest_name] = digest_contest_parts(contest_name, county_digests, candidates_list, contest['vote_for'])
+
+        self._pending_digests = digests
+        return contest_list_data
+
+
+def _accumulate_chunk(
+    job: Tuple[str, str, bool, Optional[RowFilter], str]
+) -> Tuple[dict[str, dict], Optional[ColumnarStore], ParseCacheInfo, int]:
+    """Process-pool worker: parses one chunk of TSV lines into a partial intermediate hierarchy."""
+    header, chunk, columnar, filters, engine = job
+    parser = _RowParser(filters=filters, engine=engine)
 
-        return contest_list_data
\ No newline at end of file
+    data: dict[str, dict] = {}
+    store = ColumnarStore() if columnar else None
+    rows = parser._accumulate(parser._parse_tsv_data(f'{header}\n{chunk}'), data, store)
+    return data, store, parser.cache_info(), rows
@@ -0,0 +1,175 @@
+from array import array
+from typing import Iterable, Optional
+from .types import ParsedRow
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; reductions fall back to pure Python.
+    np = None
+
+class StringDictionary:
+    """
+    Dictionary-encodes repeated strings as dense integer codes, in order of first appearance.
+    """
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        """Returns the code for `value`, assigning the next free code if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        """Returns the code for `value`, or `None` if it has never been encoded."""
+        return self._codes.get(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class ColumnarStore:
+    """
+    The `ColumnarStore` class holds the flattened rows of a results file column by column.
+
+    Categorical strings (county, precinct, contest, choice, party) are dictionary-encoded
+    to integer codes, and the vote-method counts are kept in contiguous 64-bit integer
+    arrays, so a statewide file costs a few bytes per row instead of one `ParsedRow` object.
+    With `Collector(columnar=True)` the store is kept alongside the full hierarchy, so it adds
+    to the dataset's memory; it only replaces the hierarchy in lazy mode (see `LazyContestData`).
+
+    Aggregations run as group-by reductions over the arrays, vectorized with NumPy when
+    it is installed. The store is append-only while the `Collector` fills it and must be
+    treated as read-only afterwards, since reductions are cached.
+
+    Example usage:
+    ```python
+    store = ColumnarStore.from_rows(parsed_rows)
+    store.contest_vote_totals("US_SENATE")  # {"Alex": 15000, "Felix": 18000}
+    ```
+    """
+
+    # Vote-count columns kept for every row.
+    COUNT_COLUMNS = ('election_day', 'early_voting', 'absentee_by_mail', 'provisional', 'total_votes')
+
+    def __init__(self):
+        self.counties = StringDictionary()
+        self.precincts = StringDictionary()
+        self.contests = StringDictionary()
+        self.choices = StringDictionary()
+        self.parties = StringDictionary()
+
+        self.county = array('i')
+        self.precinct = array('i')
+        self.contest = array('i')
+        self.choice = array('i')
+        self.party = array('i')
+
+        self.election_day = array('q')
+        self.early_voting = array('q')
+        self.absentee_by_mail = array('q')
+        self.provisional = array('q')
+        self.total_votes = array('q')
+
+        # 1 for real precincts, 0 for aggregated reporting units.
+        self.real_precinct = array('b')
+
+        self._vote_totals: Optional[dict[str, dict[str, int]]] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[ParsedRow]) -> 'ColumnarStore':
+        """Builds a store holding every row in `rows`."""
+        store = cls()
+        for row in rows:
+            store.append(row)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.total_votes)
+
+    def append(self, row: ParsedRow) -> None:
+        """Appends a single parsed row to the store."""
+        self.county.append(self.counties.encode(row.county))
+        self.precinct.append(self.precincts.encode(row.precinct))
+        self.contest.append(self.contests.encode(row.contest_name))
+        self.choice.append(self.choices.encode(row.choice))
+        self.party.append(self.parties.encode(row.choice_party))
+
+        self.election_day.append(row.election_day)
+        self.early_voting.append(row.early_voting)
+        self.absentee_by_mail.append(row.absentee_by_mail)
+        self.provisional.append(row.provisional)
+        self.total_votes.append(row.total_votes)
+        self.real_precinct.append(row.real_precinct)
+
+    def extend(self, other: 'ColumnarStore', strings: Optional[dict[str, str]] = None) -> None:
+        """
+        Appends every row of another store, re-encoding its codes into this store's dictionaries.
+        param strings: Table of interned strings to re-intern the other store's values into, if it was built elsewhere.
+        """
+        for column, dictionary in (
+            ('county', 'counties'), ('precinct', 'precincts'), ('contest', 'contests'),
+            ('choice', 'choices'), ('party', 'parties')
+        ):
+            ours: StringDictionary = getattr(self, dictionary)
+            values = getattr(other, dictionary).values
+            if strings is not None:
+                values = [strings.setdefault(value, value) for value in values]
+            remap = [ours.encode(value) for value in values]
+            getattr(self, column).extend(remap[code] for code in getattr(other, column))
+
+        for column in self.COUNT_COLUMNS:
+            getattr(self, column).extend(getattr(other, column))
+        self.real_precinct.extend(other.real_precinct)
+
+        self._vote_totals = None
+
+    def vote_totals(self) -> dict[str, dict[str, int]]:
+        """
+        Computes every contest's candidate vote totals in a single group-by over (contest, choice).
+        return: Contest name -> candidate name -> total votes, candidates in order of first appearance.
+        """
+        if self._vote_totals is None:
+            self._vote_totals = self._group_totals_numpy() if np is not None else self._group_totals_python()
+        return self._vote_totals
+
+    def contest_vote_totals(self, contest: str) -> dict[str, int]:
+        """Retrieves a dictionary mapping candidates to their total votes in a contest."""
+        return dict(self.vote_totals().get(contest, {}))
+
+    def _group_totals_numpy(self) -> dict[str, dict[str, int]]:
+        totals: dict[str, dict[str, int]] = { contest: {} for contest in self.contests.values }
+        if len(self) == 0: return totals
+
+        n_choices = len(self.choices)
+        keys = np.frombuffer(self.contest, dtype=np.intc).astype(np.int64) * n_choices + np.frombuffer(self.choice, dtype=np.intc)
+        votes = np.frombuffer(self.total_votes, dtype=np.int64)
+
+        # Sort the distinct (contest, choice) keys by first appearance so candidate order matches the file.
+        unique_keys, first_rows, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        # Float64 weights are exact for any realistic vote count (below 2**53).
+        sums = np.bincount(inverse.ravel(), weights=votes, minlength=len(unique_keys)).astype(np.int64)
+
+        contests = self.contests.values
+        choices = self.choices.values
+        for i in np.argsort(first_rows, kind='stable'):
+            contest_code, choice_code = divmod(int(unique_keys[i]), n_choices)
+            totals[contests[contest_code]][choices[choice_code]] = int(sums[i])
+
+        return totals
+
+    def _group_totals_python(self) -> dict[str, dict[str, int]]:
+        totals: dict[str, dict[str, int]] = { contest: {} for contest in self.contests.values }
+        contests = self.contests.values
+        choices = self.choices.values
+
+        for contest_code, choice_code, votes in zip(self.contest, self.choice, self.total_votes):
+            candidates = totals[contests[contest_code]]
+            choice = choices[choice_code]
+            candidates[choice] = candidates.get(choice, 0) + votes
+
+        return totals
@@ -0,0 +1,114 @@
+import hashlib
+from typing import Iterable
+from .types import CandidateData, ContestData, ContestDiff, ContestDigest, CountyData, CountyDiff, CountyDigest, DatasetDiff, PrecinctData
+
+# Separators that cannot appear in NCSBE names, so distinct records never encode identically.
+_FIELD_SEP = '\x1f'
+_RECORD_SEP = '\x1e'
+
+def _hash(*parts: str) -> str:
+    return hashlib.blake2b(_RECORD_SEP.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def digest_candidates(candidates: Iterable[CandidateData]) -> str:
+    """Computes a stable digest of a sequence of candidate results."""
+    return _hash(*(
+        _FIELD_SEP.join((
+            c.candidate, c.party, str(c.votes),
+            str(c.election_day), str(c.early_voting), str(c.absentee_by_mail), str(c.provisional)
+        ))
+        for c in candidates
+    ))
+
+
+def digest_precinct(precinct: PrecinctData) -> str:
+    """Computes a stable digest of a precinct's candidate results."""
+    return _hash(precinct.precinct, str(precinct.real_precinct), digest_candidates(precinct.candidates))
+
+
+def digest_county(county: str, precincts: dict[str, str]) -> CountyDigest:
+    """Combines the digests of a county's precincts into a `CountyDigest`."""
+    return CountyDigest(
+        digest = _hash(county, *(f'{name}{_FIELD_SEP}{digest}' for name, digest in precincts.items())),
+        precincts = precincts
+    )
+
+
+def digest_contest_parts(
+    contest_name: str, counties: dict[str, CountyDigest], candidates: Iterable[CandidateData], vote_for: int = 1
+) -> ContestDigest:
+    """Combines county digests and contest-level candidate totals into a `ContestDigest`."""
+    return ContestDigest(
+        digest = _hash(
+            contest_name,
+            str(vote_for),
+            digest_candidates(candidates),
+            *(f'{name}{_FIELD_SEP}{county.digest}' for name, county in counties.items())
+        ),
+        counties = counties
+    )
+
+
+def digest_contest(contest: ContestData) -> ContestDigest:
+    """Computes the `ContestDigest` of an already built contest by walking its hierarchy."""
+    counties = {
+        county.county: digest_county(
+            county.county,
+            { precinct.precinct: digest_precinct(precinct) for precinct in county.precincts }
+        )
+        for county in contest.counties
+    }
+    return digest_contest_parts(contest.contest_name, counties, contest.candidates, contest.vote_for)
+
+
+def _diff_county(old: CountyDigest, new: CountyDigest, county: CountyData) -> CountyDiff:
+    precincts = { precinct.precinct: precinct for precinct in county.precincts }
+
+    return CountyDiff(
+        county = county,
+        precincts_added = tuple(precincts[name] for name in new.precincts if name not in old.precincts),
+        precincts_removed = tuple(name for name in old.precincts if name not in new.precincts),
+        precincts_changed = tuple(
+            precincts[name] for name, digest in new.precincts.items()
+            if name in old.precincts and old.precincts[name] != digest
+        )
+    )
+
+
+def diff_contest(old: ContestData, old_digest: ContestDigest, new: ContestData, new_digest: ContestDigest) -> ContestDiff:
+    """Describes the changes between two versions of the same contest, using their digests to skip unchanged parts."""
+    old_candidates = { candidate.candidate: candidate for candidate in old.candidates }
+    new_names = { candidate.candidate for candidate in new.candidates }
+    counties = { county.county: county for county in new.counties }
+
+    return ContestDiff(
+        contest = new,
+        candidates_changed = tuple(
+            candidate for candidate in new.candidates
+            if old_candidates.get(candidate.candidate) != candidate
+        ),
+        candidates_removed = tuple(name for name in old_candidates if name not in new_names),
+        counties_added = tuple(counties[name] for name in new_digest.counties if name not in old_digest.counties),
+        counties_removed = tuple(name for name in old_digest.counties if name not in new_digest.counties),
+        counties_changed = tuple(
+            _diff_county(old_digest.counties[name], county_digest, counties[name])
+            for name, county_digest in new_digest.counties.items()
+            if name in old_digest.counties and old_digest.counties[name].digest != county_digest.digest
+        )
+    )
+
+
+def diff_datasets(
+    old: dict[str, ContestData], old_digests: dict[str, ContestDigest],
+    new: dict[str, ContestData], new_digests: dict[str, ContestDigest]
+) -> DatasetDiff:
+    """Describes the changes between two datasets, each given as contest name -> contest and contest name -> digest."""
+    return DatasetDiff(
+        added = tuple(contest for name, contest in new.items() if name not in old),
+        removed = tuple(name for name in old if name not in new),
+        changed = tuple(
+            diff_contest(old[name], old_digests[name], contest, new_digests[name])
+            for name, contest in new.items()
+            if name in old and old_digests[name].digest != new_digests[name].digest
+        )
+    )
@@ -0,0 +1,98 @@
+import hashlib
+import re
+from typing import Iterable, Mapping, Optional, Pattern, Union
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9]+')
+
+def normalize_contest_name(contest_name: str) -> str:
+    """Normalizes a contest name the way it appears in the dataset, e.g. "US SENATE" -> "US_SENATE"."""
+    return _NON_ALPHANUMERIC.sub('_', contest_name.strip())
+
+
+class RowFilter:
+    """
+    The `RowFilter` class selects the rows of a results file to keep, so a `Collector` can skip
+    every other row before converting its fields, and build and hold only the selected part of
+    the state.
+
+    Each criterion is optional and the row must match all of those given:
+    - `contests`: contest names, raw ("US SENATE") or normalized ("US_SENATE")
+    - `contest_pattern`: regular expression searched in the normalized contest name
+    - `counties`: county names, compared case-insensitively
+    - `contest_types`: raw `Contest Type` codes (e.g. "S" for statewide, "C" for county)
+    - `contest_group_ids`: `Contest Group ID` numbers
+
+    Rows are checked on their raw text fields. The county, type and group checks are set
+    lookups; the contest checks are computed once per distinct contest name and memoized.
+
+    Example usage:
+    ```python
+    orange = RowFilter(counties=["Orange"])
+    ncsbe = NCSBE("2024-11-05", filters=orange)
+
+    senate = RowFilter(contest_pattern=r"^US_SENATE|^NC_GOVERNOR")
+    ```
+    """
+
+    def __init__(
+        self,
+        contests: Optional[Iterable[str]] = None,
+        contest_pattern: Optional[Union[str, Pattern[str]]] = None,
+        counties: Optional[Iterable[str]] = None,
+        contest_types: Optional[Iterable[str]] = None,
+        contest_group_ids: Optional[Iterable[int]] = None
+    ):
+        self.contests = frozenset(normalize_contest_name(name) for name in contests) if contests is not None else None
+        self.contest_pattern = re.compile(contest_pattern) if contest_pattern is not None else None
+        self.counties = frozenset(county.strip().upper() for county in counties) if counties is not None else None
+        self.contest_types = frozenset(contest_types) if contest_types is not None else None
+        self.contest_group_ids = frozenset(str(int(group)) for group in contest_group_ids) if contest_group_ids is not None else None
+
+        # Raw contest name -> whether it matches `contests` and `contest_pattern`.
+        self._contest_matches: dict[str, bool] = {}
+
+    @property
+    def key(self) -> str:
+        """A short, stable identifier of the criteria, e.g. to keep snapshots of different filters apart."""
+        criteria = (
+            sorted(self.contests) if self.contests is not None else None,
+            self.contest_pattern.pattern if self.contest_pattern is not None else None,
+            sorted(self.counties) if self.counties is not None else None,
+            sorted(self.contest_types) if self.contest_types is not None else None,
+            sorted(self.contest_group_ids) if self.contest_group_ids is not None else None,
+        )
+        return hashlib.sha1(repr(criteria).encode('utf-8')).hexdigest()[:12]
+
+    def match_contest(self, contest_name: str) -> bool:
+        """Whether a raw contest name passes the contest criteria."""
+        matches = self._contest_matches.get(contest_name)
+        if matches is None:
+            normalized = normalize_contest_name(contest_name)
+            matches = self._contest_matches[contest_name] = (
+                (self.contests is None or normalized in self.contests)
+                and (self.contest_pattern is None or self.contest_pattern.search(normalized) is not None)
+            )
+        return matches
+
+    def match_fields(self, county: str, contest_group_id: str, contest_type: str, contest_name: str) -> bool:
+        """Whether a row, given as its raw text fields, passes every criterion."""
+        if self.counties is not None and county.upper() not in self.counties: return False
+        if self.contest_types is not None and contest_type not in self.contest_types: return False
+        if self.contest_group_ids is not None and contest_group_id.strip() not in self.contest_group_ids: return False
+        if self.contests is None and self.contest_pattern is None: return True
+        return self.match_contest(contest_name)
+
+    def __call__(self, row: Mapping[str, str]) -> bool:
+        """Whether a raw row of the TSV file, keyed by column name, passes every criterion."""
+        return self.match_fields(row['County'], row['Contest Group ID'], row['Contest Type'], row['Contest Name'])
+
+    def __repr__(self) -> str:
+        criteria = ', '.join(
+            f'{name}={value!r}'
+            for name, value in (
+                ('contests', self.contests), ('contest_pattern', self.contest_pattern), ('counties', self.counties),
+                ('contest_types', self.contest_types), ('contest_group_ids', self.contest_group_ids)
+            )
+            if value is not None
+        )
+        return f'RowFilter({criteria})'
@@ -0,0 +1,258 @@
+from typing import Iterable, Optional
+from .columnar import ColumnarStore
+from .diff import digest_contest_parts, digest_county, digest_precinct
+from .types import CandidateData, ContestData, ContestDigest, CountyData, CountyDigest, ParsedRow, PrecinctData
+
+# A precinct's content: its `real_precinct` flag and one (choice, party, votes, election day,
+# early voting, absentee by mail, provisional) tuple per row, in file order.
+Signature = tuple[bool, tuple[tuple, ...]]
+
+def _signature(rows: list[ParsedRow]) -> Signature:
+    return (rows[0].real_precinct, tuple(
+        (r.choice, r.choice_party, r.total_votes, r.election_day, r.early_voting, r.absentee_by_mail, r.provisional)
+        for r in rows
+    ))
+
+
+def _apply(totals: dict[str, list], signature: Signature, sign: int) -> None:
+    """Adds (`sign` = 1) or removes (`sign` = -1) a precinct's rows from candidate totals."""
+    for choice, _, votes, election_day, early_voting, absentee_by_mail, provisional in signature[1]:
+        tally = totals.get(choice)
+        if tally is None:
+            # [votes, election day, early voting, absentee by mail, provisional, contributing rows]
+            tally = totals[choice] = [0, 0, 0, 0, 0, 0]
+        tally[0] += sign * votes
+        tally[1] += sign * election_day
+        tally[2] += sign * early_voting
+        tally[3] += sign * absentee_by_mail
+        tally[4] += sign * provisional
+        tally[5] += sign
+        if tally[5] == 0:
+            del totals[choice]
+
+
+def _candidates(totals: dict[str, list], order: tuple[tuple[str, str], ...]) -> tuple[CandidateData, ...]:
+    """
+    Builds candidate totals in `order`: (choice, party) pairs in the order in which the choices first
+    appear in the file, each with the party of its first row, as a full rebuild reports it.
+    """
+    return tuple(CandidateData(choice, party, *totals[choice][:5]) for choice, party in order)
+
+class _Precinct:
+    __slots__ = ('signature', 'data', 'digest')
+
+    def __init__(self, name: str, signature: Signature):
+        self.signature = signature
+        self.data = PrecinctData(
+            precinct = name,
+            candidates = tuple(CandidateData(*row) for row in signature[1]),
+            real_precinct = signature[0]
+        )
+        self.digest = digest_precinct(self.data)
+
+class _County:
+    __slots__ = ('precincts', 'totals', 'order', 'data', 'digest')
+
+    def __init__(self):
+        self.precincts: dict[str, _Precinct] = {}
+        self.totals: dict[str, list] = {}
+        self.order: tuple[tuple[str, str], ...] = ()
+        self.data: Optional[CountyData] = None
+        self.digest: Optional[CountyDigest] = None
+
+class _Contest:
+    __slots__ = ('vote_for', 'counties', 'totals', 'order', 'data', 'digest')
+
+    def __init__(self, vote_for: int):
+        self.vote_for = vote_for
+        self.counties: dict[str, _County] = {}
+        self.totals: dict[str, list] = {}
+        self.order: tuple[tuple[str, str], ...] = ()
+        self.data: Optional[ContestData] = None
+        self.digest: Optional[ContestDigest] = None
+
+class IncrementalAggregator:
+    """
+    The `IncrementalAggregator` class turns successive versions of a results file into the
+    `ContestData` hierarchy, doing work only for the precincts that changed.
+
+    Rows are grouped by (contest, county, precinct) and each precinct's rows are compared with
+    the previous version. Unchanged precincts keep their `PrecinctData` and digest; changed,
+    added and removed precincts adjust the county and contest candidate totals by their delta.
+    A county or contest is only rebuilt when something beneath it changed, otherwise the previous
+    frozen object (and its digest) is reused as-is, so `diff_datasets` and consumers comparing
+    by identity skip it too.
+
+    Candidate totals keep the order in which the choices first appear in the current version
+    of the file, and the party of each choice's first row, as a full rebuild does, so reordered
+    rows and a changed first party are picked up as a change.
+
+    Parsing the file is still proportional to its size; building the hierarchy is proportional
+    to the amount of change.
+
+    Example usage:
+    ```python
+    aggregator = IncrementalAggregator()
+    dataset, digests, rows = aggregator.update(parsed_rows)
+    dataset, digests, rows = aggregator.update(newer_parsed_rows)  # reuses unchanged objects
+    ```
+    """
+
+    def __init__(self):
+        self._contests: dict[str, _Contest] = {}
+
+        # Precincts rebuilt and reused by the last call to `update()`.
+        self.precincts_rebuilt = 0
+        self.precincts_reused = 0
+
+    def update(
+        self, rows: Iterable[ParsedRow], store: Optional[ColumnarStore] = None
+    ) -> tuple[list[ContestData], dict[str, ContestDigest], int]:
+        """
+        Folds a complete version of the results file into the hierarchy.
+        param rows: Every parsed row of the new version, in file order.
+        param store: Columnar store to append every row to, if one is being built.
+        return: The dataset, the digest of every contest, and the number of rows read.
+        """
+        groups, vote_for, choices, n_rows = self._group(rows, store)
+
+        # Contest -> county -> [(precinct, rows)], each level in order of first appearance.
+        layout: dict[str, dict[str, list[tuple[str, list[ParsedRow]]]]] = {}
+        for (contest_name, county_name, precinct_name), group in groups.items():
+            layout.setdefault(contest_name, {}).setdefault(county_name, []).append((precinct_name, group))
+
+        # Contest -> county -> (choice, party) pairs, and contest -> choice -> party, each in order of first appearance.
+        county_orders: dict[str, dict[str, list[tuple[str, str]]]] = {}
+        contest_orders: dict[str, dict[str, str]] = {}
+        for (contest_name, county_name, choice), party in choices.items():
+            county_orders.setdefault(contest_name, {}).setdefault(county_name, []).append((choice, party))
+            contest_orders.setdefault(contest_name, {}).setdefault(choice, party)
+
+        self.precincts_rebuilt = 0
+        self.precincts_reused = 0
+        contests: dict[str, _Contest] = {}
+        for contest_name, counties in layout.items():
+            contests[contest_name] = self._update_contest(
+                contest_name, vote_for[contest_name], counties, tuple(contest_orders[contest_name].items()),
+                county_orders[contest_name]
+            )
+        self._contests = contests
+
+        dataset = [contest.data for contest in contests.values()]
+        digests = { name: contest.digest for name, contest in contests.items() }
+        return dataset, digests, n_rows
+
+    @staticmethod
+    def _group(
+        rows: Iterable[ParsedRow], store: Optional[ColumnarStore]
+    ) -> tuple[dict[tuple[str, str, str], list[ParsedRow]], dict[str, int], dict[tuple[str, str, str], str], int]:
+        groups: dict[tuple[str, str, str], list[ParsedRow]] = {}
+        vote_for: dict[str, int] = {}
+        # (contest, county, choice) -> party of its first row, in order of first appearance.
+        choices: dict[tuple[str, str, str], str] = {}
+        n_rows = 0
+
+        # A precinct's rows are normally adjacent, so most rows skip the dictionary lookup.
+        last_key = None
+        group: list[ParsedRow] = []
+        for row in rows:
+            n_rows += 1
+            if store is not None:
+                store.append(row)
+
+            key = (row.contest_name, row.county, row.precinct)
+            if key != last_key:
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = []
+                    vote_for.setdefault(row.contest_name, row.vote_for)
+                last_key = key
+            group.append(row)
+            choices.setdefault((row.contest_name, row.county, row.choice), row.choice_party)
+
+        return groups, vote_for, choices, n_rows
+
+    def _update_contest(
+        self, contest_name: str, vote_for: int, counties: dict[str, list[tuple[str, list[ParsedRow]]]],
+        order: tuple[tuple[str, str], ...], county_orders: dict[str, list[tuple[str, str]]]
+    ) -> _Contest:
+        contest = self._contests.get(contest_name)
+        changed = (
+            contest is None or contest.vote_for != vote_for or list(contest.counties) != list(counties)
+            or contest.order != order
+        )
+        if contest is None:
+            contest = _Contest(vote_for)
+        contest.vote_for = vote_for
+        contest.order = order
+
+        new_counties: dict[str, _County] = {}
+        for county_name, precincts in counties.items():
+            county = contest.counties.get(county_name) or _County()
+            if self._update_county(contest, county_name, county, precincts, tuple(county_orders[county_name])):
+                changed = True
+            new_counties[county_name] = county
+
+        for county_name, county in contest.counties.items():
+            if county_name in new_counties: continue
+            for precinct in county.precincts.values():
+                _apply(contest.totals, precinct.signature, -1)
+        contest.counties = new_counties
+
+        if changed:
+            candidates = _candidates(contest.totals, order)
+            contest.data = ContestData(
+                contest_name = contest_name,
+                counties = tuple(county.data for county in new_counties.values()),
+                candidates = candidates,
+                vote_for = vote_for
+            )
+            contest.digest = digest_contest_parts(
+                contest_name, { name: county.digest for name, county in new_counties.items() }, candidates, vote_for
+            )
+        return contest
+
+    def _update_county(
+        self, contest: _Contest, county_name: str, county: _County, precincts: list[tuple[str, list[ParsedRow]]],
+        order: tuple[tuple[str, str], ...]
+    ) -> bool:
+        """Patches a county's precincts and totals. return: Whether anything in the county changed."""
+        changed = county.data is None or len(county.precincts) != len(precincts) or county.order != order
+        county.order = order
+
+        new_precincts: dict[str, _Precinct] = {}
+        for precinct_name, rows in precincts:
+            signature = _signature(rows)
+            previous = county.precincts.get(precinct_name)
+            if previous is not None and previous.signature == signature:
+                new_precincts[precinct_name] = previous
+                self.precincts_reused += 1
+                continue
+
+            if previous is not None:
+                _apply(county.totals, previous.signature, -1)
+                _apply(contest.totals, previous.signature, -1)
+            _apply(county.totals, signature, 1)
+            _apply(contest.totals, signature, 1)
+            new_precincts[precinct_name] = _Precinct(precinct_name, signature)
+            self.precincts_rebuilt += 1
+            changed = True
+
+        for precinct_name, previous in county.precincts.items():
+            if precinct_name in new_precincts: continue
+            _apply(county.totals, previous.signature, -1)
+            _apply(contest.totals, previous.signature, -1)
+            changed = True
+
+        # Same precincts in a different order still changes the county.
+        changed = changed or list(county.precincts) != list(new_precincts)
+        county.precincts = new_precincts
+
+        if changed:
+            county.data = CountyData(
+                county = county_name,
+                precincts = tuple(precinct.data for precinct in new_precincts.values()),
+                candidates = _candidates(county.totals, order)
+            )
+            county.digest = digest_county(county_name, { name: precinct.digest for name, precinct in new_precincts.items() })
+        return changed
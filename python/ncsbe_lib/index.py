@@ -0,0 +1,154 @@
+from typing import Iterable, Optional
+from .columnar import ColumnarStore
+from .diff import digest_contest
+from .stats import compute_contest_stats
+from .types import CandidateData, ContestData, ContestDigest, ContestStats, CountyData, PrecinctData, VOTE_METHODS
+
+def _method_totals(candidates: Iterable[CandidateData]) -> dict[str, int]:
+    """Rolls candidate results up into votes by method, plus `total_votes`."""
+    totals = dict.fromkeys(VOTE_METHODS, 0)
+    total_votes = 0
+    for candidate in candidates:
+        for method in VOTE_METHODS:
+            totals[method] += getattr(candidate, method)
+        total_votes += candidate.votes
+    totals['total_votes'] = total_votes
+    return totals
+
+
+class DatasetIndex:
+    """
+    The `DatasetIndex` class holds an election dataset together with hash indexes over it.
+
+    Every index is built once, when the dataset is loaded, so that the `NCSBE` lookup
+    methods can answer in O(1) instead of scanning every contest and county on each call.
+    An index is never mutated after it is built; `NCSBE` swaps in a whole new one on refresh.
+
+    Indexes:
+    - contest -> `ContestData`
+    - (contest, candidate) -> `CandidateData`
+    - candidate -> tuple of `ContestData` the candidate appears in
+    - county -> `CountyData` and (county, precinct) -> `PrecinctData`, built for a contest the
+      first time one of its counties or precincts is looked up (see `county()` and `precinct()`),
+      so lazily materialized contests stay unmaterialized until they are needed
+
+    The index also carries the content digest of every contest, used to diff two datasets,
+    and the dataset's `ColumnarStore` when one was built.
+
+    Contest statistics (totals, ranking, winner, margin, percentages) are computed for
+    every contest the first time any of them is needed, then reused until the next refresh
+    replaces the index. Votes by method are rolled up the same way for every contest, and
+    for the counties of a contest the first time one of them is needed (see `method_totals()`).
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[Iterable[ContestData]],
+        digests: Optional[dict[str, ContestDigest]] = None,
+        columnar: Optional[ColumnarStore] = None
+    ):
+        """
+        Builds every index for the given dataset.
+        param dataset: The formatted election dataset, or `None` if nothing has been loaded.
+        param digests: Contest digests computed by the `Collector`; computed on first use if omitted.
+        param columnar: Column-oriented copy of the rows behind `dataset`, if one was built.
+        """
+        self.dataset = dataset
+        self.columnar = columnar
+        self._digests = digests
+        self._stats: Optional[dict[str, ContestStats]] = None
+        self._method_totals: Optional[dict[str, dict[str, int]]] = None
+        self._county_method_totals: dict[str, dict[str, dict[str, int]]] = {}
+        self.contests: dict[str, ContestData] = {}
+        self._counties: dict[str, dict[str, CountyData]] = {}
+        self._precincts: dict[str, dict[tuple[str, str], PrecinctData]] = {}
+        self.candidates: dict[tuple[str, str], CandidateData] = {}
+        self.candidate_contests: dict[str, tuple[ContestData, ...]] = {}
+
+        if not dataset: return
+
+        candidate_contests: dict[str, list[ContestData]] = {}
+        for contest in dataset:
+            name = contest.contest_name
+            # The first occurrence wins, matching the old linear scans.
+            if name in self.contests: continue
+            self.contests[name] = contest
+
+            for candidate in contest.candidates:
+                if (name, candidate.candidate) in self.candidates: continue
+                self.candidates[(name, candidate.candidate)] = candidate
+                candidate_contests.setdefault(candidate.candidate, []).append(contest)
+
+        self.candidate_contests = { name: tuple(contests) for name, contests in candidate_contests.items() }
+
+    def counties(self, contest: str) -> dict[str, CountyData]:
+        """County name -> county results within a contest; empty for an unknown contest. Do not mutate."""
+        counties = self._counties.get(contest)
+        if counties is None:
+            contest_data = self.contests.get(contest)
+            if contest_data is None: return {}
+
+            counties = {}
+            for county_data in contest_data.counties:
+                counties.setdefault(county_data.county, county_data)
+            self._counties[contest] = counties
+        return counties
+
+    def county(self, contest: str, county: str) -> Optional[CountyData]:
+        """Looks up a county's results within a contest."""
+        return self.counties(contest).get(county)
+
+    def precinct(self, contest: str, county: str, precinct: str) -> Optional[PrecinctData]:
+        """Looks up a precinct's results within a contest."""
+        precincts = self._precincts.get(contest)
+        if precincts is None:
+            contest_data = self.contests.get(contest)
+            if contest_data is None: return None
+
+            precincts = {}
+            for county_data in contest_data.counties:
+                for precinct_data in county_data.precincts:
+                    precincts.setdefault((county_data.county, precinct_data.precinct), precinct_data)
+            self._precincts[contest] = precincts
+        return precincts.get((county, precinct))
+
+    @property
+    def digests(self) -> dict[str, ContestDigest]:
+        """Contest name -> content digest, for every contest in the index."""
+        if self._digests is None:
+            self._digests = { name: digest_contest(contest) for name, contest in self.contests.items() }
+        return self._digests
+
+    @property
+    def stats(self) -> dict[str, ContestStats]:
+        """Contest name -> precomputed statistics, for every contest in the index."""
+        if self._stats is None:
+            vote_totals = self.columnar.vote_totals() if self.columnar is not None else {}
+            self._stats = {
+                name: compute_contest_stats(contest, vote_totals.get(name))
+                for name, contest in self.contests.items()
+            }
+        return self._stats
+
+    def method_totals(self, contest: str, county: Optional[str] = None) -> Optional[dict[str, int]]:
+        """
+        Votes cast by each voting method, plus `total_votes`, in a contest or one of its counties. Do not mutate.
+        return: `None` if the contest or county does not exist.
+        """
+        if county is not None:
+            return self.county_method_totals(contest).get(county)
+
+        if self._method_totals is None:
+            self._method_totals = { name: _method_totals(contest.candidates) for name, contest in self.contests.items() }
+        return self._method_totals.get(contest)
+
+    def county_method_totals(self, contest: str) -> dict[str, dict[str, int]]:
+        """County name -> votes by method, as in `method_totals()`, within a contest; empty for an unknown contest. Do not mutate."""
+        totals = self._county_method_totals.get(contest)
+        if totals is None:
+            counties = self.counties(contest)
+            if not counties: return {}
+
+            totals = { name: _method_totals(county.candidates) for name, county in counties.items() }
+            self._county_method_totals[contest] = totals
+        return totals
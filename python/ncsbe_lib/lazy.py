@@ -0,0 +1,167 @@
+import threading
+from array import array
+from typing import Iterable, Optional
+from .columnar import ColumnarStore
+from .types import CandidateData, ContestData, CountyData, ParsedRow, PrecinctData
+
+class LazyContestData(ContestData):
+    """
+    A `ContestData` whose `counties` are materialized from its rows in a `ColumnarStore` the
+    first time they are accessed, then cached.
+
+    The contest name, `vote_for` and candidate totals are available immediately. It compares,
+    hashes and converts (`to_dict`, pickling) exactly like the equivalent `ContestData`, which
+    materializes the counties if they are still pending.
+    """
+    __slots__ = ('_source', '_lock')
+
+    def __init__(self, contest_name: str, candidates: tuple[CandidateData, ...], vote_for: int, store: ColumnarStore, rows: array):
+        object.__setattr__(self, 'contest_name', contest_name)
+        object.__setattr__(self, 'candidates', candidates)
+        object.__setattr__(self, 'vote_for', vote_for)
+        object.__setattr__(self, '_source', (store, rows))
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not set yet, i.e. the `counties` slot before it is materialized.
+        if name != 'counties':
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        with self._lock:
+            if self._source is not None:
+                store, rows = self._source
+                object.__setattr__(self, 'counties', _materialize_counties(store, rows))
+                # Release the row indexes; the store itself is shared with the other contests.
+                object.__setattr__(self, '_source', None)
+        return object.__getattribute__(self, 'counties')
+
+    @property
+    def materialized(self) -> bool:
+        """Whether the counties have been built yet."""
+        return self._source is None
+
+    def pending_rows(self) -> Optional[tuple[tuple, ...]]:
+        """
+        The contest's rows, as (county, precinct, choice, party, real precinct, total votes, election day,
+        early voting, absentee by mail, provisional) tuples, while its counties are still pending; `None` once built.
+        Lets the contest be stored and rebuilt lazily (see `SnapshotCache`) without materializing it.
+        """
+        with self._lock:
+            if self._source is None: return None
+            store, rows = self._source
+
+        counties, precincts = store.counties.values, store.precincts.values
+        choices, parties = store.choices.values, store.parties.values
+        return tuple(
+            (
+                counties[store.county[i]], precincts[store.precinct[i]], choices[store.choice[i]], parties[store.party[i]],
+                bool(store.real_precinct[i]), store.total_votes[i], store.election_day[i], store.early_voting[i],
+                store.absentee_by_mail[i], store.provisional[i]
+            )
+            for i in rows
+        )
+
+    def _fields(self) -> tuple:
+        return (self.contest_name, self.counties, self.candidates, self.vote_for)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ContestData): return NotImplemented
+        return self._fields() == (other.contest_name, other.counties, other.candidates, other.vote_for)
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __reduce__(self):
+        return (ContestData, self._fields())
+
+
+def _materialize_counties(store: ColumnarStore, rows: array) -> tuple[CountyData, ...]:
+    """Builds a contest's counties, precincts and county totals from its rows, exactly as `Collector._format` would."""
+    counties = store.counties.values
+    precincts = store.precincts.values
+    choices = store.choices.values
+    parties = store.parties.values
+
+    data: dict[int, dict] = {}
+    for i in rows:
+        row = (store.total_votes[i], store.election_day[i], store.early_voting[i], store.absentee_by_mail[i], store.provisional[i])
+        choice = store.choice[i]
+
+        county = data.get(store.county[i])
+        if county is None:
+            county = data[store.county[i]] = { 'precincts': {}, 'candidates': {} }
+
+        precinct = county['precincts'].get(store.precinct[i])
+        if precinct is None:
+            precinct = county['precincts'][store.precinct[i]] = { 'real_precinct': bool(store.real_precinct[i]), 'candidates': [] }
+        precinct['candidates'].append(CandidateData(choices[choice], parties[store.party[i]], *row))
+
+        tally = county['candidates'].get(choice)
+        if tally is None:
+            tally = county['candidates'][choice] = [parties[store.party[i]], 0, 0, 0, 0, 0]
+        for k, votes in enumerate(row, 1):
+            tally[k] += votes
+
+    return tuple(
+        CountyData(
+            county = counties[county_code],
+            precincts = tuple(
+                PrecinctData(
+                    precinct = precincts[precinct_code],
+                    candidates = tuple(precinct['candidates']),
+                    real_precinct = precinct['real_precinct']
+                )
+                for precinct_code, precinct in county['precincts'].items()
+            ),
+            candidates = tuple(CandidateData(choices[choice], *tally) for choice, tally in county['candidates'].items())
+        )
+        for county_code, county in data.items()
+    )
+
+
+def build_lazy_dataset(rows: Iterable[ParsedRow], store: Optional[ColumnarStore] = None) -> tuple[list[ContestData], ColumnarStore, int]:
+    """
+    Builds a dataset of `LazyContestData` in one pass: each row is appended to a columnar store
+    and to its contest's row index, and only the contest-level candidate totals are computed.
+    param store: Store to append the rows to; a new one if omitted.
+    return: The dataset, the store backing it, and the number of rows read.
+    """
+    store = store if store is not None else ColumnarStore()
+    start = len(store)
+    contest_rows: dict[str, array] = {}
+    totals: dict[str, dict[str, list]] = {}
+    vote_for: dict[str, int] = {}
+
+    n_rows = 0
+    for row in rows:
+        store.append(row)
+        name = row.contest_name
+
+        indexes = contest_rows.get(name)
+        if indexes is None:
+            indexes = contest_rows[name] = array('i')
+            totals[name] = {}
+            vote_for[name] = row.vote_for
+        indexes.append(start + n_rows)
+        n_rows += 1
+
+        tally = totals[name].get(row.choice)
+        if tally is None:
+            tally = totals[name][row.choice] = [row.choice_party, 0, 0, 0, 0, 0]
+        tally[1] += row.total_votes
+        tally[2] += row.election_day
+        tally[3] += row.early_voting
+        tally[4] += row.absentee_by_mail
+        tally[5] += row.provisional
+
+    dataset: list[ContestData] = [
+        LazyContestData(
+            contest_name = name,
+            candidates = tuple(CandidateData(choice, *tally) for choice, tally in totals[name].items()),
+            vote_for = vote_for[name],
+            store = store,
+            rows = indexes
+        )
+        for name, indexes in contest_rows.items()
+    ]
+    return dataset, store, n_rows
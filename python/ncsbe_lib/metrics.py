@@ -0,0 +1,199 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator, Optional
+
+# Help text of every counter and gauge the library records.
+COUNTERS = {
+    'collections': 'Calls to Collector.collect().',
+    'collect_failures': 'Calls to Collector.collect() that raised and kept the previous dataset.',
+    'not_modified': 'Calls to Collector.collect() answered by an unchanged results file.',
+    'bytes_downloaded': 'Bytes of results files downloaded.',
+    'rows_parsed': 'TSV rows parsed.',
+    'dataset_swaps': 'New datasets published by NCSBE.',
+}
+GAUGES = {
+    'last_rows': 'Rows in the most recently parsed results file.',
+    'peak_rows': 'Most rows parsed from a single results file.',
+    'contests': 'Contests in the published dataset.',
+}
+
+# A callback receives the kind of measurement ('counter', 'gauge', 'stage' or 'query'), its name and its value.
+MetricsCallback = Callable[[str, str, float], None]
+
+@dataclass
+class Timing:
+    """Summary of the durations recorded for one stage or query method."""
+    # Number of recorded durations.
+    count: int = 0
+
+    # Sum, most recent and longest duration, in seconds.
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+class Metrics:
+    """
+    The `Metrics` class records how long each stage of a refresh takes, how much data it moves,
+    and how long `NCSBE` queries take, and exports it all for dashboards.
+
+    Pass the same instance to `NCSBE` (or `Collector`) to collect:
+    - stage durations: `fetch`, `extract`, `parse`, `format` (`process` when streaming,
+      `parse_format` when parsing in parallel), `collect` and `index`
+    - counters: collections, failures, unchanged files, bytes downloaded, rows parsed, dataset swaps
+    - gauges: rows in the last file, the peak row count and the number of contests
+    - the latency of every `NCSBE` query method, per method
+
+    Callbacks registered with `subscribe()` are called with every measurement as it is made.
+    `to_prometheus()` renders the Prometheus text exposition format and `to_json()` a JSON document.
+
+    Example usage:
+    ```python
+    metrics = Metrics(labels={"election": "2024-11-05"})
+    election_data = NCSBE("2024-11-05", metrics=metrics)
+    election_data.initialize()
+    print(metrics.to_prometheus())
+    ```
+    """
+
+    def __init__(self, labels: Optional[dict[str, str]] = None):
+        """
+        Creates an empty set of metrics.
+        param labels: Labels added to every exported sample, e.g. to tell several elections apart.
+        """
+        self.labels = dict(labels or {})
+        self._lock = threading.Lock()
+        self._callbacks: list[MetricsCallback] = []
+        self.counters: dict[str, float] = { name: 0 for name in COUNTERS }
+        self.gauges: dict[str, float] = { name: 0 for name in GAUGES }
+        self.stages: dict[str, Timing] = {}
+        self.queries: dict[str, Timing] = {}
+
+    def subscribe(self, callback: MetricsCallback) -> None:
+        """Registers a callback called with `(kind, name, value)` for every measurement."""
+        self._callbacks.append(callback)
+
+    def _emit(self, kind: str, name: str, value: float) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(kind, name, value)
+            except Exception as e:
+                logging.error(f"Error in metrics callback: {e}")
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Adds `value` to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        self._emit('counter', name, value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Sets a gauge to `value`."""
+        with self._lock:
+            self.gauges[name] = value
+        self._emit('gauge', name, value)
+
+    def max_gauge(self, name: str, value: float) -> None:
+        """Raises a gauge to `value` if that is higher, e.g. to track a peak; it never goes down."""
+        with self._lock:
+            value = self.gauges[name] = max(value, self.gauges.get(name, 0))
+        self._emit('gauge', name, value)
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        """Records how long one run of a stage took."""
+        with self._lock:
+            self.stages.setdefault(name, Timing()).add(seconds)
+        self._emit('stage', name, seconds)
+
+    def record_query(self, method: str, seconds: float) -> None:
+        """Records how long one call of a query method took."""
+        with self._lock:
+            self.queries.setdefault(method, Timing()).add(seconds)
+        self._emit('query', method, seconds)
+
+    @contextmanager
+    def time_stage(self, name: str) -> Iterator[None]:
+        """Times the body of a `with` block as one run of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def timed_query(self, method: str, fn: Callable) -> Callable:
+        """Wraps a query method so every call records its latency under `method`."""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record_query(method, time.perf_counter() - start)
+
+        timed.__name__ = getattr(fn, '__name__', method)
+        timed.__doc__ = getattr(fn, '__doc__', None)
+        return timed
+
+    def to_dict(self) -> dict:
+        """Returns a consistent copy of every metric as plain data."""
+        with self._lock:
+            return {
+                'labels': dict(self.labels),
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'stages': { name: asdict(timing) for name, timing in self.stages.items() },
+                'queries': { name: asdict(timing) for name, timing in self.queries.items() },
+            }
+
+    def to_json(self) -> str:
+        """Renders every metric as a JSON document."""
+        return json.dumps(self.to_dict())
+
+    def to_prometheus(self, prefix: str = 'ncsbe') -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines: list[str] = []
+
+        def sample(name: str, value: float, **labels: str) -> None:
+            pairs = { **data['labels'], **labels }
+            rendered = ','.join(f'{key}="{_escape(str(val))}"' for key, val in pairs.items())
+            lines.append(f'{prefix}_{name}{{{rendered}}} {value}' if rendered else f'{prefix}_{name} {value}')
+
+        for name, value in data['counters'].items():
+            lines.append(f'# HELP {prefix}_{name}_total {COUNTERS.get(name, name)}')
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            sample(f'{name}_total', value)
+
+        for name, value in data['gauges'].items():
+            lines.append(f'# HELP {prefix}_{name} {GAUGES.get(name, name)}')
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            sample(name, value)
+
+        for section, label, help_text in (
+            ('stages', 'stage', 'Duration of refresh stages.'),
+            ('queries', 'method', 'Latency of NCSBE query methods.')
+        ):
+            metric = f'{label}_duration_seconds'
+            lines.append(f'# HELP {prefix}_{metric} {help_text}')
+            lines.append(f'# TYPE {prefix}_{metric} summary')
+            for name, timing in data[section].items():
+                sample(f'{metric}_count', timing['count'], **{ label: name })
+                sample(f'{metric}_sum', timing['total'], **{ label: name })
+
+            lines.append(f'# HELP {prefix}_{metric}_max Longest {help_text[0].lower()}{help_text[1:]}')
+            lines.append(f'# TYPE {prefix}_{metric}_max gauge')
+            for name, timing in data[section].items():
+                sample(f'{metric}_max', timing['max'], **{ label: name })
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,6 +1,29 @@
-from .collector import Collector
-from .types import CandidateData, PrecinctData, CountyData, ContestData
-from typing import Optional
+import logging
+import requests
+from contextlib import nullcontext
+from .archive import write_archive
+from .cache import SnapshotCache
+from .collector import DEFAULT_TIMEOUT, Collector
+from .metrics import Metrics
+from .index import DatasetIndex
+from .diff import diff_datasets
+from .filters import RowFilter
+from .refresher import AutoRefresher
+from .shared import SharedDatasetPublisher
+from .serialize import write_json, write_ndjson
+from .types import CandidateData, PrecinctData, CountyData, ContestData, ContestStats, ContestSummary, DatasetDiff, VOTE_METHODS
+from typing import Callable, Iterable, Optional, TextIO, Tuple
+
+# Public query methods whose latency is recorded when `NCSBE` is given a `Metrics` instance.
+QUERY_METHODS = (
+    'get_dataset', 'list_contests', 'list_counties', 'list_precincts', 'list_candidates', 'get_contest',
+    'get_candidate_info', 'get_county_results', 'get_precinct_results', 'get_all_candidate_results',
+    'get_candidate_vote_total', 'get_contest_stats', 'get_contest_vote_totals', 'get_total_votes_for_contest',
+    'get_candidate_vote_percentage', 'get_contest_winner', 'get_closest_race', 'get_vote_method_totals',
+    'get_vote_method_share_by_county', 'get_candidates', 'get_counties', 'get_precincts',
+    'get_contests_by_candidate', 'has_contest', 'has_candidate', 'get_contest_summaries', 'get_contest_winners',
+    'get_vote_percentages',
+)
 
 class NCSBE:
     """
@@ -22,14 +45,52 @@ class NCSBE:
     ```
     """
 
-    def __init__(self, election_date: str):
+    def __init__(
+        self, election_date: str, stream: bool = False, columnar: bool = False, workers: int = 1,
+        cache: Optional[SnapshotCache] = None, session: Optional[requests.Session] = None,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT, metrics: Optional[Metrics] = None, incremental: bool = False,
+        lazy: bool = False, filters: Optional[RowFilter] = None, engine: str = 'python',
+        publisher: Optional[SharedDatasetPublisher] = None, strings: Optional[dict[str, str]] = None
+    ):
         """
         Creates a new instance of `NCSBE` for a given election date.
         param election_date: The date of the election in YYYY-MM-DD format.
+        param stream: Parse the results file incrementally instead of loading it into memory whole.
+        param columnar: Also keep a column-oriented copy of the rows, used to answer vote-total aggregations.
+            It is kept next to the full dataset, so it adds memory; use `lazy` to hold less.
+        param workers: Number of processes used to parse large results files; 1 parses in this process.
+        param cache: Snapshot cache that `initialize()` loads from and every newly parsed dataset is saved to.
+        param session: HTTP session to fetch with, e.g. one from `create_session()` shared by many elections.
+        param timeout: (connect, read) timeouts in seconds.
+        param metrics: Records refresh stage durations, data volumes and the latency of every query method.
+        param incremental: On refresh, rebuild only the precincts that changed and reuse every unchanged object.
+        param lazy: Build each contest's counties and precincts only when first accessed (see `LazyContestData`).
+        param filters: Only parse and keep the rows of some contests, counties, contest types or contest groups.
+        param engine: 'python', or 'pyarrow' to read the results file with PyArrow's CSV reader.
+        param publisher: Publishes every new dataset for `SharedElection` followers in other processes.
+        param strings: Table of interned strings shared with the collectors of other elections (see `ElectionCatalog`).
         """
         self._election_date = election_date
         self._url = self._make_base_url(election_date)
-        self._dataset = Optional[list[ContestData]]
+        self._collector = self._create_collector(
+            self._url, stream=stream, columnar=columnar, workers=workers, session=session, timeout=timeout,
+            metrics=metrics, incremental=incremental, lazy=lazy, filters=filters, engine=engine, strings=strings
+        )
+        self._cache = cache
+        self._publisher = publisher
+        # Snapshots of a filtered dataset are kept apart from those of the full one.
+        self._cache_key = election_date if filters is None else f'{election_date}+{filters.key}'
+        self._metrics = metrics
+        self._index = DatasetIndex(None)
+
+        # Query methods are only wrapped when metrics are enabled, so they cost nothing otherwise.
+        if metrics is not None:
+            for name in QUERY_METHODS:
+                setattr(self, name, metrics.timed_query(name, getattr(self, name)))
+
+    def _create_collector(self, url: str, **kwargs) -> Collector:
+        return Collector(url, **kwargs)
+
 
     @staticmethod
     def _make_base_url(date: str) -> str:
@@ -40,26 +101,142 @@ class NCSBE:
     
 
     def collect(self) -> list:
-        """Collects and processes election data from the provided URL."""
-        collector = Collector(self._url)
-        return collector.collect()
+        """
+        Collects and processes election data from the provided URL.
+        The same `Collector` is reused across calls, so unchanged files are not downloaded or parsed again.
+        """
+        return self._collector.collect()
 
 
     def initialize(self) -> None:
-        """Initializes the election dataset by fetching and storing the results in memory."""
-        self._dataset = self.collect()
+        """
+        Initializes the election dataset by fetching and storing the results in memory.
+        With a snapshot cache, a cached dataset is published first and then revalidated with a
+        conditional request, so an unchanged results file is neither downloaded nor parsed.
+        """
+        if self._restore_snapshot():
+            self._replace_dataset(self.collect() or self._dataset)
+            return
+
+        self._set_dataset(self.collect())
+
+
+    def _restore_snapshot(self) -> bool:
+        if self._cache is None: return False
+
+        snapshot = self._cache.load(self._cache_key)
+        if snapshot is None: return False
+
+        dataset = list(snapshot.dataset)
+        self._collector.restore(dataset, snapshot.source, snapshot.digests)
+        self._set_dataset(dataset)
+        return True
+
+
+    def refresh(self) -> bool:
+        """
+        Refreshes the election dataset by re-fetching and replacing `data_set`.
+        If the results file cannot be fetched or parsed, the current dataset is kept and `last_error` is set.
+        return: `True` if the dataset changed, `False` if the results file was unchanged or the refresh failed.
+        """
+        return self._replace_dataset(self.collect())
+
+
+    def refresh_with_diff(self) -> DatasetDiff:
+        """
+        Refreshes the election dataset like `refresh()`, and describes what changed.
+        return: The contests added, removed and changed, down to the precinct and candidate level.
+        An empty (falsy) `DatasetDiff` means nothing changed.
+        """
+        previous = self._index
+        self.refresh()
+        return self._diff_since(previous)
+
+
+    def _replace_dataset(self, dataset: Optional[list[ContestData]]) -> bool:
+        # A failed collection returns `None`; keep serving the last good dataset.
+        if dataset is None or dataset is self._dataset: return False
+
+        self._set_dataset(dataset)
+        return True
+
 
+    def _diff_since(self, previous: DatasetIndex) -> DatasetDiff:
+        current = self._index
+        if current is previous: return DatasetDiff(added=(), removed=(), changed=())
 
-    def refresh(self) -> None:
-        """Refreshes the election dataset by re-fetching and replacing `data_set`."""
-        self._dataset = self.collect()
+        return diff_datasets(previous.contests, previous.digests, current.contests, current.digests)
+
+
+    def _set_dataset(self, dataset: Optional[list[ContestData]]) -> None:
+        with self._metrics.time_stage('index') if self._metrics is not None else nullcontext():
+            # Reuse what the collector built while formatting, when it describes this dataset.
+            if dataset is not None and dataset is self._collector.dataset:
+                index = DatasetIndex(dataset, self._collector.digests, self._collector.columnar)
+            else:
+                index = DatasetIndex(dataset)
+
+        # The index is fully built before it is published, so readers only ever
+        # see the old dataset or the new one, never a half-built index.
+        self._index = index
+
+        if self._metrics is not None:
+            self._metrics.increment('dataset_swaps')
+            self._metrics.set_gauge('contests', len(index.contests))
+
+        if self._cache is not None and self._collector.modified and dataset is not None and dataset is self._collector.dataset:
+            self._save_snapshot(index)
+
+        if self._publisher is not None and dataset is not None:
+            self._publish(index)
+
+
+    def _save_snapshot(self, index: DatasetIndex) -> None:
+        source = self._collector.source
+        if source is None: return
+
+        try:
+            # The collector's digests are `None` in lazy mode; computing them here would build every contest's counties.
+            self._cache.store(self._cache_key, source, index.dataset, self._collector.digests)
+        except OSError as e:
+            logging.warning(f"Could not save snapshot for {self._election_date}: {e}")
+
+
+    def _publish(self, index: DatasetIndex) -> None:
+        try:
+            generation = self._publisher.publish(index.dataset, self._election_date)
+            logging.info(f"Published generation {generation} of {self._election_date}")
+        except OSError as e:
+            logging.warning(f"Could not publish {self._election_date} for followers: {e}")
+
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        """The exception that made the last fetch fail, or `None` if it succeeded."""
+        return self._collector.last_error
+
+
+    def start_auto_refresh(
+        self, interval: float = 300, jitter: float = 0.1, max_backoff: float = 3600,
+        on_refresh: Optional[Callable[[bool], None]] = None
+    ) -> AutoRefresher:
+        """
+        Starts refreshing the dataset in a background thread, roughly every `interval` seconds.
+        See `AutoRefresher` for the meaning of the parameters.
+        return: The running refresher; call `stop()` on it to end the thread.
+        """
+        refresher = AutoRefresher(self, interval=interval, jitter=jitter, max_backoff=max_backoff, on_refresh=on_refresh)
+        refresher.start()
+        return refresher
+
+
+    @property
+    def _dataset(self) -> Optional[list[ContestData]]:
+        return self._index.dataset
 
 
     def _get_contest_data(self, contest: str) -> Optional[ContestData]:
-        for c in self._dataset:
-            if c.contest_name == contest:
-                return c
-        return None
+        return self._index.contests.get(contest)
 
 
     def get_dataset(self) -> Optional[list[ContestData]]:
@@ -67,10 +244,25 @@ class NCSBE:
         return self._dataset
 
 
+    def export_archive(self, path: str) -> None:
+        """
+        Writes the current dataset to `path` as a columnar archive, which `ElectionArchive` can query without loading it.
+        """
+        write_archive(path, self._dataset or (), self._election_date)
+
+
+    def export_json(self, fp: TextIO, ndjson: bool = False, cache: bool = False) -> None:
+        """
+        Streams the current dataset to a text file as JSON, without building the intermediate dicts.
+        param ndjson: Write one contest per line instead of a single JSON array.
+        param cache: Keep each contest's JSON on it for the next export; see `serialize.to_json`.
+        """
+        (write_ndjson if ndjson else write_json)(self._dataset or (), fp, cache)
+
+
     def list_contests(self) -> list[str]:
         """Retrieves a list of all contests (races) available in the dataset."""
-        contest_names = set(contest.contest_name for contest in self._dataset)
-        return list(contest_names) if contest_names else []
+        return list(self._index.contests)
 
 
     def list_counties(self, contest: str) -> list[str]:
@@ -83,14 +275,10 @@ class NCSBE:
 
     def list_precincts(self, contest: str, county: str) -> list[str]:
         """Lists all precincts in a given county for a specific contest."""
-        contest_data = self._get_contest_data(contest)
-        if not contest_data: return []
+        county_data = self._index.county(contest, county)
+        if not county_data: return []
 
-        for c in contest_data.counties:
-            if c.county == county:
-                return list({ precinct.precinct for precinct in c.precincts })
-                
-        return []
+        return list({ precinct.precinct for precinct in county_data.precincts })
 
     def list_candidates(self, contest: str) -> list[str]:
         """Retrieves a list of candidates in a given contest."""
@@ -107,117 +295,156 @@ class NCSBE:
 
     def get_candidate_info(self, contest: str, candidate_name: str) -> Optional[CandidateData]:
         """Retrieves detailed information about a specific candidate in a contest."""
-        contest_data = self._get_contest_data(contest)
-        if not contest_data: return None
-
-        for candidate in contest_data.candidates:
-            if candidate.candidate == candidate_name:
-                return candidate
-
-        return None
+        return self._index.candidates.get((contest, candidate_name))
 
 
     def get_county_results(self, contest: str, county: str) -> Optional[CountyData]:
         """Retrieves results for all precincts in a county for a given contest."""
-        contest_data = self._get_contest_data(contest)
-        if not contest_data: return None
+        return self._index.county(contest, county)
 
-        for c in contest_data.counties:
-            if c.county == county:
-                return c
-            
-        return None
+
+    def get_precinct_results(self, contest: str, county: str, precinct: str) -> Optional[PrecinctData]:
+        """Retrieves results for a single precinct in a county for a given contest."""
+        return self._index.precinct(contest, county, precinct)
 
 
     def get_all_candidate_results(self, candidate_name: str) -> list[CandidateData]:
         """Retrieves all election results for a specific candidate across all contests."""
-        dataset = self.get_dataset()
-        if not dataset: return []
-
-        res = []
-        for contest in dataset:
-            if any(candidate.candidate == candidate_name for candidate in contest.candidates):
-                candidate_info = self.get_candidate_info(contest.contest_name, candidate_name)
-                if candidate_info:
-                    res.append(candidate_info)
-            
-        return res
+        index = self._index
+        return [
+            index.candidates[(contest.contest_name, candidate_name)]
+            for contest in index.candidate_contests.get(candidate_name, ())
+        ]
 
 
     def get_candidate_vote_total(self, contest: str, candidate_name: str) -> int:
         """Retrieves the total vote count for a specific candidate in a contest."""
-        contest_data = self._get_contest_data(contest)
-        if not contest_data: return 0
+        candidate = self._index.candidates.get((contest, candidate_name))
+        return candidate.votes if candidate else 0
 
-        for candidate in contest_data.candidates:
-            if candidate.candidate == candidate_name:
-                return candidate.votes
 
-        return 0
+    def get_contest_stats(self, contest: str) -> Optional[ContestStats]:
+        """
+        Retrieves precomputed statistics (totals, ranking, winner, margin, percentages) for a contest.
+        Statistics are computed once for every contest per dataset and recomputed after a refresh.
+        """
+        return self._index.stats.get(contest)
 
 
     def get_contest_vote_totals(self, contest: str) -> dict[str, int]:
         """Retrieves a dictionary mapping candidates to their total votes in a contest."""
-        contest_data = self._get_contest_data(contest)
-        if not contest_data: return {}
-        
-        res: dict[str, int] = {}
-        for candidate in set(contest_data.candidates):
-            res[candidate.candidate] = self.get_candidate_vote_total(contest, candidate.candidate)
-        
-        return res
+        stats = self.get_contest_stats(contest)
+        return dict(stats.vote_totals) if stats else {}
 
 
     def get_total_votes_for_contest(self, contest: str) -> int:
         """Retrieves the total number of votes for a given contest."""
-        vote_totals = self.get_contest_vote_totals(contest)
-        return sum(vote_totals.values())
+        stats = self.get_contest_stats(contest)
+        return stats.total_votes if stats else 0
 
 
     def get_candidate_vote_percentage(self, contest: str, candidate_name: str) -> float:
         """Retrieve a candidate's percentage of total votes in a contest."""
-        vote_totals = self.get_contest_vote_totals(contest)
-        if candidate_name not in vote_totals: return 0
-
-        total_votes = self.get_total_votes_for_contest(contest)
-
-        return (vote_totals[candidate_name] / total_votes) * 100 if total_votes > 0 else 0
+        stats = self.get_contest_stats(contest)
+        return stats.percentages.get(candidate_name, 0) if stats else 0
 
 
     def get_contest_winner(self, contest: str) -> Optional[CandidateData]:
         """Retrieves the data of the candidate who currently has the most votes in a given contest."""
-        contest_data = self._get_contest_data(contest)
-        if not contest_data or len(contest_data.candidates) == 0: return None
+        stats = self.get_contest_stats(contest)
+        return stats.winner if stats else None
 
-        vote_totals = self.get_contest_vote_totals(contest)
-        if len(vote_totals.items()) == 0: return None
 
-        winnerName = sorted(vote_totals.items(), key=lambda item: item[1], reverse=True)[0][0]
+    def get_contest_summaries(self, contests: Optional[Iterable[str]] = None, counties: bool = False) -> dict[str, ContestSummary]:
+        """
+        Retrieves the data and statistics of many contests at once, e.g. everything a results page renders.
+        param contests: Contest names to summarize; every contest if omitted. Unknown contests are left out.
+        param counties: Whether to include each contest's county results.
+        return: Contest name -> `ContestSummary`, in the order requested.
+        """
+        # Read the index once, so a concurrent refresh cannot mix two datasets.
+        index = self._index
+        stats = index.stats
+        summaries = {}
+        for name in (index.contests if contests is None else contests):
+            contest_data = index.contests.get(name)
+            if contest_data is None: continue
+            summaries[name] = ContestSummary(
+                contest = contest_data,
+                stats = stats[name],
+                counties = dict(index.counties(name)) if counties else {}
+            )
+        return summaries
+
+
+    def get_contest_winners(self, contests: Optional[Iterable[str]] = None) -> dict[str, Optional[CandidateData]]:
+        """
+        Retrieves the current leader of many contests at once.
+        param contests: Contest names; every contest if omitted. Unknown contests map to `None`.
+        """
+        index = self._index
+        stats = index.stats
+        return {
+            name: stats[name].winner if name in stats else None
+            for name in (index.contests if contests is None else contests)
+        }
 
-        return self.get_candidate_info(contest, winnerName) if winnerName else None
+
+    def get_vote_percentages(self, pairs: Iterable[Tuple[str, str]]) -> list[float]:
+        """
+        Retrieves many candidates' percentages of the total votes in their contests at once.
+        param pairs: (contest, candidate name) pairs.
+        return: One percentage per pair, in order; 0 for an unknown contest or candidate.
+        """
+        stats = self._index.stats
+        percentages = []
+        for contest, candidate_name in pairs:
+            contest_stats = stats.get(contest)
+            percentages.append(contest_stats.percentages.get(candidate_name, 0) if contest_stats else 0)
+        return percentages
 
 
     def get_closest_race(self) -> Optional[ContestData]:
         """Finds the contest with the smallest margin between the top two candidates."""
-        dataset = self.get_dataset()
-        if not dataset: return None
-
         closest_contest: ContestData = None
         smallest_margin = float('inf')
 
-        for contest in dataset:
-            vote_totals = self.get_contest_vote_totals(contest.contest_name)
-            sorted_totals = sorted(vote_totals.items(), key=lambda item: item[1], reverse=True)
-
-            if len(sorted_totals) >= 2:
-                margin = sorted_totals[0][1] - sorted_totals[1][1]
-                if margin < smallest_margin:
-                    smallest_margin = margin
-                    closest_contest = contest
+        # Read the index once, so a concurrent refresh cannot mix two datasets.
+        index = self._index
+        for contest_name, stats in index.stats.items():
+            if stats.margin is not None and stats.margin < smallest_margin:
+                smallest_margin = stats.margin
+                closest_contest = index.contests[contest_name]
 
         return closest_contest
 
 
+    def get_vote_method_totals(self, contest: str, county: Optional[str] = None) -> dict[str, int]:
+        """
+        Retrieves the number of votes cast by each voting method in a contest, statewide or in a single county.
+        return: A dictionary keyed by method (`election_day`, `early_voting`, `absentee_by_mail`, `provisional`)
+        plus `total_votes`; empty if the contest or county does not exist.
+        """
+        totals = self._index.method_totals(contest, county)
+        return dict(totals) if totals is not None else {}
+
+
+    def get_vote_method_share_by_county(self, contest: str, method: str) -> dict[str, float]:
+        """
+        Retrieves, for each county in a contest, the percentage of its votes that were cast by a given method.
+        param method: One of `election_day`, `early_voting`, `absentee_by_mail` or `provisional`.
+        """
+        if method not in VOTE_METHODS:
+            raise ValueError(f'Unknown voting method: {method}')
+
+        res: dict[str, float] = {}
+        for county, totals in self._index.county_method_totals(contest).items():
+            total_votes = totals['total_votes']
+            res[county] = (totals[method] / total_votes) * 100 if total_votes > 0 else 0
+
+        return res
+
+
     def get_candidates(self, contest: str) -> list[CandidateData]:
         """Retrieves all candidates in a given contest."""
         contest_data = self.get_contest(contest)
@@ -244,32 +471,14 @@ class NCSBE:
 
     def get_contests_by_candidate(self, candidate_name: str) -> list[ContestData]:
         """Retrieves all contests that a given candidate is a part of."""
-        dataset = self.get_dataset()
-        if not dataset: return []
-
-        contest_data = []
-        for contest in dataset:
-            if any(candidate.candidate == candidate_name for candidate in contest.candidates):
-                contest_data.append(contest)
-        
-        return contest_data
+        return list(self._index.candidate_contests.get(candidate_name, ()))
 
 
     def has_contest(self, contest: str) -> bool:
         """Checks whether a given contest exists in the dataset."""
-        dataset = self.get_dataset()
-        if not dataset: return False
-
-        return any(c.contest_name == contest for c in dataset)
+        return contest in self._index.contests
 
 
     def has_candidate(self, candidate_name: str) -> bool:
         """Checks whether a given candidate exists in the dataset."""
-        dataset = self.get_dataset()
-        if not dataset: return False
-
-        for contest in dataset:
-            if any(candidate.candidate == candidate_name for candidate in contest.candidates):
-                return True
-        
-        return False
\ No newline at end of file
+        return candidate_name in self._index.candidate_contests
@@ -0,0 +1,135 @@
+import inspect
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from .ncsbe import NCSBE
+
+def next_delay(interval: float, jitter: float, failures: int, max_backoff: float) -> float:
+    """
+    Computes how long to wait before the next refresh.
+    param interval: Seconds between refreshes while they succeed.
+    param jitter: Fraction of the delay randomly added or removed, so many clients do not refresh in lockstep.
+    param failures: Number of consecutive failed refreshes; each one doubles the delay.
+    param max_backoff: Upper bound, in seconds, on the doubled delay.
+    """
+    delay = interval
+    if failures > 0:
+        delay = min(interval * 2 ** min(failures, 32), max(max_backoff, interval))
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+class AutoRefresher:
+    """
+    The `AutoRefresher` class refreshes an `NCSBE` dataset on a background thread.
+
+    Each refresh downloads, parses and indexes the new results file off to the side and then
+    publishes it with a single reference swap, so queries on other threads never block on a
+    refresh and never see a partially built dataset. When a refresh fails, the last good
+    dataset keeps being served and the delay doubles (up to `max_backoff`) until one succeeds.
+
+    Example usage:
+    ```python
+    election_data = NCSBE("2024-11-05")
+    election_data.initialize()
+    refresher = election_data.start_auto_refresh(interval=300)
+    ...
+    refresher.stop()
+    ```
+    """
+
+    def __init__(
+        self, ncsbe: 'NCSBE', interval: float = 300, jitter: float = 0.1, max_backoff: float = 3600,
+        on_refresh: Optional[Callable[[bool], None]] = None
+    ):
+        """
+        Creates a refresher for an `NCSBE` instance; call `start()` to begin refreshing.
+        param interval: Seconds between refreshes while they succeed.
+        param jitter: Fraction of each delay randomly added or removed.
+        param max_backoff: Longest delay, in seconds, between retries after consecutive failures.
+        param on_refresh: Called after every successful refresh with whether the dataset changed.
+        """
+        if inspect.iscoroutinefunction(ncsbe.refresh):
+            raise TypeError('AutoRefresher needs a synchronous refresh(); run AsyncNCSBE.auto_refresh() as a task instead.')
+        if interval <= 0:
+            raise ValueError(f'interval must be positive, got {interval}')
+        if not 0 <= jitter < 1:
+            raise ValueError(f'jitter must be in [0, 1), got {jitter}')
+
+        self._ncsbe = ncsbe
+        self._interval = interval
+        self._jitter = jitter
+        self._max_backoff = max_backoff
+        self._on_refresh = on_refresh
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Number of consecutive failed refreshes, and when the last successful one finished.
+        self.failures = 0
+        self.last_success: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Starts the background thread. The first refresh happens after one interval.
+        If a stopped thread is still finishing a refresh, waits for it first, so two refresh loops never run at once.
+        """
+        if self.running and not self._stopped.is_set(): return
+        if self._thread is not None:
+            self._thread.join()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='ncsbe-auto-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background thread, waiting up to `timeout` seconds for a refresh in progress to finish.
+        If it is still running then, `running` stays true until it has finished.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def __enter__(self) -> 'AutoRefresher':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def refresh_once(self) -> bool:
+        """
+        Runs a single refresh now and updates the failure count.
+        return: Whether the refresh succeeded.
+        """
+        try:
+            changed = self._ncsbe.refresh()
+            error = self._ncsbe.last_error
+        except Exception as e:
+            changed, error = False, e
+
+        if error is not None:
+            self.failures += 1
+            logging.warning(f"Refresh failed ({self.failures} in a row), keeping the current dataset: {error}")
+            return False
+
+        self.failures = 0
+        self.last_success = time.time()
+        if self._on_refresh is not None:
+            try:
+                self._on_refresh(changed)
+            except Exception as e:
+                logging.error(f"Error in refresh callback: {e}")
+        return True
+
+    def _run(self) -> None:
+        while not self._stopped.wait(next_delay(self._interval, self._jitter, self.failures, self._max_backoff)):
+            self.refresh_once()
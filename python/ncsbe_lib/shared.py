@@ -0,0 +1,212 @@
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Iterable, Optional
+from .archive import ElectionArchive, encode_archive
+from .types import ContestData
+
+# The control file holds the generation currently published, as one little-endian unsigned 64-bit integer.
+_CONTROL_FILE = 'generation'
+_GENERATION = struct.Struct('<Q')
+_SUFFIX = '.ncsbe'
+
+# Archive methods a `SharedElection` answers, on the generation current at the time of the call:
+# every `NCSBE` query method except `get_dataset`.
+SHARED_QUERY_METHODS = (
+    'list_contests', 'has_contest', 'list_counties', 'list_precincts', 'list_candidates', 'get_candidates',
+    'get_counties', 'get_precincts', 'get_contest', 'get_county_results', 'get_precinct_results', 'get_candidate_info',
+    'get_all_candidate_results', 'get_candidate_vote_total', 'get_contest_stats', 'get_contest_vote_totals',
+    'get_total_votes_for_contest', 'get_candidate_vote_percentage', 'get_contest_winner', 'get_closest_race',
+    'get_vote_method_totals', 'get_vote_method_share_by_county', 'get_contests_by_candidate', 'has_candidate',
+    'get_contest_summaries', 'get_contest_winners', 'get_vote_percentages',
+)
+
+def default_shared_dir(election_date: str) -> str:
+    """Where an election is shared by default: under `/dev/shm` (memory-backed) when it exists, else the temp directory."""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'ncsbe-lib', election_date)
+
+
+def _archive_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f'{generation:016d}{_SUFFIX}')
+
+
+class SharedDatasetPublisher:
+    """
+    The `SharedDatasetPublisher` class publishes datasets for other processes on the same host,
+    so that only one process (the leader) fetches and parses the results file.
+
+    Each dataset is written to `directory` as a columnar archive (see `ElectionArchive`), then
+    a generation counter in a small control file is bumped. Followers (`SharedElection`)
+    memory-map the archive of the current generation read-only, so every process shares the
+    same physical pages. Put the directory on a memory-backed filesystem such as `/dev/shm`
+    (the default, see `default_shared_dir`).
+
+    The previous generation's archive is kept until the next publication, so followers that
+    read the counter just before a switch can still open it; older archives are removed.
+    Followers that already mapped one keep reading it safely after it is removed.
+
+    Example usage:
+    ```python
+    # In the leader, e.g. gunicorn's master process:
+    ncsbe = NCSBE("2024-11-05", publisher=SharedDatasetPublisher(default_shared_dir("2024-11-05")))
+    ncsbe.initialize()
+    ncsbe.start_auto_refresh()
+    ```
+    """
+
+    def __init__(self, directory: str):
+        """
+        Prepares `directory` for publishing, continuing from the generation already published there, if any.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._lock = threading.Lock()
+
+        control_path = os.path.join(directory, _CONTROL_FILE)
+        fd = os.open(control_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < _GENERATION.size:
+                os.ftruncate(fd, _GENERATION.size)
+            self._control = mmap.mmap(fd, _GENERATION.size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def generation(self) -> int:
+        """The generation last published; 0 before the first publication."""
+        return _GENERATION.unpack_from(self._control, 0)[0]
+
+    def publish(self, dataset: Iterable[ContestData], election_date: Optional[str] = None) -> int:
+        """
+        Publishes a dataset as the next generation.
+        return: The new generation number.
+        """
+        data = encode_archive(dataset, election_date)
+        with self._lock:
+            generation = self.generation + 1
+            path = _archive_path(self._directory, generation)
+
+            # Followers only look for the archive once the counter points at it, so it is complete by then.
+            fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+            _GENERATION.pack_into(self._control, 0, generation)
+            self._remove_older_than(generation - 1)
+        return generation
+
+    def _remove_older_than(self, generation: int) -> None:
+        for name in os.listdir(self._directory):
+            if not name.endswith(_SUFFIX): continue
+            try:
+                if int(name[:-len(_SUFFIX)]) < generation:
+                    os.unlink(os.path.join(self._directory, name))
+            except (ValueError, OSError) as e:
+                # Not an archive name, or (on Windows) still mapped by a follower; retried next time.
+                logging.debug(f"Could not remove shared archive {name}: {e}")
+
+    def close(self) -> None:
+        """Unmaps the control file. Published archives stay in place for the followers."""
+        self._control.close()
+
+
+class SharedElection:
+    """
+    The `SharedElection` class is a read-only follower of a dataset published by a
+    `SharedDatasetPublisher` in another process. It never fetches or parses anything.
+
+    Every query first reads the generation counter (one read from a shared memory page) and,
+    when a newer dataset was published, maps its archive; the call is then answered entirely
+    from that generation, so a query never mixes two datasets. Before anything is published,
+    every query answers as for an empty dataset.
+
+    Followers answer every `NCSBE` query method (see `SHARED_QUERY_METHODS`) through
+    `ElectionArchive`, with these differences:
+    - no `get_dataset`, `initialize`, `refresh` or `start_auto_refresh`; only the leader loads data
+    - no `export_json`/`export_archive`, and no `metrics` on queries
+    - `get_contests_by_candidate` returns contest names rather than `ContestData`
+    - results are materialized from the archive on every call, so unlike `NCSBE` they are
+      equal, but not identical, objects from one call to the next
+
+    Example usage:
+    ```python
+    # In each gunicorn worker:
+    election = SharedElection(default_shared_dir("2024-11-05"))
+    election.get_contest_winner("US_SENATE")
+    ```
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._control: Optional[mmap.mmap] = None
+        self._generation = 0
+        self._archive = ElectionArchive(encode_archive(()))
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def generation(self) -> int:
+        """The generation the follower currently answers from; 0 before anything was published."""
+        return self._generation
+
+    @property
+    def election_date(self) -> Optional[str]:
+        return self.archive.election_date
+
+    def _published_generation(self) -> int:
+        if self._control is None:
+            try:
+                with open(os.path.join(self._directory, _CONTROL_FILE), 'rb') as f:
+                    self._control = mmap.mmap(f.fileno(), _GENERATION.size, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Nothing published yet.
+                return 0
+        return _GENERATION.unpack_from(self._control, 0)[0]
+
+    @property
+    def archive(self) -> ElectionArchive:
+        """The archive of the latest published generation, mapped on first use."""
+        generation = self._published_generation()
+        if generation == self._generation: return self._archive
+
+        with self._lock:
+            if generation != self._generation:
+                try:
+                    archive = ElectionArchive(_archive_path(self._directory, generation))
+                except (OSError, ValueError, struct.error) as e:
+                    # Superseded and removed between reading the counter and opening it; the next call catches up.
+                    logging.warning(f"Could not open shared generation {generation}: {e}")
+                    return self._archive
+                # The previous archive is not closed: other threads may still be reading it.
+                # It is unmapped once the last reference to it goes away.
+                self._archive = archive
+                self._generation = generation
+        return self._archive
+
+    def __getattr__(self, name: str):
+        if name in SHARED_QUERY_METHODS:
+            return getattr(self.archive, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def close(self) -> None:
+        """Unmaps the control file and the current archive."""
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+        self._archive.close()
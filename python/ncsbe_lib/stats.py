@@ -0,0 +1,35 @@
+from typing import Optional
+from .types import ContestData, ContestStats
+
+def compute_contest_stats(contest: ContestData, vote_totals: Optional[dict[str, int]] = None) -> ContestStats:
+    """
+    Computes totals, ranking, winner, top-two margin and percentages for a contest in one pass.
+    param vote_totals: Candidate name -> total votes, if already aggregated elsewhere; read from the contest otherwise.
+    """
+    # The first entry for a candidate wins, matching the index lookups.
+    candidates = {}
+    for candidate in contest.candidates:
+        candidates.setdefault(candidate.candidate, candidate)
+
+    if vote_totals is None:
+        vote_totals = { name: candidate.votes for name, candidate in candidates.items() }
+
+    ranking = tuple(sorted(
+        (candidates[name] for name in vote_totals if name in candidates),
+        key=lambda candidate: vote_totals[candidate.candidate],
+        reverse=True
+    ))
+    total_votes = sum(vote_totals.values())
+
+    return ContestStats(
+        contest_name = contest.contest_name,
+        vote_totals = vote_totals,
+        ranking = ranking,
+        winner = ranking[0] if ranking else None,
+        margin = vote_totals[ranking[0].candidate] - vote_totals[ranking[1].candidate] if len(ranking) >= 2 else None,
+        total_votes = total_votes,
+        percentages = {
+            name: (votes / total_votes) * 100 if total_votes > 0 else 0
+            for name, votes in vote_totals.items()
+        }
+    )
@@ -1,10 +1,53 @@
-from dataclasses import dataclass, asdict
+from dataclasses import FrozenInstanceError, dataclass, asdict, fields
+from typing import Callable, Optional
+from . import serialize
+
+# Ways a vote can be cast, as broken out in the results file. Each is a field of `CandidateData`.
+VOTE_METHODS = ('election_day', 'early_voting', 'absentee_by_mail', 'provisional')
+
+def _slotted(*extra: str) -> Callable[[type], type]:
+    """
+    Rebuilds a frozen dataclass with `__slots__`, what `@dataclass(slots=True)` does on Python 3.10+.
+    Instances then have no per-instance `__dict__`, which matters for the hundreds of thousands
+    of candidate entries and parsed rows in a statewide file.
+    param extra: Slots to add besides the fields, e.g. the cached JSON of `serialize.to_json`.
+    """
+    def rebuild(cls: type) -> type:
+        names = tuple(field.name for field in fields(cls))
+        namespace = dict(cls.__dict__)
+        # Defaults live on as `__init__` defaults; as class attributes they would clash with the slots.
+        for name in names + ('__dict__', '__weakref__'):
+            namespace.pop(name, None)
+        namespace['__slots__'] = names + extra
+
+        # Frozen instances cannot be restored by `setattr`, so pickling goes through the fields.
+        def __getstate__(self) -> tuple:
+            return tuple(getattr(self, name) for name in names)
+
+        def __setstate__(self, state: tuple) -> None:
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        # The generated frozen `__setattr__`/`__delattr__` refer to the class being replaced.
+        def __setattr__(self, name: str, value) -> None:
+            raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+        def __delattr__(self, name: str) -> None:
+            raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+        namespace['__getstate__'] = __getstate__
+        namespace['__setstate__'] = __setstate__
+        namespace['__setattr__'] = __setattr__
+        namespace['__delattr__'] = __delattr__
+        return type(cls)(cls.__name__, cls.__bases__, namespace)
+    return rebuild
 
 # Frozen makes each dataclass immutable, ensuring it has the ability to be a dict key or set member. 
+@_slotted('_json')
 @dataclass(frozen=True)
 class CandidateData:
     """
-    Represents a candidate and their vote count.
+    Represents a candidate and their vote count, broken down by voting method.
     """
     # Candidate's name.
     candidate: str
@@ -15,10 +58,23 @@ class CandidateData:
     # Number of votes received.
     votes: int
 
+    # Votes cast on election day.
+    election_day: int = 0
+
+    # Votes cast during early voting.
+    early_voting: int = 0
+
+    # Votes cast via absentee by mail.
+    absentee_by_mail: int = 0
+
+    # Votes cast provisionally (pending verification).
+    provisional: int = 0
+
     # Converts the dataclass into a Python dictionary, including nested objects.
     def to_dict(self) -> dict:
-        return asdict(self)
+        return serialize.to_dict(self)
 
+@_slotted('_json')
 @dataclass(frozen=True)
 class PrecinctData:
     """
@@ -30,10 +86,14 @@ class PrecinctData:
     # List of candidates who received votes in this precinct.
     candidates: tuple[CandidateData, ...]
 
+    # Whether the precinct is real (True) or aggregated, e.g. absentee or provisional results (False).
+    real_precinct: bool = True
+
     # Converts the dataclass into a Python dictionary, including nested objects.
     def to_dict(self) -> dict:
-        return asdict(self)
+        return serialize.to_dict(self)
 
+@_slotted('_json')
 @dataclass(frozen=True)
 class CountyData:
     """
@@ -45,10 +105,14 @@ class CountyData:
     # List of precincts within the county.
     precincts: tuple[PrecinctData, ...]
 
+    # County-wide totals for each candidate, summed over every precinct in the county.
+    candidates: tuple[CandidateData, ...] = ()
+
     # Converts the dataclass into a Python dictionary, including nested objects.
     def to_dict(self) -> dict:
-        return asdict(self)
+        return serialize.to_dict(self)
 
+@_slotted('_json')
 @dataclass(frozen=True)
 class ContestData:
     """
@@ -63,10 +127,54 @@ class ContestData:
     # List of candidates that have received votes for the contest.
     candidates: tuple[CandidateData, ...]
 
+    # Number of candidates each voter may choose in this contest.
+    vote_for: int = 1
+
     # Converts the dataclass into a Python dictionary, including nested objects.
     def to_dict(self) -> dict:
-        return asdict(self)
+        return serialize.to_dict(self)
+
+@dataclass(frozen=True)
+class ContestStats:
+    """
+    Precomputed statistics for a contest: vote totals, ranking, winner, margin and percentages.
+    """
+    # The name of the contest (e.g., "US Senate").
+    contest_name: str
+
+    # Candidate name -> total votes, in the order candidates appear in the contest.
+    vote_totals: dict[str, int]
+
+    # Candidates ordered from most to fewest votes; ties keep their order in the contest.
+    ranking: tuple[CandidateData, ...]
+
+    # The candidate who currently has the most votes, if any.
+    winner: Optional[CandidateData]
+
+    # Vote difference between the top two candidates, or `None` with fewer than two candidates.
+    margin: Optional[int]
+
+    # Total number of votes cast in the contest.
+    total_votes: int
+
+    # Candidate name -> percentage of the contest's total votes.
+    percentages: dict[str, float]
+
+@dataclass(frozen=True)
+class ContestSummary:
+    """
+    Everything a results page shows for one contest, as returned by `NCSBE.get_contest_summaries`.
+    """
+    # The contest's data.
+    contest: ContestData
+
+    # Precomputed statistics: totals, ranking, winner, margin and percentages.
+    stats: ContestStats
+
+    # County name -> county results, when requested; empty otherwise.
+    counties: dict[str, CountyData]
 
+@_slotted()
 @dataclass(frozen=True)
 class ParsedRow:
     """
@@ -116,3 +224,132 @@ class ParsedRow:
 
     # Whether the precinct is real (True) or aggregated (False).
     real_precinct: bool
+
+@dataclass(frozen=True)
+class ParseCacheInfo:
+    """
+    Hit and miss counters of the `Collector`'s parsing caches.
+    """
+    # Contest names whose normalized form was already cached.
+    normalize_hits: int
+
+    # Contest names that had to be normalized with the regex.
+    normalize_misses: int
+
+    # Categorical strings that were replaced by an already interned copy.
+    intern_hits: int
+
+    # Categorical strings seen for the first time.
+    intern_misses: int
+
+    # Number of distinct strings currently interned.
+    interned_strings: int
+
+@dataclass(frozen=True)
+class SourceInfo:
+    """
+    Describes the results file a dataset was parsed from, used to make conditional requests on refresh.
+    """
+    # Value of the response's `ETag` header, if any.
+    etag: Optional[str]
+
+    # Value of the response's `Last-Modified` header, if any.
+    last_modified: Optional[str]
+
+    # Size of the response body in bytes, from `Content-Length`, if any.
+    content_length: Optional[int]
+
+    # SHA-256 hex digest of the response body.
+    content_hash: str
+
+@dataclass(frozen=True)
+class CountyDigest:
+    """
+    Stable content digest of a county's results within a contest, with one digest per precinct.
+    """
+    # Digest of the whole county, derived from its precinct digests.
+    digest: str
+
+    # Precinct identifier -> digest of that precinct's candidate results.
+    precincts: dict[str, str]
+
+@dataclass(frozen=True)
+class ContestDigest:
+    """
+    Stable content digest of a contest, with a digest per county and per precinct beneath it.
+    """
+    # Digest of the whole contest, derived from its county digests and candidate totals.
+    digest: str
+
+    # County name -> digest of that county's results.
+    counties: dict[str, CountyDigest]
+
+@dataclass(frozen=True)
+class CountyDiff:
+    """
+    Describes how a county's results changed within a contest between two datasets.
+    """
+    # The county as it appears in the new dataset.
+    county: CountyData
+
+    # Precincts that only appear in the new dataset.
+    precincts_added: tuple[PrecinctData, ...]
+
+    # Identifiers of precincts that only appear in the old dataset.
+    precincts_removed: tuple[str, ...]
+
+    # Precincts whose candidate results changed, as they appear in the new dataset.
+    precincts_changed: tuple[PrecinctData, ...]
+
+    # Converts the dataclass into a Python dictionary, including nested objects.
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass(frozen=True)
+class ContestDiff:
+    """
+    Describes how a contest changed between two datasets, down to the precinct and candidate level.
+    """
+    # The contest as it appears in the new dataset.
+    contest: ContestData
+
+    # Contest-level candidate totals that are new or changed, as they appear in the new dataset.
+    candidates_changed: tuple[CandidateData, ...]
+
+    # Names of candidates that only appear in the old dataset.
+    candidates_removed: tuple[str, ...]
+
+    # Counties that only appear in the new dataset.
+    counties_added: tuple[CountyData, ...]
+
+    # Names of counties that only appear in the old dataset.
+    counties_removed: tuple[str, ...]
+
+    # Counties present in both datasets whose results changed.
+    counties_changed: tuple[CountyDiff, ...]
+
+    # Converts the dataclass into a Python dictionary, including nested objects.
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass(frozen=True)
+class DatasetDiff:
+    """
+    The set of changes between two snapshots of an election dataset, as returned by `NCSBE.refresh_with_diff()`.
+    """
+    # Contests that only appear in the new dataset.
+    added: tuple[ContestData, ...]
+
+    # Names of contests that only appear in the old dataset.
+    removed: tuple[str, ...]
+
+    # Contests present in both datasets whose results changed.
+    changed: tuple[ContestDiff, ...]
+
+    # Whether anything changed at all.
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    # Converts the dataclass into a Python dictionary, including nested objects.
+    def to_dict(self) -> dict:
+        return asdict(self)
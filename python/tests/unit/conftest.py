@@ -1,10 +1,32 @@
 import pytest
+from benchmarks.synthetic import HEADER as TSV_HEADER, make_row, write_results_zip as make_results_zip
 from ncsbe_lib.ncsbe import NCSBE
 from unittest.mock import patch
 from ncsbe_lib.types import ContestData, CandidateData, CountyData, PrecinctData
 
+def make_candidate(candidate, party, votes):
+    """Builds a `CandidateData` whose vote methods split the same way as `make_tsv_row`."""
+    early_voting = votes // 2
+    return CandidateData(
+        candidate = candidate,
+        party = party,
+        votes = votes,
+        election_day = votes - early_voting,
+        early_voting = early_voting
+    )
+
 @pytest.fixture(scope="session")
 def mock_election_data():
+    president_candidates = (
+        make_candidate("John", "DEM", 100050),
+        make_candidate("Mark", "REP", 100000),
+        make_candidate("Alex", "DEM", 1000),
+    )
+    senate_candidates = (
+        make_candidate("Alex", "DEM", 15000),
+        make_candidate("Felix", "REP", 18000),
+    )
+
     return (
         ContestData(
             contest_name = "US_PRESIDENT",
@@ -14,44 +36,13 @@ def mock_election_data():
                     precincts = (
                         PrecinctData(
                             precinct = "1",
-                            candidates = (
-                                CandidateData(
-                                    candidate = "John",
-                                    party = "DEM",
-                                    votes = 100050
-                                ),
-                                CandidateData(
-                                    candidate = "Mark",
-                                    party = "REP",
-                                    votes = 100000
-                                ),
-                                CandidateData(
-                                    candidate = "Alex",
-                                    party = "DEM",
-                                    votes = 1000
-                                ),
-                            ),
+                            candidates = president_candidates,
                         ),
                     ),
+                    candidates = president_candidates,
                 ),
             ),
-            candidates = (
-                CandidateData(
-                    candidate = "John",
-                    party = "DEM",
-                    votes = 100050
-                ),
-                CandidateData(
-                    candidate = "Mark",
-                    party = "REP",
-                    votes = 100000
-                ),
-                CandidateData(
-                    candidate = "Alex",
-                    party = "DEM",
-                    votes = 1000
-                ),
-            ),
+            candidates = president_candidates,
         ),
         ContestData(
             contest_name = "US_SENATE",
@@ -61,34 +52,13 @@ def mock_election_data():
                     precincts = (
                         PrecinctData(
                             precinct = "2",
-                            candidates = (
-                                CandidateData(
-                                    candidate = "Alex",
-                                    party = "DEM",
-                                    votes = 15000
-                                ),
-                                CandidateData(
-                                    candidate = "Felix",
-                                    party = "REP",
-                                    votes = 18000
-                                ),
-                            ),
+                            candidates = senate_candidates,
                         ),
                     ),
+                    candidates = senate_candidates,
                 ),
             ),
-            candidates = (
-                CandidateData(
-                    candidate = "Alex",
-                    party = "DEM",
-                    votes = 15000
-                ),
-                CandidateData(
-                    candidate = "Felix",
-                    party = "REP",
-                    votes = 18000
-                ),
-            ),
+            candidates = senate_candidates,
         ),
     )
 
@@ -98,3 +68,44 @@ def mock_ncsbe_instance(mock_election_data):
         ncsbe = NCSBE('2024-11-05')
         ncsbe.initialize()
         return ncsbe
+
+
+def make_tsv_row(county, precinct, contest_name, choice, party, total_votes, contest_group_id=1):
+    """Builds one raw TSV line whose vote methods add up to `total_votes`."""
+    early = total_votes // 2
+    return make_row(county, precinct, contest_name, choice, party, total_votes - early, early, contest_group_id=contest_group_id)
+
+class MockResponse:
+    """A stand-in for `requests.Response` serving a fixed body."""
+
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = { "Content-Type": "application/x-zip-compressed", **(headers or {}) }
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+@pytest.fixture(scope="session")
+def mock_results_rows():
+    return [
+        make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 100050),
+        make_tsv_row("Orange", "1", "US PRESIDENT", "Mark", "REP", 100000),
+        make_tsv_row("Orange", "1", "US PRESIDENT", "Alex", "DEM", 1000),
+        make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 15000, contest_group_id=2),
+        make_tsv_row("Wake", "2", "US SENATE", "Felix", "REP", 18000, contest_group_id=2),
+    ]
+
+@pytest.fixture(scope="session")
+def mock_results_zip(mock_results_rows):
+    return make_results_zip(mock_results_rows)
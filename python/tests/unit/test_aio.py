@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from unittest.mock import patch
+from ncsbe_lib.aio import AsyncCollector, AsyncNCSBE, load_elections, refresh_elections
+from ncsbe_lib.collector import Collector
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+def test_async_initialize_and_refresh(mock_results_zip, mock_election_data):
+    async def run():
+        ncsbe = AsyncNCSBE("2024-11-05")
+        await ncsbe.initialize()
+        changed = await ncsbe.refresh()
+        diff = await ncsbe.refresh_with_diff()
+        return ncsbe, changed, diff
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe, changed, diff = asyncio.run(run())
+
+    assert tuple(ncsbe.get_dataset()) == mock_election_data
+    assert changed is False
+    assert not diff
+    assert ncsbe.get_contest_winner("US_SENATE").candidate == "Felix"
+
+def test_load_elections_is_concurrent_and_bounded(mock_results_zip):
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def get(url, **kwargs):
+        with lock:
+            in_flight.append(url)
+            peak.append(len(in_flight))
+        threading.Event().wait(0.05)
+        with lock:
+            in_flight.remove(url)
+        return MockResponse(mock_results_zip)
+
+    dates = ["2024-03-05", "2024-05-14", "2024-11-05", "2022-11-08"]
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=get):
+        elections = asyncio.run(load_elections(dates, max_concurrency=2))
+        changed = asyncio.run(refresh_elections(elections.values(), max_concurrency=2))
+
+    assert list(elections) == dates
+    assert all(election.has_contest("US_PRESIDENT") for election in elections.values())
+    assert changed == [False] * 4
+    assert max(peak) == 2
+
+def test_async_refresh_work_runs_off_the_event_loop(mock_results_zip):
+    with patch.object(Collector, "__init__", autospec=True, side_effect=Collector.__init__) as init:
+        ncsbe = AsyncNCSBE("2024-11-05")
+    assert init.call_count == 1 and isinstance(ncsbe._collector, AsyncCollector)
+
+    threads = []
+    def set_dataset(self, dataset):
+        threads.append(threading.current_thread())
+        return set_dataset.original(self, dataset)
+    set_dataset.original = NCSBE._set_dataset
+
+    async def run():
+        await ncsbe.initialize()
+        rows = [make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 16000, 2)]
+        with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(make_results_zip(rows))):
+            diff = await ncsbe.refresh_with_diff()
+        return threading.current_thread(), diff
+
+    with patch.object(NCSBE, "_set_dataset", set_dataset), \
+            patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        loop_thread, diff = asyncio.run(run())
+
+    assert len(threads) == 2 and loop_thread not in threads
+    assert list(diff.removed) == ["US_PRESIDENT"]
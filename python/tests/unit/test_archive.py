@@ -0,0 +1,68 @@
+import sys
+import pytest
+from ncsbe_lib.archive import ElectionArchive, encode_archive, write_archive
+from ncsbe_lib.ncsbe import NCSBE
+
+@pytest.fixture
+def archive(tmp_path, mock_election_data):
+    path = str(tmp_path / "2024-11-05.ncsbe")
+    write_archive(path, mock_election_data, "2024-11-05")
+    with ElectionArchive(path) as archive:
+        yield archive
+
+def test_archive_round_trip(archive, mock_election_data):
+    assert archive.election_date == "2024-11-05"
+    assert archive.list_contests() == ["US_PRESIDENT", "US_SENATE"]
+    assert tuple(archive.get_contest(c.contest_name) for c in mock_election_data) == mock_election_data
+    assert archive.get_county_results("US_SENATE", "Wake") == mock_election_data[1].counties[0]
+    assert archive.get_contest("US_HOUSE") is None
+    assert archive.get_county_results("US_SENATE", "Orange") is None
+
+def test_archive_queries(archive):
+    assert archive.has_contest("US_SENATE")
+    assert archive.list_counties("US_PRESIDENT") == ["Orange"]
+    assert archive.list_precincts("US_SENATE", "Wake") == ["2"]
+    assert archive.list_precincts("US_SENATE", "Orange") == []
+    assert archive.list_candidates("US_PRESIDENT") == ["John", "Mark", "Alex"]
+    assert archive.get_contest_vote_totals("US_SENATE") == { "Alex": 15000, "Felix": 18000 }
+    assert archive.get_total_votes_for_contest("US_PRESIDENT") == 201050
+    assert archive.get_candidate_vote_total("US_SENATE", "Felix") == 18000
+    assert archive.get_candidate_vote_percentage("US_SENATE", "Alex") == pytest.approx(15000 / 33000 * 100)
+    assert archive.get_contest_winner("US_PRESIDENT").candidate == "John"
+    assert archive.get_closest_race().contest_name == "US_PRESIDENT"
+    assert archive.get_contests_by_candidate("Alex") == ["US_PRESIDENT", "US_SENATE"]
+    assert archive.get_contests_by_candidate("Nobody") == []
+
+def test_archive_answers_like_ncsbe(archive, mock_ncsbe_instance):
+    for candidate in ("Alex", "John", "Nobody"):
+        assert archive.get_all_candidate_results(candidate) == mock_ncsbe_instance.get_all_candidate_results(candidate)
+        assert archive.has_candidate(candidate) == mock_ncsbe_instance.has_candidate(candidate)
+    assert archive.get_precinct_results("US_SENATE", "Wake", "2") == mock_ncsbe_instance.get_precinct_results("US_SENATE", "Wake", "2")
+    assert archive.get_precinct_results("US_SENATE", "Wake", "9") is None
+    assert archive.get_precinct_results("US_HOUSE", "Wake", "2") is None
+
+def test_archive_from_buffer_and_export(tmp_path, mock_ncsbe_instance, mock_election_data):
+    with ElectionArchive(encode_archive(mock_election_data)) as archive:
+        assert archive.election_date is None
+        assert archive.get_contest("US_SENATE") == mock_election_data[1]
+
+    path = str(tmp_path / "export.ncsbe")
+    mock_ncsbe_instance.export_archive(path)
+    with ElectionArchive(path) as archive:
+        assert archive.get_contest_vote_totals("US_PRESIDENT") == mock_ncsbe_instance.get_contest_vote_totals("US_PRESIDENT")
+
+    with pytest.raises(ValueError):
+        ElectionArchive(b"not an archive at all")
+
+def test_archive_rejects_truncated_and_foreign_buffers(mock_election_data):
+    data = encode_archive(mock_election_data)
+    for size in (0, 3, 16, 40, len(data) // 2, len(data) - 8):
+        with pytest.raises(ValueError):
+            ElectionArchive(data[:size])
+
+    # The header records the writer's byte order.
+    other = "big" if sys.byteorder == "little" else "little"
+    stored = f'"byteorder": "{sys.byteorder}"'
+    foreign = data.replace(stored.encode(), f'"byteorder": "{other}"'.ljust(len(stored)).encode())
+    with pytest.raises(ValueError, match="endian"):
+        ElectionArchive(foreign)
@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import patch
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse
+
+@pytest.fixture
+def ncsbe(mock_results_zip):
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+    return ncsbe
+
+def test_contest_summaries(ncsbe):
+    summaries = ncsbe.get_contest_summaries(["US_SENATE", "NOT_A_CONTEST"], counties=True)
+    assert list(summaries) == ["US_SENATE"]
+
+    summary = summaries["US_SENATE"]
+    assert summary.contest == ncsbe.get_contest("US_SENATE")
+    assert summary.stats == ncsbe.get_contest_stats("US_SENATE")
+    assert summary.counties == { "Wake": ncsbe.get_county_results("US_SENATE", "Wake") }
+
+    everything = ncsbe.get_contest_summaries()
+    assert list(everything) == ncsbe.list_contests()
+    assert everything["US_PRESIDENT"].counties == {}
+
+def test_winners_and_percentages_match_single_queries(ncsbe):
+    assert ncsbe.get_contest_winners() == { name: ncsbe.get_contest_winner(name) for name in ncsbe.list_contests() }
+    assert ncsbe.get_contest_winners(["NOT_A_CONTEST"]) == { "NOT_A_CONTEST": None }
+
+    pairs = [("US_SENATE", "Felix"), ("US_PRESIDENT", "John"), ("US_SENATE", "Nobody"), ("NOT_A_CONTEST", "John")]
+    assert ncsbe.get_vote_percentages(pairs) == [ncsbe.get_candidate_vote_percentage(*pair) for pair in pairs]
+
+def test_batch_queries_before_initialize():
+    ncsbe = NCSBE("2024-11-05")
+    assert ncsbe.get_contest_summaries() == {}
+    assert ncsbe.get_vote_percentages([("US_SENATE", "Felix")]) == [0]
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+from benchmarks.decode import run as compare_decoders
+from benchmarks.memory import run as measure_memory
+from benchmarks.run import compare
+from benchmarks.synthetic import Scale, make_results_zip
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse
+
+def test_synthetic_results_file():
+    scale = Scale(counties=5, precincts=20, contests=12)
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(make_results_zip(scale))):
+        ncsbe.initialize()
+
+    assert len(ncsbe.list_contests()) == 12
+    statewide = ncsbe.list_contests()[0]
+    assert len(ncsbe.list_counties(statewide)) == 5
+    # Four real precincts plus the three non-geographic reporting units.
+    assert len(ncsbe.list_precincts(statewide, "COUNTY 001")) == 7
+    assert make_results_zip(scale) == make_results_zip(scale)
+
+def test_compare_reports_regressions():
+    baseline = { "stages": { "parse": { "seconds": 1.0 } }, "queries": { "get_contest": { "microseconds": 2.0 } } }
+    result = { "stages": { "parse": { "seconds": 1.5 } }, "queries": { "get_contest": { "microseconds": 2.1 } } }
+    assert compare(result, baseline, 0.2) == ["stages.parse: 1 -> 1.5 seconds (+50%)"]
+
+def test_memory_benchmark():
+    result = measure_memory(Scale(counties=2, precincts=6, contests=4))
+    assert result["dataset"]["objects"]["ContestData"] == 4
+    assert result["dataset"]["retained_bytes"] > 0
+    assert result["rows"]["bytes_per_row"] > 0
+    assert "baseline" not in result
+
+    baseline = measure_memory(Scale(counties=2, precincts=6, contests=4), baseline=True)["baseline"]
+    assert 0 < baseline["slotted_bytes"] < baseline["plain_bytes"]
+    assert baseline["ratio"] > 1
+
+def test_decode_benchmark():
+    result = compare_decoders(Scale(counties=2, precincts=6, contests=4), repeat=1)
+    assert {"dict_reader", "csv_reader", "split"} <= set(result["decoders"])
+    assert result["decoders"]["dict_reader"]["speedup"] == 1
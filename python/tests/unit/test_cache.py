@@ -0,0 +1,73 @@
+import os
+import pytest
+from unittest.mock import patch
+from ncsbe_lib.cache import SnapshotCache, main
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+HEADERS = { "ETag": '"v1"', "Last-Modified": "Tue, 05 Nov 2024 23:00:00 GMT" }
+
+@pytest.fixture
+def cache(tmp_path):
+    return SnapshotCache(str(tmp_path))
+
+def test_snapshot_round_trip(cache, mock_results_zip, mock_election_data):
+    ncsbe = NCSBE("2024-11-05", cache=cache)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip, headers=HEADERS)):
+        ncsbe.initialize()
+
+    snapshot = cache.load("2024-11-05")
+    assert snapshot is not None
+    assert snapshot.dataset == mock_election_data
+    assert snapshot.source.etag == '"v1"'
+    assert snapshot.digests == ncsbe._index.digests
+    assert cache.load("2024-11-05", snapshot.source) is not None
+    assert cache.load("2022-11-08") is None
+
+def test_initialize_from_snapshot(cache, mock_results_zip, mock_election_data):
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip, headers=HEADERS)):
+        NCSBE("2024-11-05", cache=cache).initialize()
+
+    # A fresh instance serves the snapshot and only revalidates it.
+    ncsbe = NCSBE("2024-11-05", cache=cache)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(b"", status_code=304)) as get:
+        ncsbe.initialize()
+
+    assert get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert tuple(ncsbe.get_dataset()) == mock_election_data
+    assert ncsbe.get_contest_winner("US_SENATE").candidate == "Felix"
+
+    # The snapshot is kept when the revalidation request fails.
+    ncsbe = NCSBE("2024-11-05", cache=cache)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(b"", headers={ "Content-Type": "text/html" })):
+        ncsbe.initialize()
+    assert tuple(ncsbe.get_dataset()) == mock_election_data
+
+def test_snapshot_replaced_on_change(cache, mock_results_zip, mock_results_rows):
+    ncsbe = NCSBE("2024-11-05", cache=cache)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip, headers=HEADERS)):
+        ncsbe.initialize()
+
+    changed_zip = make_results_zip(mock_results_rows + [make_tsv_row("Wake", "3", "US SENATE", "Felix", "REP", 10, 2)])
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(changed_zip, headers={ "ETag": '"v2"' })):
+        assert ncsbe.refresh() is True
+
+    assert len(os.listdir(cache.directory)) == 1
+    assert cache.load("2024-11-05").source.etag == '"v2"'
+
+def test_snapshot_eviction(tmp_path, mock_results_zip):
+    cache = SnapshotCache(str(tmp_path), max_bytes=1)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip, headers=HEADERS)):
+        ncsbe = NCSBE("2024-11-05", cache=cache)
+        ncsbe.initialize()
+
+    assert ncsbe.get_dataset() is not None
+    assert os.listdir(cache.directory) == []
+
+def test_warm(tmp_path, mock_results_zip):
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip, headers=HEADERS)):
+        assert main(["--dir", str(tmp_path), "--warm", "2024-11-05", "2024-03-05"]) == 0
+
+    cache = SnapshotCache(str(tmp_path))
+    assert cache.load("2024-11-05") is not None
+    assert cache.load("2024-03-05") is not None
@@ -0,0 +1,91 @@
+import threading
+from unittest.mock import patch
+from ncsbe_lib.catalog import ElectionCatalog, _CatalogIndex
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+# Alex runs for Senate in 2016 and 2020, and in a 2020 primary; John only in 2024.
+ELECTIONS = {
+    "2016-11-08": [
+        make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 900),
+        make_tsv_row("Wake", "2", "US SENATE", "Felix", "REP", 1000),
+    ],
+    "2020-03-03": [
+        make_tsv_row("Orange", "1", "US SENATE", "Alex", "DEM", 500),
+        make_tsv_row("Orange", "1", "US SENATE", "Sam", "DEM", 400),
+    ],
+    "2020-11-03": [
+        make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 2000),
+        make_tsv_row("Wake", "2", "US SENATE", "Felix", "REP", 1500),
+        make_tsv_row("Orange", "1", "NC GOVERNOR", "Alex", "DEM", 30),
+    ],
+    "2024-11-05": [
+        make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 100),
+    ],
+}
+
+def serve(elections, lock=None, in_flight=None, peak=None):
+    def get(url, **kwargs):
+        if lock is not None:
+            with lock:
+                in_flight.append(url)
+                peak.append(len(in_flight))
+            threading.Event().wait(0.05)
+            with lock:
+                in_flight.remove(url)
+        date = next(date for date in elections if date.replace("-", "") in url)
+        return MockResponse(make_results_zip(elections[date]))
+    return get
+
+def test_catalog_loads_concurrently_and_answers_across_elections():
+    lock, in_flight, peak = threading.Lock(), [], []
+    catalog = ElectionCatalog(reversed(list(ELECTIONS)), max_concurrency=2)
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=serve(ELECTIONS, lock, in_flight, peak)):
+        assert catalog.load() == { date: True for date in ELECTIONS }
+    assert max(peak) == 2
+    assert catalog.election_dates == list(ELECTIONS) and len(catalog) == 4 and "2016-11-08" in catalog
+
+    contests = catalog.get_contests_by_candidate("Alex")
+    assert [(date, contest.contest_name) for date, contest in contests] == [
+        ("2016-11-08", "US_SENATE"), ("2020-03-03", "US_SENATE"), ("2020-11-03", "US_SENATE"), ("2020-11-03", "NC_GOVERNOR"),
+    ]
+    assert contests[0][1] is catalog.get("2016-11-08").get_contest("US_SENATE")
+    assert [date for date, _ in catalog.get_contests_by_candidate("Alex", since="2020-03-04")] == ["2020-11-03"] * 2
+    # Partial dates cover the whole year or month.
+    assert [date for date, _ in catalog.get_contests_by_candidate("Alex", since="2017", until="2020-03")] == ["2020-03-03"]
+    assert catalog.get_elections_by_candidate("Alex", since="2020") == ["2020-03-03", "2020-11-03"]
+    assert [(date, result.votes) for date, result in catalog.get_all_candidate_results("Felix")] == [
+        ("2016-11-08", 1000), ("2020-11-03", 1500),
+    ]
+    assert [date for date, _ in catalog.get_contest_history("US_SENATE", until="2020")] == list(ELECTIONS)[:3]
+    assert catalog.get_contests_by_candidate("Nobody") == [] and not catalog.has_candidate("Nobody")
+    assert sorted(catalog.list_candidates()) == ["Alex", "Felix", "John", "Sam"]
+
+    # Strings are interned across elections, not just within one.
+    first = catalog.get("2016-11-08").get_candidate_info("US_SENATE", "Alex")
+    second = catalog.get("2020-11-03").get_candidate_info("US_SENATE", "Alex")
+    assert first.candidate is second.candidate and first.party is second.party
+
+def test_catalog_follows_refreshes_and_reports_failures():
+    elections = { date: ELECTIONS[date] for date in ("2016-11-08", "2024-11-05") }
+    catalog = ElectionCatalog(elections)
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=serve(elections)):
+        catalog.load()
+    assert catalog.get_elections_by_candidate("Alex") == ["2016-11-08"]
+
+    # A refresh of one election, e.g. by its own auto-refresher, shows up in the catalog's indexes.
+    before = catalog._current_index()
+    updated = { **elections, "2024-11-05": elections["2024-11-05"] + [make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 70)] }
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=serve(updated)):
+        assert catalog.get("2024-11-05").refresh()
+        assert catalog.refresh() == { "2016-11-08": False, "2024-11-05": False }
+    assert catalog.get_elections_by_candidate("Alex") == ["2016-11-08", "2024-11-05"]
+
+    # Only the refreshed election is re-indexed, and the result matches an index built from scratch.
+    after = catalog._current_index()
+    assert after.candidates["Felix"] is before.candidates["Felix"]
+    rebuilt = _CatalogIndex().update(after.indexes)
+    assert after.candidates == rebuilt.candidates and after.contests == rebuilt.contests
+
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=ConnectionError("unreachable")):
+        assert catalog.load(["2012-11-06"]) == { "2012-11-06": False }
+    assert "2012-11-06" in catalog and catalog.get_elections_by_candidate("Alex") == ["2016-11-08", "2024-11-05"]
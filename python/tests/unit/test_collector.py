@@ -0,0 +1,256 @@
+import pytest
+import requests
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from requests.adapters import BaseAdapter
+from unittest.mock import patch
+from ncsbe_lib.collector import Collector, create_session
+from ncsbe_lib.filters import RowFilter
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import TSV_HEADER, MockResponse, make_results_zip, make_tsv_row
+
+URL = "https://s3.amazonaws.com/dl.ncsbe.gov/ENRS/2024_11_05/results_pct_20241105.zip"
+
+def test_collect(mock_results_zip, mock_election_data):
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        dataset = Collector(URL).collect()
+
+    assert tuple(dataset) == mock_election_data
+
+def test_collect_stream(mock_results_zip, mock_election_data):
+    with patch.object(Collector, "CHUNK_SIZE", 64), \
+         patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)) as get:
+        dataset = Collector(URL, stream=True).collect()
+
+    assert get.call_args.kwargs["stream"] is True
+    assert tuple(dataset) == mock_election_data
+
+def test_collect_unexpected_content_type(mock_results_zip):
+    response = MockResponse(mock_results_zip, headers={ "Content-Type": "text/html" })
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=response):
+        assert Collector(URL).collect() is None
+        assert Collector(URL, stream=True).collect() is None
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_collect_records_the_failure(mock_results_zip, stream):
+    collector = Collector(URL, stream=stream)
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=requests.exceptions.ConnectionError("down")):
+        assert collector.collect() is None
+    assert isinstance(collector.last_error, requests.exceptions.ConnectionError)
+
+    response = MockResponse(mock_results_zip, headers={ "Content-Type": "text/html" })
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=response):
+        assert collector.collect() is None
+    assert "text/html" in str(collector.last_error)
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_collect_not_modified(mock_results_zip, stream):
+    headers = { "ETag": '"abc"', "Last-Modified": "Tue, 05 Nov 2024 23:00:00 GMT" }
+    collector = Collector(URL, stream=stream)
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip, headers=headers)):
+        dataset = collector.collect()
+    assert collector.modified is True
+    assert collector.source.etag == '"abc"'
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(b"", status_code=304)) as get:
+        assert collector.collect() is dataset
+    assert collector.modified is False
+    assert get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 05 Nov 2024 23:00:00 GMT",
+    }
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_collect_identical_content(mock_results_zip, mock_results_rows, stream):
+    collector = Collector(URL, stream=stream)
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        dataset = collector.collect()
+        assert collector.collect() is dataset
+        assert collector.modified is False
+
+    changed_zip = make_results_zip(mock_results_rows + [make_tsv_row("Wake", "3", "US SENATE", "Felix", "REP", 10, 2)])
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(changed_zip)):
+        changed = collector.collect()
+    assert collector.modified is True
+    assert changed is not dataset
+    assert changed != dataset
+
+def test_refresh_reports_changes(mock_results_zip):
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+        dataset = ncsbe.get_dataset()
+        assert ncsbe.refresh() is False
+
+    assert ncsbe.get_dataset() is dataset
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_collect_parallel(mock_results_rows, columnar):
+    # Enough precincts that the file splits into several chunks, with precincts repeated across them.
+    rows = []
+    for precinct in range(40):
+        for county in ("Orange", "Wake"):
+            for row in mock_results_rows:
+                contest_group_id, contest, choice, party, votes = row[3], row[5], row[6], row[7], int(row[13])
+                rows.append(make_tsv_row(county, str(precinct % 7), contest, choice, party, votes + precinct, contest_group_id))
+    results_zip = make_results_zip(rows)
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(results_zip)):
+        serial = Collector(URL, columnar=columnar)
+        expected = serial.collect()
+
+        with patch.object(Collector, "PARALLEL_MIN_SIZE", 0):
+            parallel = Collector(URL, columnar=columnar, workers=3)
+            dataset = parallel.collect()
+
+    assert dataset == expected
+    assert parallel.digests == serial.digests
+    if columnar:
+        assert parallel.columnar.vote_totals() == serial.columnar.vote_totals()
+        assert list(parallel.columnar.choice) == list(serial.columnar.choice)
+
+    # Strings from different chunks are re-interned into the collector's table.
+    strings = parallel._strings
+    for contest in dataset:
+        assert strings[contest.contest_name] is contest.contest_name
+        for county in contest.counties:
+            assert strings[county.county] is county.county
+            for precinct in county.precincts:
+                assert strings[precinct.precinct] is precinct.precinct
+                assert all(strings[candidate.candidate] is candidate.candidate for candidate in precinct.candidates)
+    if columnar:
+        assert all(strings[choice] is choice for choice in parallel.columnar.choices.values)
+
+def test_collect_parallel_quoted_line_breaks(mock_results_rows):
+    # A quoted precinct name spanning two lines, in every chunk the file would be cut into.
+    rows = [
+        [f'"{field}"' for field in make_tsv_row("Wake", f"{precinct}\nEAST", "US SENATE", "Alex", "DEM", precinct)]
+        for precinct in range(40)
+    ]
+    results_zip = make_results_zip(rows)
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(results_zip)):
+        expected = Collector(URL).collect()
+        with patch.object(Collector, "PARALLEL_MIN_SIZE", 0):
+            dataset = Collector(URL, workers=3).collect()
+
+    assert dataset == expected
+    assert len(dataset[0].counties[0].precincts) == 40
+    assert dataset[0].counties[0].precincts[0].precinct == "0\nEAST"
+
+def test_collector_rejects_parallel_stream():
+    with pytest.raises(ValueError):
+        Collector(URL, stream=True, workers=2)
+    with pytest.raises(ValueError):
+        Collector(URL, workers=0)
+
+def test_parse_tsv_layouts(mock_results_rows, mock_election_data):
+    expected = Collector(URL)._parse_tsv_data("\n".join("\t".join(row) for row in [TSV_HEADER] + mock_results_rows))
+
+    # Windows line endings, and quoted fields that go through `csv.reader`.
+    crlf = "\r\n".join("\t".join(row) for row in [TSV_HEADER] + mock_results_rows) + "\r\n"
+    quoted = "\n".join("\t".join(f'"{field}"' for field in row) for row in [TSV_HEADER] + mock_results_rows) + "\n\n"
+    # Columns in another order, plus one the library does not use.
+    order = [14, 0, 5, 1, 2, 3, 4, 6, 7, 8, 9, 10, 11, 12, 13]
+    reordered = "\n".join(
+        "\t".join([row[i] for i in order] + ["x"]) for row in [TSV_HEADER] + mock_results_rows
+    )
+    for tsv_data in (crlf, quoted, reordered):
+        assert Collector(URL)._parse_tsv_data(tsv_data) == expected
+
+    assert Collector(URL)._parse_tsv_data("") == []
+    with pytest.raises(ValueError, match="Real Precinct"):
+        Collector(URL)._parse_tsv_data("\t".join(TSV_HEADER[:-1]))
+
+def test_collector_engines():
+    with pytest.raises(ValueError):
+        Collector(URL, engine="pandas")
+    with patch("ncsbe_lib.collector.pyarrow", None), pytest.raises(ValueError):
+        Collector(URL, engine="pyarrow")
+
+def test_pyarrow_engine_matches_python_engine(mock_results_rows):
+    pytest.importorskip("pyarrow")
+    rows = mock_results_rows + [make_tsv_row("Wake", "3", "NC GOVERNOR", "Josh", "", 30, contest_group_id=3)]
+    tsv_data = Collector(URL)._extract_tsv_files(BytesIO(make_results_zip(rows)))
+
+    for filters in (None, RowFilter(contest_group_ids=[2, 3]), RowFilter(counties=["wake"], contest_types=["S"])):
+        expected = Collector(URL, filters=filters)._parse_tsv_data(tsv_data)
+        assert Collector(URL, filters=filters, engine="pyarrow")._parse_tsv_data(tsv_data) == expected
+        assert expected
+
+def test_collector_parse_caches(mock_results_zip):
+    collector = Collector(URL)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        dataset = collector.collect()
+
+    info = collector.cache_info()
+    assert info.normalize_misses == 2
+    assert info.normalize_hits == 3
+
+    # Every row's county, date, precinct, type, choice and party goes through the intern table.
+    assert info.intern_hits + info.intern_misses - info.normalize_misses == 5 * 6
+    assert info.interned_strings == info.intern_misses
+
+    # Alex's name is one shared object across both contests.
+    president, senate = dataset
+    assert president.candidates[2].candidate is senate.candidates[0].candidate
+
+def test_collect_uses_session_and_timeouts(mock_results_zip, mock_election_data):
+    session = create_session()
+    collector = Collector(URL, session=session, timeout=(1.5, 30))
+    with patch.object(session, "get", return_value=MockResponse(mock_results_zip)) as get:
+        assert tuple(collector.collect()) == mock_election_data
+        collector.collect()
+
+    assert get.call_count == 2
+    assert get.call_args.kwargs["timeout"] == (1.5, 30)
+
+def test_collect_retries_local_server(mock_results_zip, mock_election_data):
+    # A local stand-in for S3 that fails twice before serving the file.
+    answers = [503, 503, 200]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = answers.pop(0)
+            body = mock_results_zip if status == 200 else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-zip-compressed")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        collector = Collector(f"http://127.0.0.1:{server.server_port}/results.zip", session=create_session(backoff_factor=0))
+        assert tuple(collector.collect()) == mock_election_data
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert answers == []
+
+def test_collect_with_transport(mock_results_zip, mock_election_data):
+    class LocalTransport(BaseAdapter):
+        def send(self, request, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/x-zip-compressed"
+            response.raw = BytesIO(mock_results_zip)
+            response.url = request.url
+            response.request = request
+            return response
+
+        def close(self):
+            pass
+
+    ncsbe = NCSBE("2024-11-05", session=create_session(transport=LocalTransport()))
+    ncsbe.initialize()
+    assert tuple(ncsbe.get_dataset()) == mock_election_data
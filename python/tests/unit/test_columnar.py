@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import patch
+from ncsbe_lib.columnar import ColumnarStore
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse
+
+@pytest.fixture
+def columnar_ncsbe_instance(mock_results_zip):
+    ncsbe = NCSBE("2024-11-05", columnar=True)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+    return ncsbe
+
+def test_columnar_store_encoding(columnar_ncsbe_instance):
+    store = columnar_ncsbe_instance._index.columnar
+    assert store is not None
+    assert len(store) == 5
+    assert store.contests.values == ["US_PRESIDENT", "US_SENATE"]
+    assert store.choices.values == ["John", "Mark", "Alex", "Felix"]
+    assert list(store.choice) == [0, 1, 2, 2, 3]
+
+def test_columnar_vote_totals(columnar_ncsbe_instance):
+    expected = {
+        "US_PRESIDENT": { "John": 100050, "Mark": 100000, "Alex": 1000 },
+        "US_SENATE": { "Alex": 15000, "Felix": 18000 },
+    }
+    store = columnar_ncsbe_instance._index.columnar
+    assert store.vote_totals() == expected
+
+    # The pure-Python reduction must agree with the vectorized one.
+    assert store._group_totals_python() == expected
+    with patch("ncsbe_lib.columnar.np", None):
+        assert ColumnarStore.from_rows([]).vote_totals() == {}
+
+def test_columnar_queries(columnar_ncsbe_instance, mock_ncsbe_instance):
+    for contest in ("US_PRESIDENT", "US_SENATE", "NC_GOVERNOR"):
+        assert columnar_ncsbe_instance.get_contest_vote_totals(contest) == mock_ncsbe_instance.get_contest_vote_totals(contest)
+        assert columnar_ncsbe_instance.get_total_votes_for_contest(contest) == mock_ncsbe_instance.get_total_votes_for_contest(contest)
+
+    assert columnar_ncsbe_instance.get_closest_race().contest_name == "US_PRESIDENT"
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+from ncsbe_lib.collector import Collector
+from ncsbe_lib.diff import digest_contest
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+URL = "https://s3.amazonaws.com/dl.ncsbe.gov/ENRS/2024_11_05/results_pct_20241105.zip"
+
+def test_collector_digests(mock_results_zip):
+    collector = Collector(URL)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        dataset = collector.collect()
+
+    assert set(collector.digests) == { "US_PRESIDENT", "US_SENATE" }
+    for contest in dataset:
+        assert collector.digests[contest.contest_name] == digest_contest(contest)
+
+def test_refresh_with_diff(mock_results_rows, mock_results_zip):
+    changed_rows = [
+        make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 100050),
+        make_tsv_row("Orange", "1", "US PRESIDENT", "Mark", "REP", 100000),
+        make_tsv_row("Orange", "1", "US PRESIDENT", "Alex", "DEM", 1000),
+        make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 15000, contest_group_id=2),
+        make_tsv_row("Wake", "2", "US SENATE", "Felix", "REP", 18500, contest_group_id=2),
+        make_tsv_row("Wake", "3", "US SENATE", "Felix", "REP", 20, contest_group_id=2),
+        make_tsv_row("Durham", "4", "US SENATE", "Alex", "DEM", 30, contest_group_id=2),
+        make_tsv_row("Wake", "2", "NC GOVERNOR", "Josh", "DEM", 500, contest_group_id=3),
+    ]
+
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+        assert not ncsbe.refresh_with_diff()
+    assert ncsbe.get_total_votes_for_contest("US_SENATE") == 33000
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(make_results_zip(changed_rows))):
+        diff = ncsbe.refresh_with_diff()
+
+    # Statistics are recomputed for the new dataset.
+    assert ncsbe.get_total_votes_for_contest("US_SENATE") == 33550
+    assert [contest.contest_name for contest in diff.added] == ["NC_GOVERNOR"]
+    assert diff.removed == ()
+    assert len(diff.changed) == 1
+
+    senate = diff.changed[0]
+    assert senate.contest.contest_name == "US_SENATE"
+    assert [(c.candidate, c.votes) for c in senate.candidates_changed] == [("Alex", 15030), ("Felix", 18520)]
+    assert [county.county for county in senate.counties_added] == ["Durham"]
+    assert senate.counties_removed == ()
+
+    wake = senate.counties_changed[0]
+    assert wake.county.county == "Wake"
+    assert [precinct.precinct for precinct in wake.precincts_added] == ["3"]
+    assert [precinct.precinct for precinct in wake.precincts_changed] == ["2"]
+
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        diff = ncsbe.refresh_with_diff()
+
+    assert diff.removed == ("NC_GOVERNOR",)
+    assert diff.changed[0].counties_removed == ("Durham",)
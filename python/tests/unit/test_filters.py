@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import patch
+from benchmarks.synthetic import Scale, make_results_zip as make_synthetic_zip
+from ncsbe_lib.cache import SnapshotCache
+from ncsbe_lib.collector import Collector
+from ncsbe_lib.filters import RowFilter
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse
+
+def load(body, **kwargs):
+    ncsbe = NCSBE("2024-11-05", **kwargs)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(body)):
+        ncsbe.initialize()
+    return ncsbe
+
+@pytest.mark.parametrize("filters, contests", [
+    (RowFilter(counties=["wake"]), ["US_SENATE"]),
+    (RowFilter(contests=["US PRESIDENT"]), ["US_PRESIDENT"]),
+    (RowFilter(contests=["US_PRESIDENT"], counties=["Wake"]), []),
+    (RowFilter(contest_pattern=r"^US_"), ["US_PRESIDENT", "US_SENATE"]),
+    (RowFilter(contest_types=["C"]), []),
+    (RowFilter(contest_group_ids=[2]), ["US_SENATE"]),
+])
+def test_filters_select_rows(mock_results_zip, mock_election_data, filters, contests):
+    ncsbe = load(mock_results_zip, filters=filters)
+    assert ncsbe.list_contests() == contests
+    for contest in mock_election_data:
+        if contest.contest_name in contests:
+            assert ncsbe.get_contest(contest.contest_name) == contest
+
+@pytest.mark.parametrize("options", [{}, { "stream": True }, { "lazy": True }, { "incremental": True }, { "workers": 2 }])
+def test_filtered_load_matches_subset_of_full_load(options):
+    body = make_synthetic_zip(Scale(counties=4, precincts=16, contests=10))
+    full = load(body)
+    with patch.object(Collector, "PARALLEL_MIN_SIZE", 0):
+        orange = load(body, filters=RowFilter(counties=["County 002"]), **options)
+
+    assert orange._collector._rows_parsed < full._collector._rows_parsed
+    for contest in orange.list_contests():
+        assert orange.list_counties(contest) == ["COUNTY 002"]
+        assert orange.get_county_results(contest, "COUNTY 002") == full.get_county_results(contest, "COUNTY 002")
+
+def test_filtered_snapshots_are_kept_apart(tmp_path, mock_results_zip):
+    cache = SnapshotCache(str(tmp_path))
+    load(mock_results_zip, cache=cache, filters=RowFilter(counties=["Wake"]))
+
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=ConnectionError("offline")):
+        assert NCSBE("2024-11-05", cache=cache, filters=RowFilter(counties=["WAKE"]))._restore_snapshot()
+        assert not NCSBE("2024-11-05", cache=cache)._restore_snapshot()
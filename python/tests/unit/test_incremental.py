@@ -0,0 +1,124 @@
+import random
+from unittest.mock import patch
+from benchmarks.synthetic import Scale, iter_rows
+from ncsbe_lib.collector import Collector
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+URL = "https://s3.amazonaws.com/dl.ncsbe.gov/ENRS/2024_11_05/results_pct_20241105.zip"
+
+def collect(collector, rows):
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(make_results_zip(rows))):
+        return collector.collect()
+
+def assert_matches_full_rebuild(incremental, rows):
+    full = Collector(URL)
+    assert collect(incremental, rows) == collect(full, rows)
+    assert incremental.digests == full.digests
+
+def test_incremental_matches_full_rebuild(mock_results_rows):
+    incremental = Collector(URL, incremental=True)
+    versions = [
+        mock_results_rows,
+        # A precinct reports more votes.
+        mock_results_rows[:3] + [make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 16000, 2), mock_results_rows[4]],
+        # A new precinct, county and contest report.
+        mock_results_rows + [
+            make_tsv_row("Durham", "3", "US SENATE", "Alex", "DEM", 10, 2),
+            make_tsv_row("Wake", "4", "US SENATE", "Felix", "REP", 20, 2),
+            make_tsv_row("Wake", "4", "NC GOVERNOR", "Josh", "DEM", 30, 3),
+        ],
+        # A county and a contest disappear again, and a candidate drops out of a precinct.
+        mock_results_rows[:2] + mock_results_rows[3:4],
+    ]
+
+    for rows in versions:
+        assert_matches_full_rebuild(incremental, rows)
+
+def test_incremental_reuses_unchanged_objects(mock_results_rows):
+    incremental = Collector(URL, incremental=True)
+    previous = collect(incremental, mock_results_rows)
+    assert incremental._aggregator.precincts_rebuilt == 2
+
+    rows = mock_results_rows[:3] + [make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", 16000, 2), mock_results_rows[4]]
+    current = collect(incremental, rows)
+
+    assert incremental._aggregator.precincts_rebuilt == 1
+    assert incremental._aggregator.precincts_reused == 1
+    assert current[0] is previous[0]
+    assert current[1] is not previous[1]
+    assert current[1].candidates[0].votes == 16000
+    assert current[1].candidates[1] == previous[1].candidates[1]
+
+def test_incremental_synthetic_refreshes():
+    rows = list(iter_rows(Scale(counties=6, precincts=30, contests=15)))
+    rng = random.Random(7)
+    incremental = Collector(URL, incremental=True)
+    assert_matches_full_rebuild(incremental, rows)
+
+    for _ in range(3):
+        # A few precincts report new totals, and a few rows go missing.
+        for i in rng.sample(range(len(rows)), 10):
+            row = list(rows[i])
+            row[9] = str(int(row[9]) + 7)
+            row[13] = str(int(row[13]) + 7)
+            rows[i] = tuple(row)
+        for i in sorted(rng.sample(range(len(rows)), 3), reverse=True):
+            del rows[i]
+
+        assert_matches_full_rebuild(incremental, rows)
+        assert incremental._aggregator.precincts_rebuilt <= 13
+
+def test_incremental_follows_candidate_order():
+    incremental = Collector(URL, incremental=True)
+    versions = [
+        # Mark first appears in a later precinct...
+        [
+            make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 10),
+            make_tsv_row("Orange", "2", "US PRESIDENT", "Mark", "REP", 20),
+        ],
+        # ...then in an earlier one, ahead of John.
+        [
+            make_tsv_row("Orange", "1", "US PRESIDENT", "Mark", "REP", 5),
+            make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 10),
+            make_tsv_row("Orange", "2", "US PRESIDENT", "Mark", "REP", 20),
+        ],
+        # The precinct's rows swap back without changing any total.
+        [
+            make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 10),
+            make_tsv_row("Orange", "1", "US PRESIDENT", "Mark", "REP", 5),
+            make_tsv_row("Orange", "2", "US PRESIDENT", "Mark", "REP", 20),
+        ],
+        # Rows of two precincts interleave.
+        [
+            make_tsv_row("Orange", "1", "US PRESIDENT", "John", "DEM", 10),
+            make_tsv_row("Orange", "2", "US PRESIDENT", "Alex", "DEM", 1),
+            make_tsv_row("Orange", "1", "US PRESIDENT", "Mark", "REP", 5),
+        ],
+    ]
+
+    for rows in versions:
+        assert_matches_full_rebuild(incremental, rows)
+
+def test_incremental_follows_candidate_party():
+    incremental = Collector(URL, incremental=True)
+    versions = [
+        [
+            make_tsv_row("Orange", "1", "US SENATE", "X", "DEM", 10),
+            make_tsv_row("Orange", "2", "US SENATE", "X", "DEM", 20),
+        ],
+        # The row that set the party changes party...
+        [
+            make_tsv_row("Orange", "1", "US SENATE", "X", "REP", 10),
+            make_tsv_row("Orange", "2", "US SENATE", "X", "DEM", 20),
+        ],
+        # ...and is then removed while another remains.
+        [
+            make_tsv_row("Orange", "2", "US SENATE", "X", "DEM", 20),
+        ],
+    ]
+
+    parties = []
+    for rows in versions:
+        assert_matches_full_rebuild(incremental, rows)
+        parties.append(incremental.dataset[0].candidates[0].party)
+    assert parties == ["DEM", "REP", "DEM"]
@@ -0,0 +1,59 @@
+import pickle
+from unittest.mock import patch
+from benchmarks.synthetic import Scale, make_results_zip as make_synthetic_zip
+from ncsbe_lib.cache import SnapshotCache
+from ncsbe_lib.lazy import LazyContestData
+from ncsbe_lib.ncsbe import NCSBE
+from ncsbe_lib.types import ContestData
+from .conftest import MockResponse
+
+def load(body, **kwargs):
+    ncsbe = NCSBE("2024-11-05", **kwargs)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(body)):
+        ncsbe.initialize()
+    return ncsbe
+
+def test_lazy_contests_materialize_on_access(mock_results_zip, mock_election_data):
+    ncsbe = load(mock_results_zip, lazy=True)
+    president, senate = ncsbe.get_dataset()
+    assert isinstance(president, LazyContestData)
+
+    # Candidate totals and statistics never touch the counties.
+    assert ncsbe.get_contest_winner("US_SENATE").candidate == "Felix"
+    assert ncsbe.get_contest_vote_totals("US_PRESIDENT") == { "John": 100050, "Mark": 100000, "Alex": 1000 }
+    assert not president.materialized and not senate.materialized
+
+    assert ncsbe.get_county_results("US_SENATE", "Wake") == mock_election_data[1].counties[0]
+    assert senate.materialized and not president.materialized
+    assert senate.counties is senate.counties
+
+    assert tuple(ncsbe.get_dataset()) == mock_election_data
+    assert mock_election_data == tuple(ncsbe.get_dataset())
+    assert hash(president) == hash(mock_election_data[0])
+
+    restored = pickle.loads(pickle.dumps(president))
+    assert type(restored) is ContestData and restored == president
+
+def test_lazy_matches_eager_dataset():
+    body = make_synthetic_zip(Scale(counties=4, precincts=16, contests=10))
+    eager, lazy = load(body), load(body, lazy=True)
+
+    assert lazy.get_dataset() == eager.get_dataset()
+    assert lazy._index.digests == eager._index.digests
+    contest = eager.list_contests()[0]
+    assert lazy.get_precinct_results(contest, "COUNTY 002", "ONE STOP") == eager.get_precinct_results(contest, "COUNTY 002", "ONE STOP")
+
+def test_lazy_snapshots_stay_lazy(tmp_path, mock_results_zip, mock_election_data):
+    cache = SnapshotCache(str(tmp_path))
+    ncsbe = load(mock_results_zip, lazy=True, cache=cache)
+    # Saving the snapshot did not build any contest's counties.
+    assert not any(contest.materialized for contest in ncsbe.get_dataset())
+
+    snapshot = cache.load("2024-11-05")
+    assert snapshot.digests is None
+    assert all(isinstance(contest, LazyContestData) and not contest.materialized for contest in snapshot.dataset)
+    assert snapshot.dataset == mock_election_data
+
+    restored = load(mock_results_zip, lazy=True, cache=cache)
+    assert not any(contest.materialized for contest in restored.get_dataset())
+    assert restored.get_county_results("US_SENATE", "Wake") == mock_election_data[1].counties[0]
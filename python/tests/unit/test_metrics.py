@@ -0,0 +1,59 @@
+import json
+import pytest
+from unittest.mock import patch
+from ncsbe_lib.metrics import Metrics
+from ncsbe_lib.ncsbe import NCSBE
+from .conftest import MockResponse
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_refresh_metrics(mock_results_zip, stream):
+    metrics = Metrics()
+    ncsbe = NCSBE("2024-11-05", stream=stream, metrics=metrics)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+        ncsbe.refresh()
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=ConnectionError("unreachable")):
+        ncsbe.refresh()
+
+    assert metrics.counters["collections"] == 3
+    assert metrics.counters["not_modified"] == 1
+    assert metrics.counters["collect_failures"] == 1
+    assert metrics.counters["bytes_downloaded"] == 2 * len(mock_results_zip)
+    assert metrics.counters["rows_parsed"] == 5
+    assert metrics.counters["dataset_swaps"] == 1
+    assert metrics.gauges == { "last_rows": 5, "peak_rows": 5, "contests": 2 }
+
+    # Only `max_gauge` keeps the highest value.
+    metrics.max_gauge("peak_rows", 3)
+    metrics.set_gauge("last_rows", 3)
+    assert metrics.gauges["peak_rows"] == 5 and metrics.gauges["last_rows"] == 3
+
+    expected = {"fetch", "process", "collect", "index"} if stream else {"fetch", "extract", "parse", "format", "collect", "index"}
+    assert set(metrics.stages) == expected
+    assert metrics.stages["collect"].count == 3
+
+def test_query_metrics_and_callbacks(mock_results_zip):
+    events = []
+    metrics = Metrics(labels={ "election": "2024-11-05" })
+    metrics.subscribe(lambda kind, name, value: events.append((kind, name)))
+    ncsbe = NCSBE("2024-11-05", metrics=metrics)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+
+    assert ncsbe.get_contest_winner("US_SENATE").candidate == "Felix"
+    ncsbe.get_contest_winner("US_PRESIDENT")
+    assert metrics.queries["get_contest_winner"].count == 2
+    assert ("query", "get_contest_winner") in events
+    assert ("stage", "fetch") in events
+
+    # Uninstrumented instances keep the plain methods.
+    assert "get_contest_winner" not in vars(NCSBE("2024-11-05"))
+
+    text = metrics.to_prometheus()
+    assert '# TYPE ncsbe_rows_parsed_total counter' in text
+    assert 'ncsbe_rows_parsed_total{election="2024-11-05"} 5' in text
+    assert 'ncsbe_method_duration_seconds_count{election="2024-11-05",method="get_contest_winner"} 2' in text
+
+    data = json.loads(metrics.to_json())
+    assert data["labels"] == { "election": "2024-11-05" }
+    assert data["queries"]["get_contest_winner"]["count"] == 2
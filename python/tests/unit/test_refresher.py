@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from ncsbe_lib.aio import AsyncNCSBE
+from ncsbe_lib.ncsbe import NCSBE
+from ncsbe_lib.refresher import AutoRefresher, next_delay
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+def test_refresh_failure_keeps_dataset(mock_results_zip, mock_election_data):
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+    assert ncsbe.last_error is None
+
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=ConnectionError("unreachable")):
+        assert ncsbe.refresh() is False
+
+    assert isinstance(ncsbe.last_error, ConnectionError)
+    assert tuple(ncsbe.get_dataset()) == mock_election_data
+    assert ncsbe.get_contest_winner("US_SENATE").candidate == "Felix"
+
+def test_next_delay_backoff():
+    assert next_delay(10, 0, 0, 100) == 10
+    assert next_delay(10, 0, 1, 100) == 20
+    assert next_delay(10, 0, 3, 100) == 80
+    assert next_delay(10, 0, 50, 100) == 100
+    assert 9 <= next_delay(10, 0.1, 0, 100) <= 11
+
+def test_refresh_once_counts_failures(mock_results_zip, mock_results_rows):
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+
+    changes = []
+    refresher = AutoRefresher(ncsbe, interval=60, on_refresh=changes.append)
+    with patch("ncsbe_lib.collector.requests.Session.get", side_effect=ConnectionError("unreachable")):
+        assert refresher.refresh_once() is False
+        assert refresher.refresh_once() is False
+    assert refresher.failures == 2
+    assert changes == []
+
+    updated = make_results_zip(mock_results_rows + [make_tsv_row("Durham", "3", "US_SENATE", "Alex", "DEM", 10)])
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(updated)):
+        assert refresher.refresh_once() is True
+    assert refresher.failures == 0
+    assert refresher.last_success is not None
+    assert changes == [True]
+    assert "Durham" in ncsbe.list_counties("US_SENATE")
+
+def test_auto_refresh_thread(mock_results_zip):
+    ncsbe = NCSBE("2024-11-05")
+    refreshed = threading.Event()
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+        with ncsbe.start_auto_refresh(interval=0.01, on_refresh=lambda changed: refreshed.set()) as refresher:
+            assert refreshed.wait(5)
+            assert refresher.running
+
+    assert not refresher.running
+
+    with pytest.raises(ValueError):
+        AutoRefresher(ncsbe, interval=0)
+
+def test_restart_waits_for_the_stopped_thread():
+    release, entered = threading.Event(), threading.Event()
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    class SlowElection:
+        last_error = None
+
+        def refresh(self):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            entered.set()
+            release.wait(5)
+            with lock:
+                active[0] -= 1
+            return False
+
+    refresher = AutoRefresher(SlowElection(), interval=0.01, jitter=0)
+    refresher.start()
+    assert entered.wait(5)
+    # The refresh in progress outlives the timeout, so the thread is still running.
+    refresher.stop(timeout=0.01)
+    assert refresher.running
+
+    restart = threading.Thread(target=refresher.start)
+    restart.start()
+    restart.join(0.1)
+    assert restart.is_alive()
+
+    entered.clear()
+    release.set()
+    restart.join(5)
+    assert entered.wait(5)
+    refresher.stop(5)
+    assert peak[0] == 1 and not refresher.running
+
+def test_async_auto_refresh(mock_results_zip):
+    async def run():
+        ncsbe = AsyncNCSBE("2024-11-05")
+        refreshed = asyncio.Event()
+        with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+            await ncsbe.initialize()
+            task = asyncio.create_task(ncsbe.auto_refresh(interval=0.01, on_refresh=lambda changed: refreshed.set()))
+            await asyncio.wait_for(refreshed.wait(), 5)
+            task.cancel()
+        return ncsbe
+
+    assert asyncio.run(run()).get_dataset() is not None
+
+def test_async_instances_need_the_async_refresher():
+    ncsbe = AsyncNCSBE("2024-11-05")
+    with pytest.raises(TypeError, match="auto_refresh"):
+        ncsbe.start_auto_refresh(interval=0.01)
+    with pytest.raises(TypeError, match="auto_refresh"):
+        AutoRefresher(ncsbe, interval=0.01)
+
+def test_async_auto_refresh_survives_callback_errors(mock_results_zip):
+    calls = []
+    def on_refresh(changed):
+        calls.append(changed)
+        raise RuntimeError("callback failed")
+
+    async def run():
+        ncsbe = AsyncNCSBE("2024-11-05")
+        with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+            await ncsbe.initialize()
+            task = asyncio.create_task(ncsbe.auto_refresh(interval=0.01, jitter=0, on_refresh=on_refresh))
+            while len(calls) < 2 and not task.done():
+                await asyncio.sleep(0.01)
+            task.cancel()
+        return task
+
+    task = asyncio.run(run())
+    assert len(calls) >= 2 and task.cancelled()
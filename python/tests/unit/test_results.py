@@ -1,3 +1,6 @@
+import pytest
+from unittest.mock import patch
+
 def test_get_county_results(mock_ncsbe_instance, mock_election_data):
     results = mock_ncsbe_instance.get_county_results("US_PRESIDENT", "Orange")
     assert results is not None
@@ -61,3 +64,54 @@ def test_get_closest_race(mock_ncsbe_instance, mock_election_data):
         None
     )
     assert closest_race == expected_race
+
+def test_get_precinct_results(mock_ncsbe_instance, mock_election_data):
+    results = mock_ncsbe_instance.get_precinct_results("US_SENATE", "Wake", "2")
+    assert results is not None
+    assert results.precinct == "2"
+
+    expected_results = mock_election_data[1].counties[0].precincts[0]
+    assert results == expected_results
+
+    assert mock_ncsbe_instance.get_precinct_results("US_SENATE", "Orange", "2") is None
+    assert mock_ncsbe_instance.get_precinct_results("NC_GOVERNOR", "Wake", "2") is None
+
+def test_get_vote_method_totals(mock_ncsbe_instance):
+    assert mock_ncsbe_instance.get_vote_method_totals("US_SENATE") == {
+        "election_day": 16500,
+        "early_voting": 16500,
+        "absentee_by_mail": 0,
+        "provisional": 0,
+        "total_votes": 33000,
+    }
+    assert mock_ncsbe_instance.get_vote_method_totals("US_SENATE", "Wake")["early_voting"] == 16500
+    assert mock_ncsbe_instance.get_vote_method_totals("US_SENATE", "Orange") == {}
+    assert mock_ncsbe_instance.get_vote_method_totals("NC_GOVERNOR") == {}
+
+    # The rollups are computed once per index; later calls only read them.
+    with patch("ncsbe_lib.index._method_totals", side_effect=AssertionError):
+        assert mock_ncsbe_instance.get_vote_method_totals("US_SENATE")["total_votes"] == 33000
+        assert mock_ncsbe_instance.get_vote_method_totals("US_SENATE", "Wake")["early_voting"] == 16500
+        mock_ncsbe_instance.get_vote_method_totals("US_SENATE")["total_votes"] = 0
+        assert mock_ncsbe_instance.get_vote_method_totals("US_SENATE")["total_votes"] == 33000
+
+def test_get_vote_method_share_by_county(mock_ncsbe_instance):
+    assert mock_ncsbe_instance.get_vote_method_share_by_county("US_PRESIDENT", "early_voting") == { "Orange": 50.0 }
+    assert mock_ncsbe_instance.get_vote_method_share_by_county("US_PRESIDENT", "provisional") == { "Orange": 0.0 }
+    assert mock_ncsbe_instance.get_vote_method_share_by_county("NC_GOVERNOR", "early_voting") == {}
+
+    with pytest.raises(ValueError):
+        mock_ncsbe_instance.get_vote_method_share_by_county("US_PRESIDENT", "curbside")
+
+def test_get_contest_stats(mock_ncsbe_instance):
+    stats = mock_ncsbe_instance.get_contest_stats("US_PRESIDENT")
+    assert stats is not None
+    assert stats.vote_totals == { "John": 100050, "Mark": 100000, "Alex": 1000 }
+    assert [candidate.candidate for candidate in stats.ranking] == ["John", "Mark", "Alex"]
+    assert stats.winner.candidate == "John"
+    assert stats.margin == 50
+    assert stats.total_votes == 201050
+    assert stats.percentages["Alex"] == (1000 / 201050) * 100
+
+    assert mock_ncsbe_instance.get_contest_stats("US_PRESIDENT") is stats
+    assert mock_ncsbe_instance.get_contest_stats("NC_GOVERNOR") is None
@@ -0,0 +1,42 @@
+import io
+import json
+from dataclasses import asdict
+from unittest.mock import patch
+from ncsbe_lib.ncsbe import NCSBE
+from ncsbe_lib.serialize import iter_ndjson, to_json
+from ncsbe_lib.types import CandidateData, PrecinctData
+from .conftest import MockResponse
+
+def test_to_dict_matches_asdict(mock_election_data):
+    for contest in mock_election_data:
+        assert contest.to_dict() == asdict(contest)
+        assert type(contest.to_dict()["counties"]) is tuple
+
+def test_to_json_matches_json_dumps_and_caches(mock_election_data):
+    contest = mock_election_data[0]
+    text = to_json(contest)
+    assert text == json.dumps(asdict(contest), separators=(",", ":"))
+    # Caching is opt-in.
+    assert not hasattr(contest, "_json")
+    text = to_json(contest, cache=True)
+    assert to_json(contest) is text
+
+    # Escaping and booleans follow `json.dumps`.
+    precinct = PrecinctData('"North" \\ Ünion', (CandidateData("Zoë", "DEM", 1),), real_precinct=False)
+    assert to_json(precinct) == json.dumps(asdict(precinct), separators=(",", ":"))
+    assert not hasattr(precinct, "_json")
+
+def test_export_json(mock_results_zip, mock_election_data):
+    ncsbe = NCSBE("2024-11-05", lazy=True)
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        ncsbe.initialize()
+
+    expected = [asdict(contest) for contest in mock_election_data]
+    fp = io.StringIO()
+    ncsbe.export_json(fp)
+    assert json.loads(fp.getvalue()) == json.loads(json.dumps(expected))
+
+    fp = io.StringIO()
+    ncsbe.export_json(fp, ndjson=True)
+    assert [json.loads(line) for line in fp.getvalue().splitlines()] == json.loads(json.dumps(expected))
+    assert list(iter_ndjson([])) == []
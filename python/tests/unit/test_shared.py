@@ -0,0 +1,92 @@
+import ncsbe_lib
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+from ncsbe_lib.ncsbe import NCSBE
+from ncsbe_lib.shared import SHARED_QUERY_METHODS, SharedDatasetPublisher, SharedElection
+from .conftest import MockResponse, make_results_zip, make_tsv_row
+
+def test_followers_answer_from_the_latest_generation(tmp_path, mock_results_rows, mock_results_zip):
+    directory = str(tmp_path / "2024-11-05")
+    follower = SharedElection(directory)
+    assert follower.generation == 0 and follower.list_contests() == []
+
+    leader = NCSBE("2024-11-05", publisher=SharedDatasetPublisher(directory))
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(mock_results_zip)):
+        leader.initialize()
+
+    assert follower.list_contests() == leader.list_contests()
+    assert follower.get_contest("US_SENATE") == leader.get_contest("US_SENATE")
+    assert follower.generation == 1 and follower.election_date == "2024-11-05"
+
+    for votes in (20000, 30000):
+        rows = mock_results_rows[:3] + [make_tsv_row("Wake", "2", "US SENATE", "Alex", "DEM", votes, 2), mock_results_rows[4]]
+        with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(make_results_zip(rows))):
+            assert leader.refresh()
+
+    assert follower.get_contest_winner("US_SENATE").votes == 30000
+    assert follower.generation == 3
+    # The previous generation is kept for followers switching over, older ones are removed.
+    assert sorted(name for name in os.listdir(directory) if name.endswith(".ncsbe")) == [
+        "0000000000000002.ncsbe", "0000000000000003.ncsbe"
+    ]
+
+    # A restarted leader continues the sequence.
+    assert SharedDatasetPublisher(directory).generation == 3
+
+def test_follower_in_another_process(tmp_path, mock_election_data):
+    directory = str(tmp_path / "shared")
+    SharedDatasetPublisher(directory).publish(mock_election_data, "2024-11-05")
+
+    code = (
+        "import sys; from ncsbe_lib.shared import SharedElection; "
+        "print(SharedElection(sys.argv[1]).get_contest_winner('US_PRESIDENT').candidate)"
+    )
+    root = os.path.dirname(os.path.dirname(ncsbe_lib.__file__))
+    result = subprocess.run([sys.executable, "-c", code, directory], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "John"
+
+def test_followers_answer_like_ncsbe(tmp_path, mock_ncsbe_instance):
+    directory = str(tmp_path / "shared")
+    SharedDatasetPublisher(directory).publish(mock_ncsbe_instance.get_dataset(), "2024-11-05")
+    follower = SharedElection(directory)
+
+    calls = {
+        "has_contest": ("US_SENATE",), "list_candidates": ("US_PRESIDENT",), "list_counties": ("US_SENATE",), "list_precincts": ("US_SENATE", "Wake"), "get_candidates": ("US_SENATE",),
+        "get_counties": ("US_PRESIDENT",), "get_precincts": ("US_PRESIDENT",), "get_contest": ("US_SENATE",),
+        "get_county_results": ("US_SENATE", "Wake"), "get_precinct_results": ("US_SENATE", "Wake", "2"),
+        "get_candidate_info": ("US_SENATE", "Alex"), "get_all_candidate_results": ("Alex",),
+        "get_candidate_vote_total": ("US_SENATE", "Felix"), "get_contest_stats": ("US_PRESIDENT",),
+        "get_contest_vote_totals": ("US_PRESIDENT",), "get_total_votes_for_contest": ("US_SENATE",),
+        "get_candidate_vote_percentage": ("US_SENATE", "Alex"), "get_contest_winner": ("US_SENATE",),
+        "get_vote_method_totals": ("US_SENATE", "Wake"), "get_vote_method_share_by_county": ("US_PRESIDENT", "early_voting"),
+        "has_candidate": ("Felix",), "get_contests_by_candidate": ("Alex",), "get_contest_summaries": (None, True), "get_contest_winners": (),
+        "get_vote_percentages": ([("US_SENATE", "Alex"), ("US_HOUSE", "Alex")],),
+    }
+    for name in SHARED_QUERY_METHODS:
+        args = calls.get(name, ())
+        expected = getattr(mock_ncsbe_instance, name)(*args)
+        actual = getattr(follower, name)(*args)
+        if name == "get_contests_by_candidate":
+            continue
+        if name == "list_candidates":
+            # `NCSBE` lists a contest's candidates in no particular order.
+            actual, expected = sorted(actual), sorted(expected)
+        assert actual == expected, name
+    assert follower.get_contests_by_candidate("Alex") == [c.contest_name for c in mock_ncsbe_instance.get_contests_by_candidate("Alex")]
+
+def test_follower_keeps_serving_through_a_corrupt_generation(tmp_path, mock_election_data):
+    directory = str(tmp_path / "shared")
+    publisher = SharedDatasetPublisher(directory)
+    publisher.publish(mock_election_data, "2024-11-05")
+    follower = SharedElection(directory)
+    assert follower.get_contest_winner("US_SENATE").candidate == "Felix"
+
+    # A truncated archive for the next generation.
+    with open(os.path.join(directory, "0000000000000002.ncsbe"), "wb") as f:
+        f.write(b"NCSBEARC\x02")
+    publisher._control[:8] = (2).to_bytes(8, "little")
+
+    assert follower.get_contest_winner("US_SENATE").candidate == "Felix"
+    assert follower.generation == 1
@@ -0,0 +1,42 @@
+import copy
+import pickle
+import pytest
+from dataclasses import FrozenInstanceError, replace
+from unittest.mock import patch
+from ncsbe_lib.ncsbe import NCSBE
+from ncsbe_lib.types import CandidateData, ContestData, CountyData, ParsedRow, PrecinctData
+from .conftest import MockResponse, make_results_zip
+
+@pytest.mark.parametrize("cls", [CandidateData, PrecinctData, CountyData, ContestData, ParsedRow])
+def test_result_types_are_slotted(cls):
+    # Instances carry no per-instance `__dict__`.
+    assert "__slots__" in vars(cls) and "__dict__" not in dir(cls)
+
+def test_slotted_types_keep_dataclass_behavior(mock_election_data):
+    candidate = CandidateData("John", "DEM", 10)
+    assert candidate.election_day == 0
+    assert replace(candidate, votes=11).votes == 11
+    with pytest.raises(FrozenInstanceError):
+        candidate.votes = 11
+    with pytest.raises(AttributeError):
+        candidate.nickname = "Johnny"
+
+    contest = mock_election_data[0]
+    assert pickle.loads(pickle.dumps(contest)) == contest
+    assert copy.deepcopy(contest) == contest
+    assert hash(contest) == hash(copy.deepcopy(contest))
+
+def test_candidate_entries_share_name_and_party(mock_results_rows):
+    ncsbe = NCSBE("2024-11-05")
+    with patch("ncsbe_lib.collector.requests.Session.get", return_value=MockResponse(make_results_zip(mock_results_rows * 2))):
+        ncsbe.initialize()
+
+    # Every precinct entry of a candidate points at the same name and party strings.
+    entries = [
+        candidate
+        for precinct in ncsbe.get_precincts("US_SENATE")
+        for candidate in precinct.candidates
+        if candidate.candidate == "Alex"
+    ] + [ncsbe.get_candidate_info("US_SENATE", "Alex")]
+    assert len({ id(entry.candidate) for entry in entries }) == 1
+    assert len({ id(entry.party) for entry in entries }) == 1